@@ -1,4 +1,5 @@
 import sys
+import types
 import typing
 
 from .fee import ConstantFeeModel, FeeModel
@@ -41,6 +42,14 @@ class Account:
     def holdings(self) -> typing.List[Holding]:
         return list(self._holdings.values())
 
+    @property
+    def holdings_view(self) -> typing.Mapping[str, Holding]:
+        """
+        Read-only live view of the holdings by symbol, without copying them.
+        """
+
+        return types.MappingProxyType(self._holdings)
+
     def find_holding(self, symbol: str):
         return self._holdings.get(symbol, None)
 
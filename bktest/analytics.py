@@ -0,0 +1,691 @@
+"""
+NumPy implementation of the report metrics.
+
+The results mirror `quantstats.reports.metrics(mode="full", as_pct=True, display=False)`
+and `quantstats.stats.drawdown_details`, including their conventions, so that
+they can be used interchangeably in the templates and the user scripts.
+Every statistic is computed from the same prepared array, in a single call.
+
+The exposure metrics are computed from the (date, symbol) rows of the dump.
+"""
+
+import datetime
+import math
+import statistics
+import typing
+
+import numpy
+import pandas
+from dateutil.relativedelta import relativedelta
+
+TRADING_DAYS = 252
+
+_STRATEGY = "strategy"
+_BENCHMARK = "benchmark"
+
+_DRAWDOWN_COLUMNS = [
+    "start",
+    "valley",
+    "end",
+    "days",
+    "max drawdown",
+    "99% max drawdown",
+]
+
+_TOP_WEIGHTS = 5
+
+_NORMAL = statistics.NormalDist()
+
+# Rendered as "-" by quantstats.
+_MISSING = {"-nan%", "nan%", "-nan", "nan", "-inf%", "inf%", "-inf", "inf"}
+
+# `quantstats.stats.var` default confidence.
+_VAR_QUANTILE = _NORMAL.inv_cdf(1 - 0.95)
+
+
+def compute_metrics(
+    returns: pandas.Series,
+    benchmark: typing.Optional[pandas.Series] = None,
+) -> pandas.DataFrame:
+    """
+    Compute the metrics of the daily returns, indexed by their slugified name.
+    The columns are `benchmark` (if any) and `strategy`.
+    """
+
+    dates, values = _prepare(returns, benchmark)
+
+    with numpy.errstate(all="ignore"):
+        metrics = _compute_metrics(dates, values, benchmark is not None)
+
+    columns = [_STRATEGY, _BENCHMARK] if benchmark is not None else [_STRATEGY]
+
+    dataframe = pandas.DataFrame.from_dict(
+        {
+            name: [_format(value) for value in row]
+            for name, row in metrics.items()
+        },
+        orient="index",
+        columns=columns,
+    )
+
+    return dataframe[list(reversed(columns))]
+
+
+def drawdown_details(returns: pandas.Series) -> pandas.DataFrame:
+    """
+    Compute the start, valley, end, duration and depth of every drawdown of the daily returns.
+    """
+
+    returns = returns.sort_index()
+
+    values = returns.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+    values = numpy.where(numpy.isnan(values), 0.0, values)
+
+    drawdowns = _to_drawdowns(values[:, None])[:, 0]
+
+    return _drawdown_details(pandas.DatetimeIndex(returns.index), drawdowns)
+
+
+def compute_exposures(
+    date_codes: numpy.ndarray,
+    symbol_codes: numpy.ndarray,
+    quantities: numpy.ndarray,
+    prices: numpy.ndarray,
+    equities: numpy.ndarray,
+    shape: typing.Tuple[int, int],
+) -> typing.Dict[str, float]:
+    """
+    Compute the average exposure, turnover and concentration of the holdings.
+
+    Each row is a holding at a date, `shape` being the number of (dates, symbols).
+    A date without any row has no holding, its equity is the one of the previous date.
+    Exposures and turnover are relative to the equity, the weights to the gross value.
+    """
+
+    date_count, symbol_count = shape
+
+    quantity_matrix = numpy.zeros(shape)
+    quantity_matrix[date_codes, symbol_codes] = quantities
+
+    price_matrix = numpy.full(shape, numpy.nan)
+    price_matrix[date_codes, symbol_codes] = prices
+
+    equity = numpy.full(date_count, numpy.nan)
+    equity[date_codes] = equities
+    equity = _forward_fill(equity)
+
+    with numpy.errstate(all="ignore"):
+        values = numpy.where(quantity_matrix != 0, quantity_matrix * price_matrix, 0.0)
+        absolutes = numpy.abs(values)
+
+        gross_values = absolutes.sum(axis=1)
+        gross = gross_values / equity
+        net = values.sum(axis=1) / equity
+        long = numpy.where(values > 0, values, 0).sum(axis=1) / equity
+        short = numpy.where(values < 0, values, 0).sum(axis=1) / equity
+
+        # A position that is closed is traded at its last known price.
+        previous_quantities = numpy.vstack([numpy.zeros((1, symbol_count)), quantity_matrix[:-1]])
+        previous_prices = numpy.vstack([numpy.full((1, symbol_count), numpy.nan), price_matrix[:-1]])
+        trade_prices = numpy.where(numpy.isnan(price_matrix), previous_prices, price_matrix)
+
+        traded_quantities = numpy.abs(quantity_matrix - previous_quantities)
+        traded = numpy.where(traded_quantities != 0, traded_quantities * trade_prices, 0.0).sum(axis=1)
+        turnover = traded / equity
+
+        held = gross_values > 0
+        weights = absolutes[held] / gross_values[held, None]
+
+        concentrations = (weights ** 2).sum(axis=1)
+
+        if symbol_count > _TOP_WEIGHTS:
+            top_weights = numpy.partition(weights, -_TOP_WEIGHTS, axis=1)[:, -_TOP_WEIGHTS:].sum(axis=1)
+        else:
+            top_weights = weights.sum(axis=1)
+
+        daily_turnover = _nan_mean(turnover)
+
+        return {
+            "gross-exposure": _nan_mean(gross),
+            "gross-exposure-max": _nan_max(gross),
+            "net-exposure": _nan_mean(net),
+            "long-exposure": _nan_mean(long),
+            "short-exposure": _nan_mean(short),
+            "turnover": daily_turnover,
+            "turnover-annual": daily_turnover * TRADING_DAYS,
+            "concentration": _nan_mean(concentrations),
+            "effective-holdings": _nan_mean(1 / concentrations),
+            "top-5-weight": _nan_mean(top_weights),
+            "holdings": _nan_mean((quantity_matrix != 0).sum(axis=1)),
+        }
+
+
+def _forward_fill(values: numpy.ndarray) -> numpy.ndarray:
+    indexes = numpy.where(numpy.isnan(values), 0, numpy.arange(len(values)))
+    numpy.maximum.accumulate(indexes, out=indexes)
+
+    return values[indexes]
+
+
+def _nan_mean(values: numpy.ndarray) -> float:
+    values = values[~numpy.isnan(values)]
+    if not len(values):
+        return numpy.nan
+
+    return float(values.mean())
+
+
+def _nan_max(values: numpy.ndarray) -> float:
+    values = values[~numpy.isnan(values)]
+    if not len(values):
+        return numpy.nan
+
+    return float(values.max())
+
+
+def _prepare(
+    returns: pandas.Series,
+    benchmark: typing.Optional[pandas.Series],
+) -> typing.Tuple[pandas.DatetimeIndex, numpy.ndarray]:
+    returns = returns.dropna()
+    returns.index = pandas.DatetimeIndex(returns.index).tz_localize(None)
+
+    if benchmark is None:
+        values = returns.to_numpy(dtype=numpy.float64)[:, None]
+        return returns.index, numpy.where(numpy.isnan(values), 0.0, values)
+
+    benchmark = _align_benchmark(benchmark, returns.index)
+
+    # Both series are only used from the first date where one of them moves.
+    start = max(_first_non_zero(returns), _first_non_zero(benchmark))
+
+    values = numpy.column_stack([
+        returns.loc[start:].reindex(returns.index).to_numpy(dtype=numpy.float64),
+        benchmark.loc[start:].reindex(returns.index).to_numpy(dtype=numpy.float64),
+    ])
+
+    return returns.index, numpy.where(numpy.isnan(values), 0.0, values)
+
+
+def _align_benchmark(benchmark: pandas.Series, index: pandas.DatetimeIndex) -> pandas.Series:
+    benchmark = benchmark.copy()
+
+    if set(index) != set(benchmark.index):
+        prices = 1 + benchmark.fillna(0).add(1).cumprod() - 1
+        benchmark = (
+            prices.reindex(pandas.date_range(start=index[0], end=index[-1], freq="D"), method="bfill")
+            .reindex(index)
+            .pct_change()
+            .fillna(0)
+        )
+
+        benchmark = benchmark[benchmark.index.isin(index)]
+
+    benchmark.index = pandas.DatetimeIndex(benchmark.index).tz_localize(None)
+
+    return benchmark.dropna().replace([numpy.inf, -numpy.inf], numpy.nan).fillna(0)
+
+
+def _first_non_zero(series: pandas.Series):
+    mask = series.ne(0).to_numpy()
+    return series.index[int(mask.argmax())]
+
+
+def _compute_metrics(
+    dates: pandas.DatetimeIndex,
+    values: numpy.ndarray,
+    has_benchmark: bool,
+) -> typing.Dict[str, typing.List[typing.Any]]:
+    count, width = values.shape
+
+    def each(value):
+        return [value] * width
+
+    def listed(array):
+        return list(array)
+
+    means = values.mean(axis=0)
+    stds = values.std(axis=0, ddof=1)
+    skews = _skew(values)
+    kurtosises = _kurtosis(values)
+
+    compounded = _compound(values)
+    years = (dates[-1] - dates[0]).days / TRADING_DAYS
+    cagrs = numpy.abs(compounded + 1.0) ** (1.0 / years) - 1 if years else numpy.full(width, numpy.nan)
+
+    penalty = _autocorrelation_penalty(values[:, 0])
+    downsides = numpy.sqrt((numpy.where(values < 0, values, 0) ** 2).sum(axis=0) / count)
+
+    sharpes = means / stds
+    sortinos = means / downsides * numpy.sqrt(TRADING_DAYS)
+    smart_sortinos = means / (downsides * penalty) * numpy.sqrt(TRADING_DAYS)
+
+    sigma_sharpes = numpy.sqrt(
+        (1 + (0.5 * sharpes ** 2) - (skews * sharpes) + (((kurtosises - 3) / 4) * sharpes ** 2))
+        / (count - 1)
+    )
+
+    probabilistic_sharpes = numpy.array([
+        _NORMAL.cdf(ratio) if not numpy.isnan(ratio) else numpy.nan
+        for ratio in sharpes / sigma_sharpes
+    ])
+
+    drawdowns = _to_drawdowns(values)
+    max_drawdowns = drawdowns.min(axis=0)
+    ulcers = numpy.sqrt((drawdowns ** 2).sum(axis=0) / (count - 1))
+
+    months = _group(dates, values, "M")
+    quarters = _group(dates, values, "Q")
+    years_ = _group(dates, values, "Y")
+
+    win_rates = _win_rate(values)
+    payoffs = _payoff_ratio(values)
+    profit_factors = numpy.abs(
+        numpy.where(values >= 0, values, 0).sum(axis=0) /
+        numpy.where(values < 0, values, 0).sum(axis=0)
+    )
+
+    # scipy has no distribution for a zero deviation.
+    value_at_risks = numpy.where(stds > 0, means + stds * _VAR_QUANTILE, numpy.nan)
+
+    metrics = {
+        "start-period": each(dates[0].strftime("%Y-%m-%d")),
+        "end-period": each(dates[-1].strftime("%Y-%m-%d")),
+        "risk-free-rate": each(0.0),
+        "time-in-market": [
+            math.ceil(ratio * 100) / 100 * 100
+            for ratio in (values != 0).sum(axis=0) / count
+        ],
+        "cumulative-return": _format_cumulative_returns(compounded * 100),
+        "cagr": listed(cagrs * 100),
+        "sharpe": listed(sharpes * numpy.sqrt(TRADING_DAYS)),
+        "prob-sharpe-ratio": listed(probabilistic_sharpes * 100),
+        "smart-sharpe": listed(means / (stds * penalty) * numpy.sqrt(TRADING_DAYS)),
+        "sortino": listed(sortinos),
+        "smart-sortino": listed(smart_sortinos),
+        "sortino-2": listed(sortinos / numpy.sqrt(2)),
+        "smart-sortino-2": listed(smart_sortinos / numpy.sqrt(2)),
+        "omega": each(_omega(values[:, 0])),
+    }
+
+    drawdown_statistics = _drawdown_statistics(dates, drawdowns)
+    metrics.update(drawdown_statistics.pop("head"))
+
+    metrics["volatility-ann"] = listed(stds * numpy.sqrt(TRADING_DAYS) * 100)
+
+    if has_benchmark:
+        metrics["r-2"] = each(_r_squared(values[:, 0], values[:, 1]))
+
+        differences = values[:, 0] - values[:, 1]
+        metrics["information-ratio"] = each(differences.mean() / differences.std(ddof=1))
+
+    metrics.update({
+        "calmar": listed(cagrs / numpy.abs(max_drawdowns)),
+        "skew": listed(skews),
+        "kurtosis": listed(kurtosises),
+        "expected-daily": listed(_expected_return(values) * 100),
+        "expected-monthly": listed(_expected_return(months) * 100),
+        "expected-yearly": listed(_expected_return(years_) * 100),
+        "kelly-criterion": listed(((payoffs * win_rates) - (1 - win_rates)) / payoffs * 100),
+        "risk-of-ruin": listed(((1 - win_rates) / (1 + win_rates)) ** count),
+        "daily-value-at-risk": listed(-numpy.abs(value_at_risks * 100)),
+        # quantstats falls back to the value at risk when given multiple columns.
+        "expected-shortfall-cvar": listed(-numpy.abs(value_at_risks * 100)),
+        "max-consecutive-wins": listed(_max_consecutive(values > 0).astype(float)),
+        "max-consecutive-losses": listed(_max_consecutive(values < 0).astype(float)),
+        "gain-pain-ratio": listed(_gain_to_pain_ratio(_group(dates, values, "D", compounded=False))),
+        "gain-pain-1m": listed(_gain_to_pain_ratio(_group(dates, values, "M", compounded=False))),
+        "payoff-ratio": listed(payoffs),
+        "profit-factor": listed(profit_factors),
+        "common-sense-ratio": listed(profit_factors * _tail_ratio(values)),
+        "cpc-index": listed(profit_factors * win_rates * payoffs),
+        "tail-ratio": listed(_tail_ratio(values)),
+        "outlier-win-ratio": listed(
+            numpy.quantile(values, 0.99, axis=0).mean() /
+            _masked_mean(values, values >= 0)
+        ),
+        "outlier-loss-ratio": listed(
+            numpy.quantile(values, 0.01, axis=0).mean() /
+            _masked_mean(values, values < 0)
+        ),
+    })
+
+    today = dates[-1]
+
+    def since(date) -> numpy.ndarray:
+        return values[dates >= date]
+
+    metrics.update({
+        "mtd": listed(_compound(since(datetime.datetime(today.year, today.month, 1))) * 100),
+        "3m": listed(_compound(since(today - relativedelta(months=3))) * 100),
+        "6m": listed(_compound(since(today - relativedelta(months=6))) * 100),
+        "ytd": listed(_compound(since(datetime.datetime(today.year, 1, 1))) * 100),
+        "1y": listed(_compound(since(today - relativedelta(years=1))) * 100),
+        "3y-ann": listed(_cagr(dates, values, today - relativedelta(months=35)) * 100),
+        "5y-ann": listed(_cagr(dates, values, today - relativedelta(months=59)) * 100),
+        "10y-ann": listed(_cagr(dates, values, today - relativedelta(years=10)) * 100),
+        "all-time-ann": listed(cagrs * 100),
+        "best-day": listed(values.max(axis=0) * 100),
+        "worst-day": listed(values.min(axis=0) * 100),
+        "best-month": listed(months.max(axis=0) * 100),
+        "worst-month": listed(months.min(axis=0) * 100),
+        "best-year": listed(years_.max(axis=0) * 100),
+        "worst-year": listed(years_.min(axis=0) * 100),
+    })
+
+    metrics.update(drawdown_statistics.pop("tail"))
+
+    drawdown_value_at_risks = drawdowns.mean(axis=0) + drawdowns.std(axis=0, ddof=1) * _VAR_QUANTILE
+    pitfalls = -drawdown_value_at_risks / stds
+
+    metrics.update({
+        "recovery-factor": listed(numpy.abs(values.sum(axis=0)) / numpy.abs(max_drawdowns)),
+        "ulcer-index": listed(ulcers),
+        "serenity-index": listed(values.sum(axis=0) / (ulcers * pitfalls)),
+        "avg-up-month": listed(_masked_mean(months, numpy.all(months > 0, axis=1)[:, None]) * 100),
+        "avg-down-month": listed(_masked_mean(months, numpy.all(months < 0, axis=1)[:, None]) * 100),
+        "win-days": listed(win_rates * 100),
+        "win-month": listed(_win_rate(months) * 100),
+        "win-quarter": listed(_win_rate(quarters) * 100),
+        "win-year": listed(_win_rate(years_) * 100),
+    })
+
+    if has_benchmark:
+        metrics.update(_greeks(values))
+
+    return metrics
+
+
+def _format(value: typing.Any) -> typing.Any:
+    if isinstance(value, str):
+        if value in _MISSING:
+            return "-"
+
+        return 0 if value == "-0" else value
+
+    if isinstance(value, (int, numpy.integer)) and not isinstance(value, bool):
+        return int(value)
+
+    value = float(numpy.round(value, 2))
+    if math.isnan(value) or math.isinf(value):
+        return "-"
+
+    if value == 0:
+        return 0
+
+    return value
+
+
+def _format_cumulative_returns(values: numpy.ndarray) -> typing.List[typing.Any]:
+    formatted = ["{:,.2f}".format(value) for value in values]
+
+    # quantstats only converts them back if every value can be.
+    if any("," in value for value in formatted):
+        return formatted
+
+    return [float(value) for value in formatted]
+
+
+def _compound(values: numpy.ndarray) -> numpy.ndarray:
+    return numpy.prod(values + 1, axis=0) - 1
+
+
+def _cagr(dates: pandas.DatetimeIndex, values: numpy.ndarray, start) -> numpy.ndarray:
+    mask = dates >= start
+    dates = dates[mask]
+
+    years = (dates[-1] - dates[0]).days / TRADING_DAYS
+    if not years:
+        return numpy.full(values.shape[1], numpy.nan)
+
+    return numpy.abs(_compound(values[mask]) + 1.0) ** (1.0 / years) - 1
+
+
+def _skew(values: numpy.ndarray) -> numpy.ndarray:
+    count = len(values)
+
+    adjusted = values - values.mean(axis=0)
+    adjusted2 = adjusted ** 2
+    m2 = adjusted2.sum(axis=0)
+    m3 = (adjusted2 * adjusted).sum(axis=0)
+
+    m2 = numpy.where(numpy.abs(m2) < 1e-14, 0, m2)
+    m3 = numpy.where(numpy.abs(m3) < 1e-14, 0, m3)
+
+    result = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2 ** 1.5)
+    return numpy.where(m2 == 0, 0, result) if count >= 3 else numpy.full(values.shape[1], numpy.nan)
+
+
+def _kurtosis(values: numpy.ndarray) -> numpy.ndarray:
+    count = len(values)
+
+    adjusted = values - values.mean(axis=0)
+    adjusted2 = adjusted ** 2
+    m2 = adjusted2.sum(axis=0)
+    m4 = (adjusted2 ** 2).sum(axis=0)
+
+    adjustment = 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+    numerator = count * (count + 1) * (count - 1) * m4
+    denominator = (count - 2) * (count - 3) * m2 ** 2
+
+    numerator = numpy.where(numpy.abs(numerator) < 1e-14, 0, numerator)
+    denominator = numpy.where(numpy.abs(denominator) < 1e-14, 0, denominator)
+
+    result = numerator / denominator - adjustment
+    return numpy.where(denominator == 0, 0, result) if count >= 4 else numpy.full(values.shape[1], numpy.nan)
+
+
+def _autocorrelation_penalty(values: numpy.ndarray) -> float:
+    count = len(values)
+
+    coefficient = numpy.abs(numpy.corrcoef(values[:-1], values[1:])[0, 1])
+    lags = numpy.arange(1, count)
+
+    return numpy.sqrt(1 + 2 * numpy.sum(((count - lags) / count) * coefficient ** lags))
+
+
+def _omega(values: numpy.ndarray) -> float:
+    if len(values) < 2:
+        return numpy.nan
+
+    numerator = values[values > 0.0].sum()
+    denominator = -1.0 * values[values < 0.0].sum()
+
+    if denominator > 0.0:
+        return numerator / denominator
+
+    return numpy.nan
+
+
+def _r_squared(returns: numpy.ndarray, benchmark: numpy.ndarray) -> float:
+    ssxm, ssxym, _, ssym = numpy.cov(returns, benchmark, bias=1).flat
+
+    if ssxm == 0.0 or ssym == 0.0:
+        return 0.0
+
+    r = numpy.clip(ssxym / numpy.sqrt(ssxm * ssym), -1.0, 1.0)
+    return r ** 2
+
+
+def _expected_return(values: numpy.ndarray) -> numpy.ndarray:
+    return numpy.prod(1 + values, axis=0) ** (1 / len(values)) - 1
+
+
+def _win_rate(values: numpy.ndarray) -> numpy.ndarray:
+    wins = (values > 0).sum(axis=0)
+    non_zeros = (values != 0).sum(axis=0)
+
+    return numpy.where(non_zeros == 0, 0.0, wins / numpy.where(non_zeros == 0, 1, non_zeros))
+
+
+def _masked_mean(values: numpy.ndarray, mask: numpy.ndarray) -> numpy.ndarray:
+    mask = numpy.broadcast_to(mask, values.shape)
+    return numpy.where(mask, values, 0).sum(axis=0) / mask.sum(axis=0)
+
+
+def _payoff_ratio(values: numpy.ndarray) -> numpy.ndarray:
+    # quantstats only keeps the rows where every column is a win (or a loss).
+    wins = _masked_mean(values, numpy.all(values > 0, axis=1)[:, None])
+    losses = _masked_mean(values, numpy.all(values < 0, axis=1)[:, None])
+
+    return wins / numpy.abs(losses)
+
+
+def _tail_ratio(values: numpy.ndarray) -> numpy.ndarray:
+    return numpy.abs(numpy.quantile(values, 0.95, axis=0) / numpy.quantile(values, 0.05, axis=0))
+
+
+def _gain_to_pain_ratio(values: numpy.ndarray) -> numpy.ndarray:
+    return values.sum(axis=0) / numpy.abs(numpy.where(values < 0, values, 0).sum(axis=0))
+
+
+def _max_consecutive(mask: numpy.ndarray) -> numpy.ndarray:
+    result = numpy.zeros(mask.shape[1], dtype=int)
+
+    for column in range(mask.shape[1]):
+        flags = numpy.concatenate([[0], mask[:, column].astype(numpy.int8), [0]])
+        changes = numpy.flatnonzero(numpy.diff(flags))
+
+        if len(changes):
+            result[column] = (changes[1::2] - changes[::2]).max()
+
+    return result
+
+
+def _group(
+    dates: pandas.DatetimeIndex,
+    values: numpy.ndarray,
+    frequency: str,
+    compounded=True,
+) -> numpy.ndarray:
+    keys = dates.to_period(frequency).asi8
+
+    order = numpy.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+
+    starts = numpy.flatnonzero(numpy.concatenate([[True], keys[1:] != keys[:-1]]))
+
+    if compounded:
+        return numpy.multiply.reduceat(values + 1, starts, axis=0) - 1
+
+    return numpy.add.reduceat(values, starts, axis=0)
+
+
+def _to_drawdowns(values: numpy.ndarray) -> numpy.ndarray:
+    prices = 1.0 + 1.0 * (numpy.cumprod(values + 1, axis=0) - 1)
+    drawdowns = prices / numpy.maximum.accumulate(prices, axis=0) - 1.0
+
+    return numpy.where(numpy.isinf(drawdowns), 0, drawdowns)
+
+
+def _drawdown_details(dates: pandas.DatetimeIndex, drawdowns: numpy.ndarray) -> pandas.DataFrame:
+    no_drawdown = drawdowns == 0
+
+    starts = list(numpy.flatnonzero(~no_drawdown[1:] & no_drawdown[:-1]) + 1)
+    ends = list(numpy.flatnonzero(no_drawdown[1:] & ~no_drawdown[:-1]))
+
+    if not starts:
+        return pandas.DataFrame(index=[], columns=_DRAWDOWN_COLUMNS)
+
+    if ends and starts[0] > ends[0]:
+        starts.insert(0, 0)
+
+    if not ends or starts[-1] > ends[-1]:
+        ends.append(len(drawdowns) - 1)
+
+    rows = []
+    for start, end in zip(starts, ends):
+        segment = drawdowns[start:end + 1]
+
+        outliers = -segment
+        cleaned = outliers[outliers < numpy.quantile(outliers, 0.99)]
+
+        rows.append((
+            dates[start].strftime("%Y-%m-%d"),
+            dates[start + int(segment.argmin())].strftime("%Y-%m-%d"),
+            dates[end].strftime("%Y-%m-%d"),
+            (dates[end] - dates[start]).days + 1,
+            segment.min() * 100,
+            -cleaned.max() * 100 if len(cleaned) else numpy.nan,
+        ))
+
+    dataframe = pandas.DataFrame(rows, columns=_DRAWDOWN_COLUMNS)
+    dataframe["days"] = dataframe["days"].astype(int)
+
+    return dataframe
+
+
+def _drawdown_statistics(
+    dates: pandas.DatetimeIndex,
+    drawdowns: numpy.ndarray,
+) -> typing.Dict[str, typing.Dict[str, typing.List[typing.Any]]]:
+    details = [
+        _drawdown_details(dates, drawdowns[:, column])
+        for column in range(drawdowns.shape[1])
+    ]
+
+    width = len(details)
+
+    if all(detail.empty for detail in details):
+        return {
+            "head": {
+                "max-drawdown": [""] * width,
+                "longest-dd-days": ["-"] * width,
+            },
+            "tail": {
+                "avg-drawdown-days": ["-"] * width,
+            },
+        }
+
+    max_drawdowns, longest_days, average_drawdowns, average_days = [], [], [], []
+    for detail in details:
+        depths = detail["max drawdown"].to_numpy(dtype=numpy.float64)
+        days = detail["days"].to_numpy(dtype=numpy.float64)
+
+        max_drawdowns.append(numpy.min(depths) / 100 * 100 if len(depths) else numpy.nan)
+        longest_days.append(numpy.max(days) if len(days) else numpy.nan)
+        average_drawdowns.append(numpy.mean(depths) / 100 * 100 if len(depths) else numpy.nan)
+        average_days.append(numpy.round(numpy.mean(days)) if len(days) else numpy.nan)
+
+    if numpy.isnan(longest_days).any() or numpy.isnan(average_days).any():
+        longest_days = ["-"] * width
+        average_days = ["-"] * width
+    else:
+        longest_days = [int(value) for value in longest_days]
+        average_days = [int(value) for value in average_days]
+
+    return {
+        "head": {
+            "max-drawdown": max_drawdowns,
+            "longest-dd-days": longest_days,
+        },
+        "tail": {
+            "avg-drawdown": average_drawdowns,
+            "avg-drawdown-days": average_days,
+        },
+    }
+
+
+def _greeks(values: numpy.ndarray) -> typing.Dict[str, typing.List[typing.Any]]:
+    returns, benchmark = values[:, 0], values[:, 1]
+
+    matrix = numpy.cov(returns, benchmark)
+    beta = matrix[0, 1] / matrix[1, 1]
+    alpha = (returns.mean() - beta * benchmark.mean()) * TRADING_DAYS
+
+    beta = 0.0 if numpy.isnan(beta) else beta
+    alpha = 0.0 if numpy.isnan(alpha) else alpha
+
+    correlation = numpy.corrcoef(benchmark, returns)[0, 1]
+
+    if beta == 0:
+        treynor = str(round(0 * 100, 2)) + "%"
+    else:
+        treynor = str(round(_compound(returns[:, None])[0] / beta * 100, 2)) + "%"
+
+    return {
+        "beta": [str(round(numpy.float64(beta), 2)), "-"],
+        "alpha": [str(round(numpy.float64(alpha), 2)), "-"],
+        "correlation": [str(round(correlation * 100, 2)) + "%", "-"],
+        "treynor-ratio": [treynor, "-"],
+    }
@@ -12,6 +12,18 @@ from .price_provider import PriceProvider, SymbolMapper
 from .iterator import DateIterator
 
 
+def _prefetch(
+    price_provider: PriceProvider,
+    order_provider: typing.Union[OrderProvider, ParallelOrderProvider],
+    background: bool,
+    chunk_days: typing.Optional[int]
+):
+    symbols = order_provider.get_symbols()
+
+    if symbols:
+        price_provider.prefetch(symbols, background=background, chunk_days=chunk_days)
+
+
 class _Pod:
 
     def __init__(
@@ -153,6 +165,9 @@ class ParallelBacktester:
         allow_weekends=False,
         allow_holidays=False,
         holiday_provider: HolidayProvider = LegacyHolidayProvider(),
+        prefetch=True,
+        prefetch_in_background=False,
+        prefetch_chunk_days: typing.Optional[int] = None,
     ):
         self.order_provider = order_provider
         order_dates = order_provider.get_dates()
@@ -160,6 +175,9 @@ class ParallelBacktester:
 
         self.price_provider = PriceProvider(start, end, data_source, mapper, caching=caching)
 
+        if prefetch and start is not None:
+            _prefetch(self.price_provider, order_provider, prefetch_in_background, prefetch_chunk_days)
+
         self.pods = [
             _Pod(
                 quantity_in_decimal,
@@ -272,6 +290,9 @@ class SimpleBacktester:
         allow_weekends=False,
         allow_holidays=False,
         holiday_provider: HolidayProvider = LegacyHolidayProvider(),
+        prefetch=True,
+        prefetch_in_background=False,
+        prefetch_chunk_days: typing.Optional[int] = None,
     ):
         self.order_provider = order_provider
         order_dates = order_provider.get_dates()
@@ -279,6 +300,9 @@ class SimpleBacktester:
 
         self.price_provider = PriceProvider(start, end, data_source, mapper, caching=caching)
 
+        if prefetch and start is not None:
+            _prefetch(self.price_provider, order_provider, prefetch_in_background, prefetch_chunk_days)
+
         self.pod = _Pod(
             quantity_in_decimal,
             auto_close_others,
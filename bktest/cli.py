@@ -4,6 +4,7 @@ import sys
 import typing
 import os
 import importlib
+import json
 import time
 import webbrowser
 
@@ -42,33 +43,55 @@ dotenv.load_dotenv()
 @click.option('--holidays', is_flag=True, help="Include holidays?")
 @click.option('--symbol-mapping', type=str, required=False, help="Custom symbol mapping file enabling vendor-id translation.")
 @click.option('--no-caching', is_flag=True, help="Disable price caching.")
+@click.option('--cache-ttl', type=int, default=24, show_default=True, help="Number of hours before a cached network response expires.")
+@click.option('--offline', is_flag=True, help="Never use the network, only use cached responses.")
+@click.option('--no-prefetch', is_flag=True, help="Do not download the prices of every ordered symbol before the backtest.")
+@click.option('--prefetch-background', is_flag=True, help="Download the prices of every ordered symbol in the background while the backtest is initializing.")
+@click.option('--prefetch-chunk-days', type=int, default=None, help="Download the prices in the background by chunks of days, allowing the backtest to start before every price is available.")
 @click.option('--fee-model', "fee_model_value", type=str, help="Specify a fee model. Must be a constant or an expression.")
 #
 @click.option('holiday_provider_name', '--holiday-provider', type=click.Choice(['legacy', 'nyse']), default="nyse", help="Specify the holiday provider to use.")
 #
+@click.option('--async-exporters', is_flag=True, help="Run the exporters in background threads.")
+@click.option('--async-queue-size', type=int, default=1024, show_default=True, help="Maximum number of pending events per exporter.")
+@click.option('--report-workers', type=int, default=0, show_default=True, help="Number of processes producing the reports and plots, 0 to produce them in the current process.")
+@click.option('--quantstats-metrics', is_flag=True, help="Compute the report metrics with QuantStats instead of NumPy.")
+#
+@click.option('--statistics', is_flag=True, help="Enable the running statistics exporter, also shown by the console.")
+@click.option('--statistics-output-file', type=str, default="statistics.json", show_default=True, help="Specify the output file.")
+@click.option('--statistics-auto-delete', is_flag=True, help="Should conflicting files be automatically deleted?")
+#
 @click.option('--console', is_flag=True, help="Enable the console exporter.")
-@click.option('--console-format', type=click.Choice(['text', 'json']), default="text", show_default=True, help="Console output format.")
+@click.option('--console-format', type=click.Choice(['text', 'json', 'jsonl']), default="text", show_default=True, help="Console output format.")
 @click.option('--console-file', type=click.Choice(['out', 'err']), default="out", show_default=True, help="Console output destination file.")
 @click.option('--console-hide-skips', is_flag=True, show_default=True, help="Should the console hide skipped days?")
 @click.option('--console-text-no-color', is_flag=True, help="Disable colors in the console output.")
+@click.option('--console-buffer-lines', type=int, default=None, help="Number of lines to buffer before writing them, 512 by default or 1 on a terminal.")
+@click.option('--console-flush-interval', type=float, default=1.0, show_default=True, help="Maximum number of seconds to keep lines buffered.")
 #
 @click.option('--dump', is_flag=True, help="Enable the dump exporter.")
 @click.option('--dump-output-file', type=str, default="dump.csv", show_default=True, help="Specify the output file.")
 @click.option('--dump-auto-delete', is_flag=True, help="Should conflicting files be automatically deleted?")
+@click.option('--dump-streaming', is_flag=True, help="Write the dump progressively, keeping a constant memory usage. (.parquet or .arrow only)")
+@click.option('--dump-row-group-size', type=int, default=100_000, show_default=True, help="Number of rows to buffer before writing them when streaming.")
 #
 @click.option('--quantstats', is_flag=True, help="Enable the quantstats exporter.")
 @click.option('--quantstats-output-file-html', type=str, default="report.html", show_default=True, help="Specify the output html file.")
 @click.option('--quantstats-output-file-csv', type=str, default="report.csv", show_default=True, help="Specify the output csv file.")
 @click.option('--quantstats-benchmark-ticker', type=str, default="SPY", show_default=True, help="Specify the symbol to use as a benchmark.")
+@click.option('--quantstats-benchmark-source', type=click.Choice(['yahoo', 'data-source', 'file']), default="yahoo", show_default=True, help="Specify where to get the benchmark prices from.")
+@click.option('--quantstats-benchmark-file', type=click.Path(exists=True, dir_okay=False), required=False, help="Specify the benchmark prices file (only with the `file` source).")
 @click.option('--quantstats-auto-delete', is_flag=True, help="Should conflicting files be automatically deleted?")
 #
 @click.option('--pdf', is_flag=True, help="Enable the quantstats exporter.")
 @click.option('--pdf-template', type=str, default="tearsheet.sketch", show_default=True, help="Specify the template file.")
+@click.option('--pdf-template-cache-directory', type=str, default=None, help="Specify a directory to cache the parsed templates and fonts in.")
 @click.option('--pdf-output-file', type=str, default="report.pdf", show_default=True, help="Specify the output pdf file.")
 @click.option('--pdf-auto-delete', is_flag=True, help="Should aa conflicting file be automatically deleted?")
 @click.option('--pdf-debug', is_flag=True, help="Enable renderer debugging.")
 @click.option('--pdf-variable', "pdf_variables", nargs=2, multiple=True, type=(str, str), help="Specify custom variables.")
 @click.option('--pdf-user-script', "pdf_user_script_paths", multiple=True, type=str, help="Specify custom scripts.")
+@click.option('--pdf-figure-format', type=click.Choice(["png", "svg"]), default="png", show_default=True, help="Specify the format of the figures, svg keeps them as vectors.")
 #
 @click.option('--specific-return', type=str, help="Enable the specific return exporter by proving a .parquet.")
 @click.option('--specific-return-column-date', type=str, default="date", show_default=True, help="Specify the column name containing the dates.")
@@ -77,6 +100,7 @@ dotenv.load_dotenv()
 @click.option('--specific-return-output-file-html', type=str, default="sr-report.html", show_default=True, help="Specify the output html file.")
 @click.option('--specific-return-output-file-csv', type=str, default="sr-report.csv", show_default=True, help="Specify the output csv file.")
 @click.option('--specific-return-auto-delete', is_flag=True, help="Should conflicting files be automatically deleted?")
+@click.option('--specific-return-chunk-days', type=int, default=None, help="Read the .parquet specific returns by chunks of days as the backtest progresses, instead of all at once.")
 #
 @click.option('--yahoo', is_flag=True, help="Use yahoo finance as the data source.")
 #
@@ -88,7 +112,7 @@ dotenv.load_dotenv()
 @click.option('--factset-username-serial', type=str, envvar="FACTSET_USERNAME_SERIAL", help="Specify the factset username serial to use.")
 @click.option('--factset-api-key', type=str, envvar="FACTSET_API_KEY", help="Specify the factset api key to use.")
 #
-@click.option('--file-parquet', type=str, required=False, help="Use a .parquet file as the data source.")
+@click.option('--file-parquet', type=str, required=False, help="Use a .parquet file (or a partitioned dataset directory) as the data source.")
 @click.option('--file-parquet-column-date', type=str, default="date", show_default=True, help="Specify the column name containing the dates.")
 @click.option('--file-parquet-column-symbol', type=str, default="symbol", show_default=True, help="Specify the column name containing the symbols.")
 @click.option('--file-parquet-column-price', type=str, default="price", show_default=True, help="Specify the column name containing the prices.")
@@ -118,19 +142,28 @@ def main(
     holidays,
     symbol_mapping,
     no_caching,
+    cache_ttl: int,
+    offline: bool,
+    no_prefetch: bool,
+    prefetch_background: bool,
+    prefetch_chunk_days: typing.Optional[int],
     fee_model_value,
     #
     holiday_provider_name: str,
     #
-    console, console_format, console_file, console_hide_skips, console_text_no_color,
+    async_exporters: bool, async_queue_size: int, report_workers: int, quantstats_metrics: bool,
+    #
+    statistics: bool, statistics_output_file: str, statistics_auto_delete: bool,
     #
-    dump: str, dump_output_file: str, dump_auto_delete: bool,
+    console, console_format, console_file, console_hide_skips, console_text_no_color, console_buffer_lines: typing.Optional[int], console_flush_interval: float,
     #
-    quantstats, quantstats_output_file_html, quantstats_output_file_csv, quantstats_benchmark_ticker, quantstats_auto_delete,
+    dump: str, dump_output_file: str, dump_auto_delete: bool, dump_streaming: bool, dump_row_group_size: int,
     #
-    pdf: bool, pdf_template: str, pdf_output_file: str, pdf_auto_delete: bool, pdf_debug: bool, pdf_variables: typing.Tuple[typing.Tuple[str, str]], pdf_user_script_paths: str,
+    quantstats, quantstats_output_file_html, quantstats_output_file_csv, quantstats_benchmark_ticker, quantstats_benchmark_source, quantstats_benchmark_file, quantstats_auto_delete,
     #
-    specific_return: str, specific_return_column_date: str, specific_return_column_symbol: str, specific_return_column_value: str, specific_return_output_file_html: str, specific_return_output_file_csv: str, specific_return_auto_delete: bool,
+    pdf: bool, pdf_template: str, pdf_template_cache_directory: typing.Optional[str], pdf_output_file: str, pdf_auto_delete: bool, pdf_debug: bool, pdf_variables: typing.Tuple[typing.Tuple[str, str]], pdf_user_script_paths: str, pdf_figure_format: str,
+    #
+    specific_return: str, specific_return_column_date: str, specific_return_column_symbol: str, specific_return_column_value: str, specific_return_output_file_html: str, specific_return_output_file_csv: str, specific_return_auto_delete: bool, specific_return_chunk_days: typing.Optional[int],
     #
     yahoo,
     #
@@ -177,10 +210,20 @@ def main(
         "nyse": lambda: SimpleHolidayProvider.nyse()
     }[holiday_provider_name])()
 
+    response_cache = None
+    if offline or not no_caching:
+        from .data.cache import ResponseCache
+        response_cache = ResponseCache(
+            ttl=datetime.timedelta(hours=cache_ttl),
+            offline=offline
+        )
+
     data_source = None
     if yahoo:
         from .data.source import YahooDataSource
-        data_source = YahooDataSource()
+        data_source = YahooDataSource(
+            cache=response_cache
+        )
 
     if coinmarketcap:
         if data_source is not None:
@@ -203,9 +246,9 @@ def main(
         )
 
     if file_parquet:
-        from .data.source import DataFrameDataSource
-        file_data_source = DataFrameDataSource(
-            dataframe=readwrite.read(file_parquet),
+        from .data.source import ParquetDataSource
+        file_data_source = ParquetDataSource(
+            path=file_parquet,
             date_column=file_parquet_column_date,
             symbol_column=file_parquet_column_symbol,
             price_column=file_parquet_column_price
@@ -227,7 +270,9 @@ def main(
 
     if data_source is None:
         from .data.source import YahooDataSource
-        data_source = YahooDataSource()
+        data_source = YahooDataSource(
+            cache=response_cache
+        )
 
         print(
             f"[warning] no data source selected, defaulting to --yahoo",
@@ -250,33 +295,79 @@ def main(
         from .fee import ConstantFeeModel
         fee_model = ConstantFeeModel(0.0)
 
+    from .export.report import MetricsCache, ReportPool
+    report_pool = ReportPool(workers=report_workers if report_workers > 0 else None) if report_workers != 0 else None
+    metrics_cache = MetricsCache(report_pool, native=not quantstats_metrics)
+
     exporters = []
+
+    # Notified first, so that the console prints statistics including the snapshot.
+    statistics_exporter = None
+    if statistics:
+        from .export import StatisticsExporter
+        statistics_exporter = StatisticsExporter(
+            output_file=statistics_output_file,
+            auto_delete=statistics_auto_delete,
+        )
+
+        exporters.append(statistics_exporter)
+
+    console_exporter = None
     if console:
         from .export import ConsoleExporter
-        exporters.append(ConsoleExporter(
+        console_exporter = ConsoleExporter(
             format=console_format,
             file={
                 "out": sys.stdout,
                 "err": sys.stderr
             }[console_file],
             hide_skips=console_hide_skips,
-            no_color=console_text_no_color
-        ))
+            no_color=console_text_no_color,
+            buffer_lines=console_buffer_lines,
+            flush_interval=console_flush_interval,
+            statistics=statistics_exporter.statistics if statistics_exporter is not None else None,
+        )
+
+        exporters.append(console_exporter)
 
     if dump:
         from .export import DumpExporter
         exporters.append(DumpExporter(
             output_file=dump_output_file,
             auto_delete=dump_auto_delete,
+            streaming=dump_streaming,
+            row_group_size=dump_row_group_size,
         ))
 
     if quantstats:
+        benchmark_source = None
+        if quantstats_benchmark_source == "yahoo":
+            from .data.benchmark import YahooBenchmarkSource
+            benchmark_source = YahooBenchmarkSource(
+                cache=response_cache
+            )
+        elif quantstats_benchmark_source == "data-source":
+            from .data.benchmark import PriceProviderBenchmarkSource
+            benchmark_source = PriceProviderBenchmarkSource()
+        elif quantstats_benchmark_source == "file":
+            if not quantstats_benchmark_file:
+                raise ValueError("--quantstats-benchmark-file is required with the `file` benchmark source")
+
+            from .data.benchmark import FileBenchmarkSource
+            benchmark_source = FileBenchmarkSource(
+                quantstats_benchmark_file
+            )
+
         from .export import QuantStatsExporter
         exporters.append(QuantStatsExporter(
             html_output_file=quantstats_output_file_html,
             csv_output_file=quantstats_output_file_csv,
             benchmark_ticker=quantstats_benchmark_ticker,
             auto_delete=quantstats_auto_delete,
+            benchmark_source=benchmark_source,
+            report_pool=report_pool,
+            # Only the pdf exporter reuses the metrics.
+            metrics_cache=metrics_cache if pdf else None,
         ))
 
     if specific_return:
@@ -289,6 +380,11 @@ def main(
             html_output_file=specific_return_output_file_html,
             csv_output_file=specific_return_output_file_csv,
             auto_delete=specific_return_auto_delete,
+            report_pool=report_pool,
+            start=start,
+            end=end,
+            symbols=order_provider.get_symbols(),
+            chunk_days=specific_return_chunk_days,
         ))
 
     if pdf:
@@ -299,7 +395,7 @@ def main(
         dump_exporter = next(
             filter(lambda x: isinstance(x, DumpExporter), exporters), None)
 
-        template = _load_template(pdf_template)
+        template = _load_template(pdf_template, pdf_template_cache_directory)
         user_scripts = _load_user_scripts(pdf_user_script_paths)
 
         from .export import PdfExporter
@@ -311,7 +407,11 @@ def main(
             auto_delete=pdf_auto_delete,
             debug=pdf_debug,
             variables=_to_variables(pdf_variables),
-            user_scripts=user_scripts
+            user_scripts=user_scripts,
+            report_pool=report_pool,
+            metrics_cache=metrics_cache,
+            font_cache_directory=pdf_template_cache_directory,
+            figure_format=pdf_figure_format,
         ))
 
     if not len(exporters):
@@ -321,8 +421,24 @@ def main(
         print(
             f"[warning] no exporter selected, defaulting to --console", file=sys.stderr)
 
+    exporter_elements = exporters
+    if async_exporters:
+        from .export import AsyncExporter
+        from .export.base import EVENT_ORDERED_SNAPSHOT, EVENT_SKIP, EVENT_SNAPSHOT
+
+        # The console reads the statistics as they are updated, both must stay in order.
+        synchronous_exporters = [statistics_exporter, console_exporter] if statistics_exporter is not None else []
+
+        # Exporters without any per-day event would gain nothing from a thread.
+        exporter_elements = [
+            AsyncExporter(exporter, queue_size=async_queue_size)
+            if exporter.events & {EVENT_SKIP, EVENT_SNAPSHOT, EVENT_ORDERED_SNAPSHOT} and exporter not in synchronous_exporters
+            else exporter
+            for exporter in exporters
+        ]
+
     from .backtest import SimpleBacktester
-    SimpleBacktester(
+    backtester = SimpleBacktester(
         start=start,
         end=end,
         order_provider=order_provider,
@@ -331,13 +447,26 @@ def main(
         auto_close_others=True,
         data_source=data_source,
         mapper=symbol_mapper,
-        exporters=exporters,
+        exporters=exporter_elements,
         fee_model=fee_model,
         caching=not no_caching,
         allow_weekends=weekends,
         allow_holidays=holidays,
-        holiday_provider=holiday_provider
-    ).run()
+        holiday_provider=holiday_provider,
+        prefetch=not no_prefetch,
+        prefetch_in_background=prefetch_background or bool(prefetch_chunk_days),
+        prefetch_chunk_days=prefetch_chunk_days,
+    )
+
+    if quantstats and quantstats_benchmark_source == "data-source":
+        # The benchmark shares the price cache of the backtest.
+        benchmark_source.price_provider = backtester.price_provider
+
+    try:
+        backtester.run()
+    finally:
+        if report_pool is not None:
+            report_pool.shutdown()
 
 
 @cli.group(name="template")
@@ -373,6 +502,10 @@ def info(
 @click.option('--dataframe-returns', "dataframe_returns_path", type=click.Path(exists=True), help="Specify the returns dataframe path (from quantstats exporter).")
 @click.option('--dataframe-benchmark', "dataframe_benchmark_path", type=click.Path(exists=True), help="Specify benchmark dataframe path (from quantstats exporter).")
 @click.option('--dataframe-dump', "dataframe_dump_path", type=click.Path(exists=True), help="Specify dump dataframe path (from dump exporter).")
+@click.option('--batch', "batch_path", type=click.Path(exists=True, dir_okay=False), help="Render every report listed in a json file, the other options being used as defaults.")
+@click.option('--workers', type=int, default=0, show_default=True, help="Number of processes rendering a batch, 0 to render in the current process, negative to use every cpu.")
+@click.option('--cache-directory', type=str, default=None, help="Specify a directory to cache the parsed templates and fonts in.")
+@click.option('--figure-format', type=click.Choice(["png", "svg"]), default="png", show_default=True, help="Specify the format of the figures, svg keeps them as vectors.")
 @click.argument('template-path', type=click.Path(exists=True, dir_okay=False), default="tearsheet.sketch")
 def render(
     output_file: str,
@@ -382,9 +515,76 @@ def render(
     dataframe_returns_path: typing.Optional[str],
     dataframe_benchmark_path: typing.Optional[str],
     dataframe_dump_path: typing.Optional[str],
+    batch_path: typing.Optional[str],
+    workers: int,
+    cache_directory: typing.Optional[str],
+    figure_format: str,
     template_path: str,
 ):
-    template = _load_template(template_path)
+    import functools
+    from .template import BatchRenderer, RenderJob
+
+    defaults = {
+        "output-file": output_file,
+        "variables": {},
+        "user-scripts": list(user_script_paths),
+        "dataframe-returns": dataframe_returns_path,
+        "dataframe-benchmark": dataframe_benchmark_path,
+        "dataframe-dump": dataframe_dump_path,
+    }
+
+    if batch_path is not None:
+        with open(batch_path) as fd:
+            entries = json.load(fd)
+
+        if not isinstance(entries, list):
+            raise click.BadParameter("must contain a list", param_hint="--batch")
+    else:
+        entries = [{}]
+
+    jobs = []
+    for entry in entries:
+        entry = {**defaults, **entry}
+
+        jobs.append(RenderJob(
+            output_file=entry["output-file"],
+            prepare=functools.partial(
+                _fill_template,
+                variables={
+                    **_to_variables(variables),
+                    **_to_variables(entry["variables"].items()),
+                },
+                user_script_paths=entry["user-scripts"],
+                dataframe_returns_path=entry["dataframe-returns"],
+                dataframe_benchmark_path=entry["dataframe-benchmark"],
+                dataframe_dump_path=entry["dataframe-dump"],
+                figure_format=figure_format,
+            ),
+        ))
+
+    output_files = [job.output_file for job in jobs]
+    if len(set(output_files)) != len(output_files):
+        raise click.BadParameter("output files must be unique", param_hint="--batch")
+
+    template = _load_template(template_path, cache_directory)
+
+    BatchRenderer(
+        template,
+        workers=workers if workers >= 0 else None,
+        debug=debug,
+        font_cache_directory=cache_directory,
+    ).render(jobs)
+
+
+def _fill_template(
+    template,
+    variables: typing.Dict[str, str],
+    user_script_paths: typing.List[str],
+    dataframe_returns_path: typing.Optional[str],
+    dataframe_benchmark_path: typing.Optional[str],
+    dataframe_dump_path: typing.Optional[str],
+    figure_format: str,
+):
     user_scripts = _load_user_scripts(user_script_paths)
 
     dataframe_returns = readwrite.read(dataframe_returns_path)
@@ -414,6 +614,8 @@ def render(
 
     dump_exporter = use_attrs({
         "dataframe": dataframe_dump,
+        # Only available from the buffered rows of a backtest.
+        "compute_exposures": lambda: None,
     })
 
     from .export import PdfExporter
@@ -421,12 +623,10 @@ def render(
         quantstats_exporter=quantstats_exporter,
         dump_exporter=dump_exporter,
         template=template,
-        output_file=output_file,
-        auto_delete=True,
-        debug=debug,
-        variables=_to_variables(variables),
-        user_scripts=user_scripts
-    ).finalize()
+        variables=variables,
+        user_scripts=user_scripts,
+        figure_format=figure_format,
+    ).fill_template()
 
 
 @template_group.command()
@@ -434,6 +634,7 @@ def render(
 @click.option('--debug', is_flag=True, help="Enable debug rendering.")
 @click.option('--watch', is_flag=True, help="Watch and continuously re-render.")
 @click.option('--open', "open_after_render", is_flag=True, help="Open after render.")
+@click.option('--cache-directory', type=str, default=None, help="Specify a directory to cache the parsed templates and fonts in.")
 @click.argument('template-path', type=click.Path(exists=True, dir_okay=False), default="tearsheet.sketch")
 def identity(
     template_path: str,
@@ -441,13 +642,17 @@ def identity(
     debug: bool,
     watch: bool,
     open_after_render: bool,
+    cache_directory: typing.Optional[str],
 ):
     from .template import PdfTemplateRenderer
-    renderer = PdfTemplateRenderer(debug=debug)
+    renderer = PdfTemplateRenderer(debug=debug, font_cache_directory=cache_directory)
+
+    # Kept across the re-renders, so that an unchanged template is not parsed again.
+    loader = _create_template_loader(template_path, cache_directory)
 
     def do_render():
         with contexttimer.Timer(prefix="loading", output=sys.stderr):
-            template = _load_template(template_path)
+            template = loader.load(template_path)
 
         with contexttimer.Timer(prefix="rendering", output=sys.stderr):
             with open(output_file, "wb") as fd:
@@ -496,14 +701,18 @@ def identity(
         do_render()
 
 
-def _load_template(path: str):
+def _create_template_loader(path: str, cache_directory: typing.Optional[str] = None):
     if path.endswith(".sketch"):
         from .template import SketchTemplateLoader
-        return SketchTemplateLoader().load(path)
+        return SketchTemplateLoader(cache_directory=cache_directory)
     else:
         raise click.Abort(f"unsupported template: {path}")
 
 
+def _load_template(path: str, cache_directory: typing.Optional[str] = None):
+    return _create_template_loader(path, cache_directory).load(path)
+
+
 def _load_user_scripts(paths: typing.List[str]):
     modules = []
 
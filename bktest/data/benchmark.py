@@ -0,0 +1,126 @@
+import abc
+import typing
+
+import numpy
+import pandas
+import quantstats
+import readwrite
+import yfinance
+
+from .cache import ResponseCache
+from .. import constants
+
+if typing.TYPE_CHECKING:
+    from ..price_provider import PriceProvider
+
+_CACHE_NAMESPACE = "yahoo-benchmark"
+
+
+class BenchmarkSource(metaclass=abc.ABCMeta):
+
+    def prefetch(self, ticker: str) -> None:
+        """
+        Called before the backtest start, allowing the benchmark prices to be
+        loaded alongside the other prices.
+        """
+
+        pass
+
+    @abc.abstractmethod
+    def get_returns(self, ticker: str) -> pandas.Series:
+        """
+        Return the daily returns of the ticker, indexed by a tz-naive `DatetimeIndex`.
+        """
+
+        raise NotImplementedError()
+
+    @staticmethod
+    def _to_returns(prices: pandas.Series) -> pandas.Series:
+        prices = prices.dropna()
+
+        values = prices.to_numpy(dtype=numpy.float64)
+        returns = numpy.full(len(values), numpy.nan)
+        returns[1:] = values[1:] / values[:-1] - 1
+
+        index = pandas.DatetimeIndex(prices.index, name=constants.DEFAULT_DATE_COLUMN)
+        return pandas.Series(returns, index=index, name=prices.name)
+
+
+class YahooBenchmarkSource(BenchmarkSource):
+
+    def __init__(self, cache: typing.Optional[ResponseCache] = None):
+        self.cache = cache
+
+    def get_returns(self, ticker):
+        if self.cache is None:
+            returns = quantstats.utils.download_returns(ticker)
+        else:
+            returns = self.cache.get(_CACHE_NAMESPACE, ticker)
+
+            if returns is None:
+                if self.cache.offline:
+                    raise ValueError(f"offline: benchmark {ticker} is not cached")
+
+                returns = yfinance.download(
+                    tickers=ticker,
+                    period="max",
+                    progress=False,
+                    session=self.cache.session,
+                )["Close"].pct_change()
+
+                self.cache.put(_CACHE_NAMESPACE, ticker, None, None, returns)
+
+        returns.index = pandas.DatetimeIndex(returns.index, name=constants.DEFAULT_DATE_COLUMN).tz_localize(None)
+
+        return returns
+
+
+class PriceProviderBenchmarkSource(BenchmarkSource):
+    """
+    Use the backtest's price provider, the benchmark is then stored in the same price cache.
+    The price provider can be set once the backtester is created, before it runs.
+    """
+
+    def __init__(self, price_provider: typing.Optional["PriceProvider"] = None):
+        self.price_provider = price_provider
+
+    def prefetch(self, ticker):
+        self.price_provider.download_missing([ticker])
+
+    def get_returns(self, ticker):
+        self.price_provider.download_missing([ticker])
+
+        return self._to_returns(self.price_provider.get_prices(ticker))
+
+
+class FileBenchmarkSource(BenchmarkSource):
+    """
+    Use a local file containing the benchmark prices.
+    If a symbol column is present, only the rows of the ticker are used.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        date_column=constants.DEFAULT_DATE_COLUMN,
+        symbol_column=constants.DEFAULT_SYMBOL_COLUMN,
+        price_column=constants.DEFAULT_PRICE_COLUMN,
+    ):
+        self.path = path
+        self.date_column = date_column
+        self.symbol_column = symbol_column
+        self.price_column = price_column
+
+    def get_returns(self, ticker):
+        dataframe = readwrite.read(self.path)
+
+        if self.symbol_column in dataframe.columns:
+            dataframe = dataframe[dataframe[self.symbol_column] == ticker]
+
+        prices = pandas.Series(
+            dataframe[self.price_column].values,
+            index=pandas.to_datetime(dataframe[self.date_column].values),
+            name=ticker
+        ).sort_index()
+
+        return self._to_returns(prices)
@@ -0,0 +1,94 @@
+import datetime
+import os
+import time
+import typing
+import urllib.parse
+
+import pandas
+import requests
+
+_VALUE_COLUMN = "value"
+
+
+class ResponseCache:
+    """
+    On-disk cache of the series downloaded by the network based sources.
+    Entries are keyed by namespace, ticker and range and expire after `ttl`.
+
+    In offline mode, the network must not be used: expired entries are still
+    returned and missing entries are reported as such.
+    """
+
+    def __init__(
+        self,
+        directory=".cache/responses",
+        ttl: typing.Optional[datetime.timedelta] = datetime.timedelta(days=1),
+        offline=False,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+
+        self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+
+        return self._session
+
+    def get(
+        self,
+        namespace: str,
+        ticker: str,
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+    ) -> typing.Optional[pandas.Series]:
+        path = self._get_path(namespace, ticker, start, end)
+
+        if not os.path.exists(path):
+            return None
+
+        if not self.offline and self._is_expired(path):
+            return None
+
+        series = pandas.read_parquet(path)[_VALUE_COLUMN]
+        series.name = ticker
+
+        return series
+
+    def put(
+        self,
+        namespace: str,
+        ticker: str,
+        start: typing.Optional[datetime.date],
+        end: typing.Optional[datetime.date],
+        series: pandas.Series,
+    ):
+        path = self._get_path(namespace, ticker, start, end)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temporary_path = f"{path}.tmp"
+        series.to_frame(name=_VALUE_COLUMN).to_parquet(temporary_path)
+        os.replace(temporary_path, path)
+
+    def _is_expired(self, path: str):
+        if self.ttl is None:
+            return False
+
+        age = time.time() - os.path.getmtime(path)
+        return age > self.ttl.total_seconds()
+
+    def _get_path(
+        self,
+        namespace: str,
+        ticker: str,
+        start: typing.Optional[datetime.date],
+        end: typing.Optional[datetime.date],
+    ):
+        name = urllib.parse.quote(ticker, safe="")
+        range = f"s{start}-e{end}" if start or end else "max"
+
+        return os.path.join(self.directory, namespace, f"{name}-{range}.parquet")
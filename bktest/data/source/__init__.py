@@ -3,4 +3,5 @@ from .coinmarketcap import CoinMarketCapDataSource
 from .dataframe import DataFrameDataSource
 from .delegate import DelegateDataSource
 from .factset import FactsetDataSource
+from .parquet import ParquetDataSource
 from .yahoo import YahooDataSource
@@ -0,0 +1,114 @@
+import datetime
+import typing
+
+import numpy
+import pandas
+import pyarrow
+import pyarrow.dataset
+
+from .base import DataSource
+from ... import constants
+
+
+class ParquetDataSource(DataSource):
+    """
+    Read prices from a .parquet file or a (hive) partitioned dataset directory.
+
+    Symbols and the date range are pushed down to the reader, so only the
+    needed columns are read and row groups are pruned using their statistics.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        date_column=constants.DEFAULT_DATE_COLUMN,
+        symbol_column=constants.DEFAULT_SYMBOL_COLUMN,
+        price_column=constants.DEFAULT_PRICE_COLUMN,
+        closeable=True,
+        partitioning: typing.Optional[str] = "hive",
+    ) -> None:
+        super().__init__()
+
+        self.dataset = pyarrow.dataset.dataset(
+            path,
+            format="parquet",
+            partitioning=partitioning
+        )
+
+        schema = self.dataset.schema
+        for column in [date_column, symbol_column, price_column]:
+            if schema.get_field_index(column) == -1:
+                raise ValueError(f"column {column} not found")
+
+        self.date_column = date_column
+        self.symbol_column = symbol_column
+        self.price_column = price_column
+        self.closeable = closeable
+
+    def fetch_prices(self, symbols, start, end):
+        symbols = set(symbols)
+
+        date_field = pyarrow.dataset.field(self.date_column)
+        symbol_field = pyarrow.dataset.field(self.symbol_column)
+
+        table = self.dataset.to_table(
+            columns=[self.date_column, self.symbol_column, self.price_column],
+            filter=(
+                symbol_field.isin(list(symbols)) &
+                (date_field >= self._to_date_scalar(start)) &
+                (date_field <= self._to_date_scalar(end))
+            )
+        )
+
+        dataframe = table.to_pandas()
+        dataframe = dataframe.drop_duplicates(
+            subset=[self.symbol_column, self.date_column],
+            keep="first"
+        )
+
+        prices = dataframe.pivot(
+            index=self.date_column,
+            columns=self.symbol_column,
+            values=self.price_column
+        )
+
+        if len(prices.columns):
+            prices.index = pandas.to_datetime(prices.index)
+            prices.columns = pandas.Index(list(prices.columns))
+        else:
+            prices = pandas.DataFrame(
+                index=pandas.date_range(start=start, end=end)
+            )
+
+        prices.index.name = constants.DEFAULT_DATE_COLUMN
+
+        missings = symbols - set(prices.columns)
+        prices[list(missings)] = numpy.nan
+
+        return prices
+
+    def is_closeable(self):
+        return self.closeable
+
+    def _to_date_scalar(self, date: datetime.date):
+        type = self.dataset.schema.field(self.date_column).type
+
+        return to_date_scalar(date, type)
+
+
+def to_date_scalar(date: datetime.date, type: pyarrow.DataType) -> pyarrow.Scalar:
+    """
+    Convert a date to a scalar comparable with a column of the given type.
+    """
+
+    if pyarrow.types.is_string(type) or pyarrow.types.is_large_string(type):
+        return pyarrow.scalar(date.isoformat(), type=type)
+
+    if pyarrow.types.is_timestamp(type):
+        timestamp = pandas.Timestamp(date)
+        if type.tz is not None:
+            timestamp = timestamp.tz_localize(type.tz)
+
+        return pyarrow.scalar(timestamp, type=type)
+
+    return pyarrow.scalar(date, type=type)
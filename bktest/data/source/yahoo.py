@@ -1,22 +1,79 @@
+import sys
+import typing
+
+import numpy
+import pandas
 import yfinance
 
+from ..cache import ResponseCache
 from .base import DataSource
 from ... import constants
 
+_CACHE_NAMESPACE = "yahoo"
+
 
 class YahooDataSource(DataSource):
 
+    def __init__(self, cache: typing.Optional[ResponseCache] = None):
+        super().__init__()
+
+        self.cache = cache
+
     def fetch_prices(self, symbols, start, end):
+        symbols = list(symbols)
+
+        if self.cache is None:
+            return self._download(symbols, start, end)
+
+        series, missings = [], []
+        for symbol in symbols:
+            cached = self.cache.get(_CACHE_NAMESPACE, symbol, start, end)
+
+            if cached is not None:
+                series.append(cached)
+            else:
+                missings.append(symbol)
+
+        if len(missings):
+            if self.cache.offline:
+                print(f"[warning] offline: {len(missings)} symbol(s) not cached", file=sys.stderr)
+            else:
+                prices = self._download(missings, start, end)
+
+                for symbol in missings:
+                    values = prices[symbol]
+
+                    if values.notna().any():
+                        self.cache.put(_CACHE_NAMESPACE, symbol, start, end, values)
+
+                    series.append(values)
+
+                missings = []
+
+        prices = pandas.concat(series, axis=1) if len(series) else pandas.DataFrame(
+            index=pandas.date_range(start=start, end=end)
+        )
+
+        prices[missings] = numpy.nan
+        prices.index.name = constants.DEFAULT_DATE_COLUMN
+
+        return prices
+
+    def is_closeable(self):
+        return True
+
+    def _download(self, symbols: typing.List[str], start, end) -> pandas.DataFrame:
         prices = yfinance.download(
             tickers=symbols,
             start=start,
             end=end,
-            show_errors=False
+            show_errors=False,
+            session=self.cache.session if self.cache is not None else None,
         )["Adj Close"]
 
+        if isinstance(prices, pandas.Series):
+            prices = prices.to_frame(name=symbols[0])
+
         prices.index.name = constants.DEFAULT_DATE_COLUMN
 
         return prices
-
-    def is_closeable(self):
-        return True
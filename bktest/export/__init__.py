@@ -1,9 +1,11 @@
+from .asynchronous import AsyncExporter
 from .base import Exporter, ExporterCollection
 from .console import ConsoleExporter
 from .dump import DumpExporter
-from .model import Snapshot
+from .model import DeltaSnapshot, Snapshot
 from .pdf import PdfExporter
 from .quants import QuantStatsExporter
 from .specific_return import SpecificReturnExporter
+from .statistics import RunningStatistics, StatisticsExporter
 
 BaseExporter = Exporter
@@ -0,0 +1,125 @@
+import copy
+import dataclasses
+import datetime
+import queue
+import threading
+import typing
+
+from .base import EVENT_FINALIZE, EVENT_INITIALIZE, Exporter
+from .model import DeltaSnapshot, Snapshot
+
+_STOP = object()
+
+
+class AsyncExporter(Exporter):
+    """
+    Run an exporter in a background thread, so that its I/O overlaps with the simulation.
+
+    Events are handed to the worker through a bounded queue: when the worker
+    is late, the simulation waits for a free slot instead of buffering forever.
+    The snapshots are copied beforehand, since the account keeps changing.
+    """
+
+    def __init__(
+        self,
+        exporter: Exporter,
+        queue_size=1024,
+    ):
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+
+        self.exporter = exporter
+        self.queue_size = queue_size
+
+        self.events = exporter.events | {EVENT_INITIALIZE, EVENT_FINALIZE}
+        self.delta_snapshot = exporter.delta_snapshot
+
+        self._queue: typing.Optional[queue.Queue] = None
+        self._thread: typing.Optional[threading.Thread] = None
+        self._error: typing.Optional[BaseException] = None
+
+    def initialize(self) -> None:
+        if EVENT_INITIALIZE in self.exporter.events:
+            self.exporter.initialize()
+
+        self._error = None
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"exporter-{type(self.exporter).__name__}",
+            daemon=True
+        )
+
+        self._thread.start()
+
+    def on_skip(self, date: datetime.date, reason: str, ordered: bool) -> None:
+        self._put(self.exporter.on_skip, date, reason, ordered)
+
+    def on_snapshot(self, snapshot: Snapshot) -> None:
+        snapshot = Snapshot(**{
+            field.name: getattr(snapshot, field.name)
+            for field in dataclasses.fields(Snapshot)
+        })
+
+        snapshot.holdings = [
+            copy.copy(holding)
+            for holding in snapshot.holdings
+        ]
+
+        self._put(self.exporter.on_snapshot, snapshot)
+
+    def on_delta_snapshot(self, snapshot: DeltaSnapshot) -> None:
+        snapshot = dataclasses.replace(
+            snapshot,
+            changed=[
+                copy.copy(holding)
+                for holding in snapshot.changed
+            ]
+        )
+
+        self._put(self.exporter.on_delta_snapshot, snapshot)
+
+    def finalize(self) -> None:
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+            self._thread = None
+            self._queue = None
+
+        self._raise_error()
+
+        if EVENT_FINALIZE in self.exporter.events:
+            self.exporter.finalize()
+
+    def _put(self, method: typing.Callable, *args):
+        self._raise_error()
+
+        if self._queue is None:
+            raise ValueError("exporter not initialized")
+
+        self._queue.put((method, args))
+
+    def _raise_error(self):
+        error = self._error
+
+        if error is not None:
+            self._error = None
+            raise error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            # Keep draining after a failure so that the producer is never blocked.
+            if self._error is not None:
+                continue
+
+            method, args = item
+
+            try:
+                method(*args)
+            except BaseException as error:
+                self._error = error
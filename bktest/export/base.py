@@ -1,11 +1,31 @@
 import datetime
 import typing
 
-from .model import Snapshot
+from .model import DeltaSnapshot, LazySnapshot, Snapshot
+
+EVENT_INITIALIZE = "initialize"
+EVENT_SKIP = "skip"
+EVENT_SNAPSHOT = "snapshot"
+EVENT_ORDERED_SNAPSHOT = "ordered-snapshot"
+EVENT_FINALIZE = "finalize"
+
+ALL_EVENTS = frozenset([
+    EVENT_INITIALIZE,
+    EVENT_SKIP,
+    EVENT_SNAPSHOT,
+    EVENT_ORDERED_SNAPSHOT,
+    EVENT_FINALIZE,
+])
 
 
 class Exporter:
 
+    # The events the exporter will be notified of.
+    events: typing.FrozenSet[str] = ALL_EVENTS
+
+    # If true, `on_delta_snapshot` will be called instead of `on_snapshot`.
+    delta_snapshot = False
+
     def initialize(self) -> None:
         pass
 
@@ -15,6 +35,9 @@ class Exporter:
     def on_snapshot(self, snapshot: Snapshot) -> None:
         pass
 
+    def on_delta_snapshot(self, snapshot: DeltaSnapshot) -> None:
+        pass
+
     def finalize(self) -> None:
         pass
 
@@ -27,12 +50,15 @@ class ExporterCollection:
     ):
         self.elements = [] if elements is None else elements
 
+        # Keyed by the subscribed events, so that a diff is always relative to the previous delta snapshot received.
+        self._previous_holdings: typing.Dict[typing.FrozenSet[str], typing.Dict[str, typing.Tuple[float, float]]] = {}
+
     def fire_initialize(self):
-        for exporter in self.elements:
+        for exporter in self._subscribers(EVENT_INITIALIZE):
             exporter.initialize()
 
     def fire_finalize(self):
-        for exporter in self.elements:
+        for exporter in self._subscribers(EVENT_FINALIZE):
             exporter.finalize()
 
     def fire_skip(
@@ -41,7 +67,7 @@ class ExporterCollection:
         reason: str,
         ordered: bool
     ):
-        for exporter in self.elements:
+        for exporter in self._subscribers(EVENT_SKIP):
             exporter.on_skip(date, reason, ordered)
 
     def fire_snapshot(
@@ -51,27 +77,93 @@ class ExporterCollection:
         result: "OrderResultCollection",
         postponned=None
     ):
-        cash = float(account.cash)
-        equity = float(account.equity)
-        holdings = account.holdings
-        ordered = result is not None
+        event = EVENT_ORDERED_SNAPSHOT if result is not None else EVENT_SNAPSHOT
 
-        snapshot = Snapshot(
+        exporters = self._subscribers(event)
+        if not len(exporters):
+            return
+
+        snapshot = LazySnapshot(
             date=date,
             postponned=postponned,
-            cash=cash,
-            equity=equity,
-            holdings=holdings,
-            ordered=ordered,
+            account=account,
+            result=result,
+        )
+
+        # The holdings are only diffed for the exporters that asked for a delta, once per group of events.
+        delta_snapshots: typing.Dict[typing.FrozenSet[str], DeltaSnapshot] = {}
+
+        for exporter in exporters:
+            if not exporter.delta_snapshot:
+                exporter.on_snapshot(snapshot)
+                continue
+
+            delta_snapshot = delta_snapshots.get(exporter.events)
+            if delta_snapshot is None:
+                delta_snapshot = self._create_delta_snapshot(snapshot, account, exporter.events)
+                delta_snapshots[exporter.events] = delta_snapshot
+
+            exporter.on_delta_snapshot(delta_snapshot)
+
+    def _create_delta_snapshot(
+        self,
+        snapshot: Snapshot,
+        account: "Account",
+        events: typing.FrozenSet[str]
+    ) -> DeltaSnapshot:
+        previous = self._previous_holdings.setdefault(events, {})
+        changed, removed = self._diff_holdings(account, previous)
+
+        delta_snapshot = DeltaSnapshot(
+            date=snapshot.date,
+            postponned=snapshot.postponned,
+            cash=snapshot.cash,
+            equity=snapshot.equity,
+            ordered=snapshot.ordered,
+            changed=changed,
+            removed=removed,
+            holding_count=len(previous),
         )
 
-        if ordered:
-            snapshot.total_fees = result.total_fees
-            snapshot.success_count = result.success_count
-            snapshot.failed_count = result.failed_count
+        if snapshot.ordered:
+            delta_snapshot.total_fees = snapshot.total_fees
+            delta_snapshot.success_count = snapshot.success_count
+            delta_snapshot.failed_count = snapshot.failed_count
+
+            delta_snapshot.closed_count = snapshot.closed_count
+            delta_snapshot.closed_total = snapshot.closed_total
+
+        return delta_snapshot
+
+    def _subscribers(self, event: str) -> typing.List[Exporter]:
+        return [
+            exporter
+            for exporter in self.elements
+            if event in exporter.events
+        ]
+
+    def _diff_holdings(
+        self,
+        account: "Account",
+        previous: typing.Dict[str, typing.Tuple[float, float]]
+    ):
+        holdings = account.holdings_view
+
+        changed = []
+        for symbol, holding in holdings.items():
+            state = (holding.quantity, holding.price)
+
+            if previous.get(symbol) != state:
+                previous[symbol] = state
+                changed.append(holding)
+
+        removed = [
+            symbol
+            for symbol in previous.keys()
+            if symbol not in holdings
+        ]
 
-            snapshot.closed_count = result.closed_count
-            snapshot.closed_total = result.closed_total
+        for symbol in removed:
+            del previous[symbol]
 
-        for exporter in self.elements:
-            exporter.on_snapshot(snapshot)
+        return changed, removed
@@ -1,26 +1,84 @@
 import abc
+import atexit
+import contextlib
 import datetime
 import json
 import sys
+import time
 import typing
+import weakref
 
 from .base import Exporter
 from .model import Snapshot
+from .statistics import RunningStatistics, to_json_values
+
+# Not finalized yet, flushed at exit so that no line is lost if the backtest fails.
+_pending_delegates: "weakref.WeakSet[ConsoleDelegate]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_delegates():
+    for delegate in list(_pending_delegates):
+        with contextlib.suppress(ValueError):  # closed file
+            delegate.flush()
 
 
 class ConsoleDelegate(Exporter):
+    """
+    Lines are rendered into a buffer which is written in a single call once
+    `buffer_lines` lines are pending or `flush_interval` seconds have passed
+    since the last write. The interval is only checked when a line is added.
+    By default, lines are only buffered when the file is not a terminal.
+
+    When `statistics` is specified, their current values are printed with each snapshot.
+    """
+
+    def __init__(self, file, buffer_lines: typing.Optional[int] = None, flush_interval=1.0, statistics: typing.Optional[RunningStatistics] = None):
+        if buffer_lines is None:
+            buffer_lines = 1 if _is_terminal(file) else 512
 
-    def __init__(self, file):
         self.file = file
+        self.buffer_lines = max(buffer_lines, 1)
+        self.flush_interval = flush_interval
+        self.statistics = statistics
+
+        self._buffer: typing.List[str] = []
+        self._last_flush = time.monotonic()
+
+        _pending_delegates.add(self)
 
     def _print(self, content):
-        print(content, file=self.file)
+        self._buffer.append(content)
+        self._buffer.append("\n")
+
+        if len(self._buffer) >= self.buffer_lines * 2 or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if len(self._buffer):
+            self.file.write("".join(self._buffer))
+            self.file.flush()
+
+            self._buffer.clear()
+
+        self._last_flush = time.monotonic()
+
+    def finalize(self) -> None:
+        self.flush()
+
+        _pending_delegates.discard(self)
+
+
+def _is_terminal(file) -> bool:
+    isatty = getattr(file, "isatty", None)
+
+    return isatty is not None and isatty()
 
 
 class TextConsoleDelegate(ConsoleDelegate):
 
-    def __init__(self, file, no_color=False, prefix="", **kwargs):
-        super().__init__(file)
+    def __init__(self, file, no_color=False, prefix="", buffer_lines=None, flush_interval=1.0, statistics=None, **kwargs):
+        super().__init__(file, buffer_lines, flush_interval, statistics)
 
         self.no_color = no_color
         self.prefix = prefix
@@ -79,6 +137,12 @@ class TextConsoleDelegate(ConsoleDelegate):
                 closed_total = snapshot.closed_total
                 line += f"    [closed={closed_count}/{closed_total}]"
 
+        if self.statistics is not None:
+            statistics = self.statistics
+            line += f"    [sharpe={statistics.sharpe:6.2f}]"
+            line += f"    [drawdown={statistics.drawdown * 100:7.2f}%]"
+            line += f"    [hit-rate={statistics.hit_rate * 100:6.2f}%]"
+
         self._print(line)
 
     def _ordered_to_string(self, snapshot: Snapshot):
@@ -104,8 +168,8 @@ class TextConsoleDelegate(ConsoleDelegate):
 
 class JsonConsoleDelegate(ConsoleDelegate):
 
-    def __init__(self, file, **kwargs):
-        super().__init__(file)
+    def __init__(self, file, buffer_lines=None, flush_interval=1.0, statistics=None, **kwargs):
+        super().__init__(file, buffer_lines, flush_interval, statistics)
 
         self.first = False
 
@@ -115,8 +179,6 @@ class JsonConsoleDelegate(ConsoleDelegate):
 
     @abc.abstractmethod
     def on_skip(self, date: datetime.date, reason: str, ordered: bool) -> None:
-        self._coma()
-
         self._print_json({
             "event": "SKIP",
             "date": str(date),
@@ -126,9 +188,7 @@ class JsonConsoleDelegate(ConsoleDelegate):
 
     @abc.abstractmethod
     def on_snapshot(self, snapshot: Snapshot) -> None:
-        self._coma()
-
-        self._print_json({
+        object = {
             "event": "SNAPSHOT",
             "date": str(snapshot.date),
             "ordered": snapshot.ordered,
@@ -142,29 +202,58 @@ class JsonConsoleDelegate(ConsoleDelegate):
                 "count": snapshot.closed_count,
                 "total": snapshot.closed_total
             }
-        })
+        }
+
+        if self.statistics is not None:
+            object["statistics"] = to_json_values(self.statistics.to_dict())
+
+        self._print_json(object)
 
     @abc.abstractmethod
     def finalize(self) -> None:
         self._print("]")
 
+        super().finalize()
+
     def _coma(self):
         if not self.first:
             self.first = True
-            print(" ", end="", file=self.file)
+            return " "
         else:
-            print(",", end="", file=self.file)
+            return ","
+
+    def _print_json(self, object: dict):
+        self._print(self._coma() + json.dumps(object))
+
+
+class JsonLinesConsoleDelegate(JsonConsoleDelegate):
+    """
+    One JSON object per line, without any framing, so that the output can be parsed as a stream.
+    """
+
+    @abc.abstractmethod
+    def initialize(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def finalize(self) -> None:
+        ConsoleDelegate.finalize(self)
 
     def _print_json(self, object: dict):
         self._print(json.dumps(object))
 
 
 class ConsoleExporter(Exporter):
+    """
+    The `statistics` of a `StatisticsExporter` can be printed with each snapshot.
+    It must then be notified before the console, so that they include the snapshot.
+    """
 
     def __init__(self, format="text", file=sys.stdout, hide_skips=False, **kwargs):
         self.delegate = {
             "text": TextConsoleDelegate,
-            "json": JsonConsoleDelegate
+            "json": JsonConsoleDelegate,
+            "jsonl": JsonLinesConsoleDelegate,
         }[format](file, **kwargs)
 
         self.hide_skips = hide_skips
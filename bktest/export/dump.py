@@ -1,15 +1,19 @@
 import abc
 import datetime
-import math
 import os
 import sys
 import typing
 
+import numpy
 import pandas
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
 import readwrite
 
-from ..utils import signum
-from .base import Exporter
+from .. import analytics
+from ..utils import GrowableArray
+from .base import EVENT_FINALIZE, EVENT_INITIALIZE, EVENT_ORDERED_SNAPSHOT, EVENT_SNAPSHOT, Exporter
 from .model import Snapshot
 
 
@@ -23,112 +27,365 @@ _COLUMNS = [
     "ordered"
 ]
 
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+_STREAM_SCHEMA = pyarrow.schema([
+    ("date", pyarrow.date32()),
+    ("symbol", pyarrow.string()),
+    ("quantity", pyarrow.float64()),
+    ("price", pyarrow.float64()),
+    ("market_price", pyarrow.float64()),
+    ("equity", pyarrow.float64()),
+    ("ordered", pyarrow.float64()),
+    ("profit", pyarrow.float64()),
+])
+
+
+class _DumpStreamWriter:
+    """
+    Write the dump row group by row group, the profit being computed from the previous row of each symbol.
+    Unlike the in-memory dump, rows are ordered by date and no row is written for a symbol before it is first held.
+    """
+
+    def __init__(self, path: str, row_group_size: int):
+        if path.endswith(".parquet"):
+            self._open = lambda: pyarrow.parquet.ParquetWriter(path, _STREAM_SCHEMA)
+        elif path.endswith(".arrow"):
+            self._open = lambda: pyarrow.ipc.new_stream(path, _STREAM_SCHEMA)
+        else:
+            raise ValueError(f"streaming dump only supports .parquet and .arrow files: {path}")
+
+        self.row_group_size = row_group_size
+
+        self._writer = None
+        self._last_prices: typing.Dict[str, float] = {}
+        self._current_date: typing.Optional[datetime.date] = None
+        self._present: typing.Set[str] = set()
+
+        self._dates = GrowableArray(numpy.int32, row_group_size)
+        self._symbols: typing.List[str] = []
+        self._quantities = GrowableArray(numpy.float64, row_group_size)
+        self._prices = GrowableArray(numpy.float64, row_group_size)
+        self._market_prices = GrowableArray(numpy.float64, row_group_size)
+        self._equities = GrowableArray(numpy.float64, row_group_size)
+        self._ordereds = GrowableArray(numpy.float64, row_group_size)
+        self._profits = GrowableArray(numpy.float64, row_group_size)
+
+    def on_snapshot(self, snapshot: Snapshot):
+        if snapshot.date != self._current_date:
+            self._close_date()
+            self._current_date = snapshot.date
+
+        date = snapshot.real_date
+        if date == snapshot.date:
+            self._present.update(holding.symbol for holding in snapshot.holdings)
+
+        last_prices = self._last_prices
+        for holding in snapshot.holdings:
+            symbol = holding.symbol
+            quantity = holding.quantity
+            price = holding.price
+
+            price_yesterday = last_prices.get(symbol, numpy.nan)
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                profit = float((numpy.float64(price) - price_yesterday) / price_yesterday)
+            if quantity < 0:
+                profit *= -1
+
+            last_prices[symbol] = price
+
+            self._append(date, symbol, quantity, price, holding.market_price, snapshot.equity, float(snapshot.ordered), profit)
+
+    def close(self):
+        self._close_date()
+        self._flush()
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _close_date(self):
+        if self._current_date is None:
+            return
+
+        for symbol in sorted(self._last_prices.keys() - self._present):
+            self._last_prices[symbol] = numpy.nan
+            self._append(self._current_date, symbol, 0, numpy.nan, numpy.nan, numpy.nan, numpy.nan, numpy.nan)
+
+        self._present = set()
+
+    def _append(self, date, symbol, quantity, price, market_price, equity, ordered, profit):
+        self._dates.append(date.toordinal() - _EPOCH_ORDINAL)
+        self._symbols.append(symbol)
+        self._quantities.append(quantity)
+        self._prices.append(price)
+        self._market_prices.append(market_price)
+        self._equities.append(equity)
+        self._ordereds.append(ordered)
+        self._profits.append(profit)
+
+        if len(self._dates) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not len(self._dates):
+            return
+
+        table = pyarrow.Table.from_arrays([
+            pyarrow.array(self._dates.values).cast(pyarrow.date32()),
+            pyarrow.array(self._symbols, type=pyarrow.string()),
+            pyarrow.array(self._quantities.values),
+            pyarrow.array(self._prices.values),
+            pyarrow.array(self._market_prices.values),
+            pyarrow.array(self._equities.values),
+            pyarrow.array(self._ordereds.values),
+            pyarrow.array(self._profits.values),
+        ], schema=_STREAM_SCHEMA)
+
+        if self._writer is None:
+            self._writer = self._open()
+
+        self._writer.write_table(table)
+
+        for buffer in [self._dates, self._quantities, self._prices, self._market_prices, self._equities, self._ordereds, self._profits]:
+            buffer.clear()
+
+        self._symbols = []
+
 
 class DumpExporter(Exporter):
 
+    events = frozenset([EVENT_INITIALIZE, EVENT_SNAPSHOT, EVENT_ORDERED_SNAPSHOT, EVENT_FINALIZE])
+
     def __init__(
         self,
         output_file='dump.csv',
         auto_delete=False,
-        auto_override=False
+        auto_override=False,
+        streaming=False,
+        row_group_size=100_000,
     ):
         self.output_file = output_file
         self.auto_delete = auto_delete
         self.auto_override = auto_override
+        self.streaming = streaming
+        self.row_group_size = row_group_size
+
+        if streaming and output_file is None:
+            raise ValueError("streaming dump requires an output file")
+
+        self.dataframe = None
+        self._stream = None
 
         self.all_dates = set()
-        self.rows = []
+
+        self._symbols: typing.List[str] = []
+        self._symbol_codes: typing.Dict[str, int] = {}
+        self._integer_quantities = True
+        self._date_offsets: typing.Dict[int, int] = {}
+
+        self._dates = GrowableArray(numpy.int64)
+        self._symbol_indexes = GrowableArray(numpy.int32)
+        self._quantities = GrowableArray(numpy.float64)
+        self._prices = GrowableArray(numpy.float64)
+        self._equities = GrowableArray(numpy.float64)
+        self._ordereds = GrowableArray(numpy.float64)
 
     @abc.abstractmethod
     def initialize(self) -> None:
-        if self.auto_override:
-            return
+        if not self.auto_override:
+            for file in [self.output_file]:
+                if file is None or not os.path.exists(file):
+                    continue
 
-        for file in [self.output_file]:
-            if file is None or not os.path.exists(file):
-                continue
+                can_delete = self.auto_delete
+                if not can_delete:
+                    can_delete = input(
+                        f"{file}: delete file? [y/N]"
+                    ).lower() == 'y'
 
-            can_delete = self.auto_delete
-            if not can_delete:
-                can_delete = input(
-                    f"{file}: delete file? [y/N]"
-                ).lower() == 'y'
+                if can_delete:
+                    os.remove(file)
 
-            if can_delete:
-                os.remove(file)
+        if self.streaming:
+            if self.auto_override or not os.path.exists(self.output_file):
+                self._stream = _DumpStreamWriter(self.output_file, self.row_group_size)
+            else:
+                print(
+                    f"[warning] {self.output_file} already exists",
+                    file=sys.stderr
+                )
 
     @abc.abstractmethod
     def on_snapshot(self, snapshot: Snapshot) -> None:
+        if self.streaming:
+            if self._stream is not None:
+                self._stream.on_snapshot(snapshot)
+
+            return
+
         date = snapshot.date
         self.all_dates.add(date)
 
         if snapshot.postponned is not None:
             date = snapshot.postponned
 
-        common = [
-            snapshot.equity,
-            float(snapshot.ordered),
-        ]
-
-        self.rows.extend([
-            (
-                date,
-                holding.symbol,
-                holding.quantity,
-                holding.price,
-                holding.market_price,
-                *common
-            )
-            for holding in snapshot.holdings
-        ])
+        # Only the last snapshot of a date describes its end-of-day holdings.
+        self._date_offsets[date.toordinal()] = len(self._dates)
 
-    def get_missing_dates(self, dates: typing.Set[datetime.date]):
-        return list(filter(
-            lambda x: x not in dates,
-            self.all_dates
-        ))
+        holdings = snapshot.holdings
+        count = len(holdings)
+        if not count:
+            return
 
-    @abc.abstractmethod
-    def finalize(self) -> None:
-        self.dataframe = pandas.DataFrame(
-            self.rows,
-            columns=_COLUMNS
+        symbol_codes = self._symbol_codes
+        symbol_indexes, quantities, prices = [], [], []
+
+        for holding in holdings:
+            symbol = holding.symbol
+
+            index = symbol_codes.get(symbol)
+            if index is None:
+                index = symbol_codes[symbol] = len(self._symbols)
+                self._symbols.append(symbol)
+
+            quantity = holding.quantity
+            if self._integer_quantities and not isinstance(quantity, (int, numpy.integer)):
+                self._integer_quantities = False
+
+            symbol_indexes.append(index)
+            quantities.append(quantity)
+            prices.append(holding.price)
+
+        self._dates.fill(date.toordinal(), count)
+        self._symbol_indexes.extend(symbol_indexes)
+        self._quantities.extend(quantities)
+        self._prices.extend(prices)
+        self._equities.fill(snapshot.equity, count)
+        self._ordereds.fill(float(snapshot.ordered), count)
+
+    def compute_exposures(self) -> typing.Optional[typing.Dict[str, float]]:
+        """
+        Compute the exposure, turnover and concentration metrics from the buffered rows.
+        Not available when streaming, since the rows are not kept.
+        """
+
+        if self.streaming or not len(self.all_dates):
+            return None
+
+        dates = self._dates.values
+
+        offset_ordinals = numpy.array(sorted(self._date_offsets.keys()), dtype=numpy.int64)
+        offsets = numpy.array([self._date_offsets[ordinal] for ordinal in offset_ordinals.tolist()], dtype=numpy.int64)
+
+        # Postponned orders are dumped with a date that has no snapshot of its own.
+        ordinals = numpy.union1d(
+            numpy.fromiter((date.toordinal() for date in self.all_dates), dtype=numpy.int64),
+            offset_ordinals,
         )
 
-        if not len(self.dataframe):
-            print(
-                "[warning] cannot create dump: dataframe is empty",
-                file=sys.stderr
-            )
+        # Rows of the earlier snapshots of a date are superseded.
+        offsets = offsets[numpy.searchsorted(offset_ordinals, dates)]
+        last = numpy.arange(len(dates)) >= offsets
 
-            return
+        return analytics.compute_exposures(
+            numpy.searchsorted(ordinals, dates[last]),
+            self._symbol_indexes.values[last],
+            self._quantities.values[last],
+            self._prices.values[last],
+            self._equities.values[last],
+            (len(ordinals), len(self._symbols)),
+        )
 
-        def inverse_sign_if_shorting(row: pandas.Series):
-            if signum(row['quantity']) == -1:
-                row['profit'] = row['profit'] * -1
+    def _to_dataframe(self) -> pandas.DataFrame:
+        ordinals, date_indexes = numpy.unique(self._dates.values, return_inverse=True)
+        dates = numpy.array([
+            datetime.date.fromordinal(ordinal)
+            for ordinal in ordinals
+        ], dtype=object)
 
-            return row
+        quantities = self._quantities.values
+        if self._integer_quantities:
+            quantities = quantities.astype(numpy.int64)
 
-        def compute_profit(group: pandas.DataFrame):
-            missing = self.get_missing_dates(group["date"].unique())
-            holes = pandas.DataFrame(
-                [
-                    [date, group.name, 0, math.nan, math.nan, math.nan, math.nan]
-                    for date in missing
-                ],
-                columns=_COLUMNS,
-            )
+        prices = self._prices.values
+
+        return pandas.DataFrame({
+            "date": dates[date_indexes],
+            "symbol": numpy.array(self._symbols, dtype=object)[self._symbol_indexes.values],
+            "quantity": quantities,
+            "price": prices,
+            "market_price": self._quantities.values * prices,
+            "equity": self._equities.values,
+            "ordered": self._ordereds.values,
+        }, columns=_COLUMNS, copy=False)
 
-            group = pandas.concat([group, holes])
-            group.sort_values("date", inplace=True)
+    def _compute_profit(self, dataframe: pandas.DataFrame) -> pandas.DataFrame:
+        """
+        Add a row (with a quantity of 0) for every date a symbol was not held,
+        then compute the day-over-day price change of each symbol, negated when shorting.
+        """
 
-            price_yesterday = group["price"].shift(1)
+        symbol_codes, symbols = pandas.factorize(dataframe["symbol"], sort=True)
 
-            group['profit'] = (group['price'] - price_yesterday) / price_yesterday
+        all_dates = pandas.Index(sorted(self.all_dates))
+        date_codes = all_dates.get_indexer(dataframe["date"])
 
-            return group.apply(inverse_sign_if_shorting, axis=1)
+        known = date_codes != -1
+        held = numpy.zeros((len(all_dates), len(symbols)), dtype=bool)
+        held[date_codes[known], symbol_codes[known]] = True
+
+        hole_date_codes, hole_symbol_codes = numpy.nonzero(~held)
+        hole_count = len(hole_date_codes)
+
+        holes = pandas.DataFrame({
+            "date": all_dates.values[hole_date_codes],
+            "symbol": symbols.values[hole_symbol_codes],
+            "quantity": numpy.zeros(hole_count, dtype=dataframe["quantity"].dtype),
+            **{
+                column: numpy.full(hole_count, numpy.nan)
+                for column in _COLUMNS[3:]
+            }
+        }, columns=_COLUMNS)
+
+        dataframe = pandas.concat([dataframe, holes], ignore_index=True)
+        dataframe.sort_values(["symbol", "date"], kind="mergesort", inplace=True)
+
+        symbol = dataframe["symbol"].values
+        price = dataframe["price"].values.astype(numpy.float64)
+        quantity = dataframe["quantity"].values
+
+        price_yesterday = numpy.empty_like(price)
+        price_yesterday[0] = numpy.nan
+        price_yesterday[1:] = price[:-1]
+        price_yesterday[1:][symbol[1:] != symbol[:-1]] = numpy.nan
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            profit = (price - price_yesterday) / price_yesterday
+
+        dataframe["profit"] = numpy.where(quantity < 0, profit * -1, profit)
+
+        return dataframe
+
+    @abc.abstractmethod
+    def finalize(self) -> None:
+        if self.streaming:
+            if self._stream is not None:
+                self._stream.close()
+
+            return
+
+        self.dataframe = self._to_dataframe()
+
+        if not len(self.dataframe):
+            print(
+                "[warning] cannot create dump: dataframe is empty",
+                file=sys.stderr
+            )
+
+            return
 
-        self.dataframe = self.dataframe.groupby("symbol").apply(compute_profit)
+        self.dataframe = self._compute_profit(self.dataframe)
         self.dataframe.set_index("date", inplace=True)
 
         if self.output_file is not None:
@@ -1,5 +1,6 @@
 import dataclasses
 import datetime
+import functools
 import typing
 
 
@@ -29,3 +30,85 @@ class Snapshot:
     @property
     def real_date(self) -> datetime.date:
         return self.postponned if self.postponned else self.date
+
+
+class LazySnapshot(Snapshot):
+    """
+    A snapshot whose account and order result related fields are only computed when first accessed.
+    Must not be read after the dispatch, since the account will have changed.
+    """
+
+    def __init__(
+        self,
+        date: datetime.date,
+        postponned: typing.Optional[datetime.date],
+        account: "Account",
+        result: typing.Optional["OrderResultCollection"],
+    ):
+        self.date = date
+        self.postponned = postponned
+        self.ordered = result is not None
+
+        self._account = account
+        self._result = result
+
+        if result is not None:
+            self.closed_count = result.closed_count
+            self.closed_total = result.closed_total
+
+    @functools.cached_property
+    def cash(self) -> float:
+        return float(self._account.cash)
+
+    @functools.cached_property
+    def equity(self) -> float:
+        return float(self._account.equity)
+
+    @functools.cached_property
+    def holdings(self) -> typing.List["Holding"]:
+        return self._account.holdings
+
+    @property
+    def holding_count(self) -> int:
+        return len(self._account.holdings_view)
+
+    @functools.cached_property
+    def total_fees(self) -> float:
+        return self._result.total_fees if self.ordered else 0.0
+
+    @functools.cached_property
+    def success_count(self) -> int:
+        return self._result.success_count if self.ordered else 0
+
+    @functools.cached_property
+    def failed_count(self) -> int:
+        return self._result.failed_count if self.ordered else 0
+
+
+@dataclasses.dataclass()
+class DeltaSnapshot:
+
+    date: datetime.date
+    postponned: typing.Optional[datetime.date]
+    cash: float
+    equity: float
+    ordered: bool
+
+    # Holdings that are new or whose quantity or price changed since the previous snapshot
+    changed: typing.List["Holding"]
+    # Symbols that are no longer held since the previous snapshot
+    removed: typing.List[str]
+    holding_count: int
+
+    # Only when ordered
+    total_fees: float = 0.0
+    success_count: int = 0
+    failed_count: int = 0
+
+    # None if `--auto-close` is not specified
+    closed_count: int = None
+    closed_total: int = None
+
+    @property
+    def real_date(self) -> datetime.date:
+        return self.postponned if self.postponned else self.date
@@ -1,22 +1,31 @@
 import abc
 import datetime
+import io
+import math
 import os
 import typing
-import quantstats
-import slugify
-import pandas
 
-from .base import Exporter
+from .base import EVENT_FINALIZE, EVENT_INITIALIZE, Exporter
 from .quants import QuantStatsExporter
 from .dump import DumpExporter
+from .report import PLOTS, SYNCHRONOUS_POOL, MetricsCache, ReportPool, render_figure, render_plot
 from ..template import Template, PdfTemplateRenderer
+from ..template.template import FIGURE_FORMATS, is_figure
 
 
 _EMPTY_DICT = dict()
 
+# Exposure metrics that are not a ratio.
+_EXPOSURE_NOT_PERCENT = [
+    "effective-holdings",
+    "holdings",
+]
+
 
 class PdfExporter(Exporter):
 
+    events = frozenset([EVENT_INITIALIZE, EVENT_FINALIZE])
+
     def __init__(
         self,
         quantstats_exporter: typing.Optional[QuantStatsExporter],
@@ -27,7 +36,14 @@ class PdfExporter(Exporter):
         debug=False,
         variables: typing.Dict[str, str] = _EMPTY_DICT,
         user_scripts: "module" = list(),
+        report_pool: typing.Optional[ReportPool] = None,
+        metrics_cache: typing.Optional[MetricsCache] = None,
+        font_cache_directory: typing.Optional[str] = None,
+        figure_format="png",
     ):
+        if figure_format not in FIGURE_FORMATS:
+            raise ValueError(f"unsupported figure format: {figure_format}")
+
         self.quantstats_exporter = quantstats_exporter
         self.dump_exporter = dump_exporter
         self.output_file = output_file
@@ -35,9 +51,13 @@ class PdfExporter(Exporter):
         self.template = template
         self.variables = variables
         self.user_scripts = user_scripts
+        self.report_pool = report_pool if report_pool is not None else SYNCHRONOUS_POOL
+        self.metrics_cache = metrics_cache if metrics_cache is not None else MetricsCache(self.report_pool)
+        self.figure_format = figure_format
 
         self.renderer = PdfTemplateRenderer(
             debug=debug,
+            font_cache_directory=font_cache_directory,
         )
 
     @abc.abstractmethod
@@ -53,50 +73,52 @@ class PdfExporter(Exporter):
 
     @abc.abstractmethod
     def finalize(self) -> None:
+        self.fill_template()
+
+        with open(self.output_file, "wb") as fd:
+            self.renderer.render(self.template, fd)
+
+    def fill_template(self) -> None:
+        self.template.figure_format = self.figure_format
+
         df_returns = self.quantstats_exporter.returns if self.quantstats_exporter else None
         df_benchmark = self.quantstats_exporter.benchmark if self.quantstats_exporter else None
 
-        df_dump = None
+        df_dump, exposures = None, None
         if self.dump_exporter and self.dump_exporter.dataframe is not None:
             df_dump = self.dump_exporter.dataframe.reset_index().sort_values(by='date')
+            exposures = self.dump_exporter.compute_exposures()
 
         if df_benchmark is not None:
             df_benchmark.name = "RUSSELL (1000)"
 
+        figsize = (8, 5)
+
         df_metrics, df_drowdowns = None, None
         if df_returns is not None:
             df_returns.name = "Strategy"
-            df_metrics = quantstats.reports.metrics(df_returns, benchmark=df_benchmark, display=False, mode="full", as_pct=True)
-            df_metrics.index = df_metrics.index.map(slugify.slugify)
-            df_metrics.columns = df_metrics.columns.map(slugify.slugify)
-
-            df_drowdowns = quantstats.stats.to_drawdown_series(df_returns)
-            if not df_drowdowns.empty:
-                details = quantstats.stats.drawdown_details(df_drowdowns)
-                df_drowdowns = details.sort_values(
-                    by=details.columns[4],
-                    ascending=True
-                )[:5]
-
-            if df_drowdowns.empty:
-                df_drowdowns = None
-            else:
-                df_drowdowns["start"] = pandas.to_datetime(df_drowdowns["start"])
-                df_drowdowns["end"] = pandas.to_datetime(df_drowdowns["end"])
+
+            # Every artefact is submitted first, so that they are all computed at the same time.
+            metrics_future = self.metrics_cache.metrics(df_returns, df_benchmark)
+            drawdowns_future = self.metrics_cache.worst_drawdowns(df_returns)
+
+            plot_futures = {
+                f"$qs.{name}": self.report_pool.submit(render_plot, name, df_returns, df_benchmark, figsize, self.figure_format)
+                for name in PLOTS.keys()
+                if f"$qs.{name}" in self.template.slots
+            }
+
+            df_metrics = metrics_future.result()
+            df_drowdowns = drawdowns_future.result()
 
         self.template.apply({
             "$date": datetime.date.today().isoformat(),
         })
 
-        figsize = (8, 5)
-
         if df_returns is not None:
             self.template.apply({
-                "$qs.montly-returns": lambda _: quantstats.plots.monthly_returns(df_returns, show=False, cbar=False, figsize=(figsize[0], figsize[0]*.5)),
-                "$qs.cumulative-returns": lambda _: quantstats.plots.returns(df_returns, df_benchmark, show=False, subtitle=False),
-                "$qs.cumulative-returns-volatility": lambda _: quantstats.plots.returns(df_returns, df_benchmark, match_volatility=df_benchmark is not None, show=False),
-                "$qs.eoy-returns": lambda _: quantstats.plots.yearly_returns(df_returns, df_benchmark, show=False),
-                "$qs.underwater-plot": lambda _: quantstats.plots.drawdown(df_returns, show=False),
+                key: lambda _, future=future: io.BytesIO(future.result())
+                for key, future in plot_futures.items()
             })
 
             # TODO Use name% format instead
@@ -160,6 +182,27 @@ class PdfExporter(Exporter):
             r"\$qs\.worst-drawdowns\.(\d+).(dates|value)": lambda _, n, key: get_drawdown(int(n), key),
         })
 
+        def get_exposure(name: str):
+            if exposures is None:
+                return "-"
+
+            if name not in exposures:
+                print(f"[warning] invalid exposure name: `{name}`: not in: {list(exposures.keys())}")
+                return "-"
+
+            value = exposures[name]
+            if math.isnan(value) or math.isinf(value):
+                return "-"
+
+            if name in _EXPOSURE_NOT_PERCENT:
+                return f"{value:.2f}"
+            else:
+                return f"{value * 100:.2f}%"
+
+        self.template.apply_re({
+            r"\$exposure\.(.+)": lambda _, name: get_exposure(name),
+        })
+
         self.template.apply(self.variables)
 
         for user_script in self.user_scripts:
@@ -168,8 +211,22 @@ class PdfExporter(Exporter):
                 continue
 
             values, values_re = get_template_values(**locals())
-            self.template.apply(values)
-            self.template.apply_re(values_re)
+            self.template.apply(self._submit_figures(values))
+            self.template.apply_re(self._submit_figures(values_re))
 
-        with open(self.output_file, "wb") as fd:
-            self.renderer.render(self.template, fd)
+    def _submit_figures(self, values: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        """
+        Render the figures in the report pool, all at the same time.
+        Figures returned by a callable are still rendered by the template itself.
+        """
+
+        submitted = dict()
+
+        for key, value in values.items():
+            if is_figure(value):
+                future = self.report_pool.submit(render_figure, value, self.figure_format)
+                value = lambda *_, future=future: io.BytesIO(future.result())
+
+            submitted[key] = value
+
+        return submitted
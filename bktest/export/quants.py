@@ -1,33 +1,47 @@
 import abc
 import os
 import sys
+import typing
 import warnings
 
+import numpy
 import pandas
-import quantstats
 import seaborn
 
-from .base import Exporter
+from ..data.benchmark import BenchmarkSource, YahooBenchmarkSource
+from ..utils import GrowableArray
+from .base import EVENT_FINALIZE, EVENT_INITIALIZE, EVENT_SNAPSHOT, Exporter
 from .model import Snapshot
+from .report import SYNCHRONOUS_POOL, MetricsCache, ReportPool, compute_daily_profits, render_html
 
 
 class QuantStatsExporter(Exporter):
 
+    # Only the non-ordered snapshots are used.
+    events = frozenset([EVENT_INITIALIZE, EVENT_SNAPSHOT, EVENT_FINALIZE])
+
     def __init__(
         self,
         html_output_file='report.html',
         csv_output_file='report.csv',
         benchmark_ticker="SPY",
         auto_delete=False,
-        auto_override=False
+        auto_override=False,
+        benchmark_source: typing.Optional[BenchmarkSource] = None,
+        report_pool: typing.Optional[ReportPool] = None,
+        metrics_cache: typing.Optional[MetricsCache] = None,
     ):
         self.html_output_file = html_output_file
         self.csv_output_file = csv_output_file
         self.benchmark_ticker = benchmark_ticker
         self.auto_delete = auto_delete
         self.auto_override = auto_override
+        self.benchmark_source = benchmark_source if benchmark_source is not None else YahooBenchmarkSource()
+        self.report_pool = report_pool if report_pool is not None else SYNCHRONOUS_POOL
+        self.metrics_cache = metrics_cache
 
-        self.rows = []
+        self._dates = GrowableArray("datetime64[D]")
+        self._equities = GrowableArray(numpy.float64)
 
         warnings.filterwarnings(
             action='ignore',
@@ -37,6 +51,9 @@ class QuantStatsExporter(Exporter):
 
     @abc.abstractmethod
     def initialize(self) -> None:
+        if self.benchmark_ticker:
+            self.benchmark_source.prefetch(self.benchmark_ticker)
+
         if self.auto_override:
             return
 
@@ -61,16 +78,22 @@ class QuantStatsExporter(Exporter):
         if snapshot.postponned is not None:
             date = snapshot.postponned
 
-        self.rows.append(
-            (date, snapshot.equity)
-        )
+        self._dates.append(date)
+        self._equities.append(snapshot.equity)
 
     @abc.abstractmethod
     def finalize(self) -> None:
+        dates = pandas.DatetimeIndex(
+            self._dates.values.astype("datetime64[ns]"),
+            name="date"
+        )
+
+        equities = self._equities.values.copy()
+
         self.dataframe = pandas.DataFrame(
-            self.rows,
-            columns=["date", "equity"]
-        ).set_index("date")
+            {"equity": equities},
+            index=dates
+        )
 
         if not len(self.dataframe):
             print(
@@ -80,34 +103,19 @@ class QuantStatsExporter(Exporter):
 
             return
 
-        history_df = self.dataframe.copy()
+        profits, daily_profit_pcts = compute_daily_profits(equities)
 
-        history_df['profit'] = history_df['equity'] - \
-            history_df['equity'].shift(1)
-        history_df['daily_profit_pct'] = history_df["profit"] / \
-            history_df["equity"].shift(1)
-
-        # history_df['profit'].fillna(0, inplace=True)
-        # history_df['daily_profit_pct'].fillna(0, inplace=True)
-
-        history_df.reset_index(inplace=True)
-
-        history_df['date'] = history_df['date'].astype(str)
-        history_df['date'] = pandas.to_datetime(
-            history_df['date'],
-            format="%Y-%m-%d"
-        )
+        history_df = pandas.DataFrame({
+            "date": dates,
+            "equity": equities,
+            "profit": profits,
+            "daily_profit_pct": daily_profit_pcts,
+        })
 
         if self.benchmark_ticker:
-            bench = quantstats.utils.download_returns(self.benchmark_ticker)
+            bench = self.benchmark_source.get_returns(self.benchmark_ticker)
 
-            bench = bench.reset_index()
-            bench = bench.rename(columns={"Date": "date", "Close": "close"})
-
-            bench['date'] = pandas.to_datetime(
-                bench['date'],
-                format="%Y-%m-%d"
-            ).dt.tz_localize(None)
+            bench = bench.rename("close").rename_axis("date").reset_index()
 
             merged = history_df.merge(bench, on='date', how='inner')
 
@@ -131,14 +139,15 @@ class QuantStatsExporter(Exporter):
         self.returns = returns
         self.benchmark = benchmark
 
+        # Started now, so that they are computed alongside the tearsheet for the other exporters.
+        if self.metrics_cache is not None:
+            self.metrics_cache.metrics(returns, benchmark)
+            self.metrics_cache.worst_drawdowns(returns)
+
         if self.html_output_file is not None:
             if self.auto_override or not os.path.exists(self.html_output_file):
-                quantstats.reports.html(
-                    returns,
-                    benchmark=benchmark,
-                    output=self.html_output_file,
-                    active_returns=False
-                )
+                # Not waited for, the pool owner is responsible for it.
+                self.report_pool.submit(render_html, returns, benchmark, self.html_output_file)
             else:
                 print(
                     f"[warning] {self.html_output_file} already exists",
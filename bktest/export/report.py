@@ -0,0 +1,266 @@
+import concurrent.futures
+import hashlib
+import logging
+import multiprocessing
+import typing
+
+import numpy
+import pandas
+import quantstats
+import slugify
+
+from .. import analytics
+from ..template.template import figure_to_bytes, use_agg_backend
+
+if typing.TYPE_CHECKING:
+    import matplotlib.figure
+
+
+class ReportPool:
+    """
+    Produce the report artefacts (tearsheets, metrics, plots) in worker processes.
+
+    With `workers=0`, tasks are run immediately in the calling process and
+    their errors are raised by `submit` directly.
+    Pending tasks are only guaranteed to be done after `shutdown`.
+    """
+
+    def __init__(self, workers: typing.Optional[int] = None):
+        if workers is not None and workers < 0:
+            raise ValueError("workers must not be negative")
+
+        self.workers = workers
+
+        self._executor: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._futures: typing.List[concurrent.futures.Future] = []
+
+    @property
+    def synchronous(self):
+        return self.workers == 0
+
+    def submit(self, function: typing.Callable, *args, **kwargs) -> concurrent.futures.Future:
+        if self.synchronous:
+            future = concurrent.futures.Future()
+            future.set_result(function(*args, **kwargs))
+
+            return future
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                # Forking would be unsafe, other threads may still be running.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+            )
+
+        future = self._executor.submit(function, *args, **kwargs)
+        self._futures.append(future)
+
+        return future
+
+    def wait(self):
+        futures, self._futures = self._futures, []
+
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+SYNCHRONOUS_POOL = ReportPool(workers=0)
+
+
+def _initialize_worker():
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    use_agg_backend()
+
+
+class MetricsCache:
+    """
+    Memoize the statistics computed from a returns series, so that each of
+    them is only computed once per run, even when several exporters need it.
+
+    Entries are keyed on the values of the series, their names are ignored.
+    The results are shared and must not be modified.
+
+    With `native=False`, the metrics and drawdowns are computed by quantstats
+    instead of `bktest.analytics`.
+    """
+
+    def __init__(
+        self,
+        report_pool: typing.Optional[ReportPool] = None,
+        native=True,
+    ):
+        self.report_pool = report_pool if report_pool is not None else SYNCHRONOUS_POOL
+        self.native = native
+
+        self._futures: typing.Dict[typing.Tuple, concurrent.futures.Future] = {}
+
+    def get(self, function: typing.Callable, *args) -> concurrent.futures.Future:
+        key = (
+            function.__module__,
+            function.__qualname__,
+            tuple(_fingerprint(arg) for arg in args),
+        )
+
+        future = self._futures.get(key)
+        if future is None:
+            future = self.report_pool.submit(function, *args)
+            self._futures[key] = future
+
+        return future
+
+    def metrics(
+        self,
+        returns: pandas.Series,
+        benchmark: typing.Optional[pandas.Series],
+    ) -> concurrent.futures.Future:
+        function = analytics.compute_metrics if self.native else compute_metrics
+        return self.get(function, returns, benchmark)
+
+    def worst_drawdowns(
+        self,
+        returns: pandas.Series,
+        count=5,
+    ) -> concurrent.futures.Future:
+        function = compute_native_worst_drawdowns if self.native else compute_worst_drawdowns
+        return self.get(function, returns, count)
+
+
+def _fingerprint(value: typing.Any):
+    if isinstance(value, (pandas.Series, pandas.DataFrame)):
+        hashes = pandas.util.hash_pandas_object(value, index=True).values
+        return (type(value).__name__, len(value), hashlib.sha1(hashes.tobytes()).hexdigest())
+
+    return value
+
+
+def compute_daily_profits(values: numpy.ndarray) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Return the daily profits and the daily profits in percent of the previous value.
+    The first day is NaN.
+    """
+
+    profits = numpy.full(len(values), numpy.nan)
+    profits[1:] = values[1:] - values[:-1]
+
+    profit_pcts = numpy.full(len(values), numpy.nan)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        profit_pcts[1:] = profits[1:] / values[:-1]
+
+    return profits, profit_pcts
+
+
+def render_html(
+    returns: pandas.Series,
+    benchmark: typing.Optional[pandas.Series],
+    output_file: str,
+) -> None:
+    quantstats.reports.html(
+        returns,
+        benchmark=benchmark,
+        output=output_file,
+        active_returns=False
+    )
+
+
+def render_html_download(
+    returns: pandas.Series,
+    download_filename: str,
+) -> None:
+    quantstats.reports.html(returns, output=True, download_filename=download_filename)
+
+
+def compute_metrics(
+    returns: pandas.Series,
+    benchmark: typing.Optional[pandas.Series],
+) -> pandas.DataFrame:
+    metrics = quantstats.reports.metrics(returns, benchmark=benchmark, display=False, mode="full", as_pct=True)
+    metrics.index = metrics.index.map(slugify.slugify)
+    metrics.columns = metrics.columns.map(slugify.slugify)
+
+    return metrics
+
+
+def compute_worst_drawdowns(
+    returns: pandas.Series,
+    count=5,
+) -> typing.Optional[pandas.DataFrame]:
+    drawdowns = quantstats.stats.to_drawdown_series(returns)
+    if not drawdowns.empty:
+        details = quantstats.stats.drawdown_details(drawdowns)
+        drawdowns = details.sort_values(
+            by=details.columns[4],
+            ascending=True
+        )[:count]
+
+    if drawdowns.empty:
+        return None
+
+    drawdowns["start"] = pandas.to_datetime(drawdowns["start"])
+    drawdowns["end"] = pandas.to_datetime(drawdowns["end"])
+
+    return drawdowns
+
+
+def compute_native_worst_drawdowns(
+    returns: pandas.Series,
+    count=5,
+) -> typing.Optional[pandas.DataFrame]:
+    details = analytics.drawdown_details(returns)
+    if details.empty:
+        return None
+
+    drawdowns = details.sort_values(
+        by="max drawdown",
+        ascending=True
+    )[:count]
+
+    drawdowns["start"] = pandas.to_datetime(drawdowns["start"])
+    drawdowns["end"] = pandas.to_datetime(drawdowns["end"])
+
+    return drawdowns
+
+
+PLOTS: typing.Dict[str, typing.Callable] = {
+    "montly-returns": lambda returns, benchmark, figsize: quantstats.plots.monthly_returns(returns, show=False, cbar=False, figsize=(figsize[0], figsize[0]*.5)),
+    "cumulative-returns": lambda returns, benchmark, figsize: quantstats.plots.returns(returns, benchmark, show=False, subtitle=False),
+    "cumulative-returns-volatility": lambda returns, benchmark, figsize: quantstats.plots.returns(returns, benchmark, match_volatility=benchmark is not None, show=False),
+    "eoy-returns": lambda returns, benchmark, figsize: quantstats.plots.yearly_returns(returns, benchmark, show=False),
+    "underwater-plot": lambda returns, benchmark, figsize: quantstats.plots.drawdown(returns, show=False),
+}
+
+
+def render_plot(
+    name: str,
+    returns: pandas.Series,
+    benchmark: typing.Optional[pandas.Series],
+    figsize: typing.Tuple[float, float],
+    format="png",
+) -> bytes:
+    import matplotlib.pyplot
+
+    figure = PLOTS[name](returns, benchmark, figsize)
+
+    try:
+        return figure_to_bytes(figure, format).getvalue()
+    finally:
+        matplotlib.pyplot.close(figure)
+
+
+def render_figure(
+    figure: "matplotlib.figure.Figure",
+    format="png",
+) -> bytes:
+    """
+    Render an already built figure, which is pickled when submitted to a worker.
+    """
+
+    return figure_to_bytes(figure, format).getvalue()
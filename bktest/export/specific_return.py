@@ -1,20 +1,240 @@
 import abc
+import datetime
 import os
 import sys
 import typing
 
+import numpy
 import pandas
-import quantstats
+import pyarrow
+import pyarrow.compute
+import pyarrow.dataset
 
-from .base import Exporter
+from ..data.source.parquet import to_date_scalar
+from .base import EVENT_FINALIZE, EVENT_INITIALIZE, EVENT_ORDERED_SNAPSHOT, EVENT_SNAPSHOT, Exporter
 from .model import Snapshot
+from .report import SYNCHRONOUS_POOL, ReportPool, compute_daily_profits, render_html_download
+
+_CSV_CHUNK_SIZE = 1_000_000
+
 
 def _expect_column(dataframe: pandas.DataFrame, name: str):
     if name not in dataframe.columns:
         raise ValueError(f"column {name} not found")
 
+
+def _is_parquet(path: str):
+    return path.endswith(".parquet") or os.path.isdir(path)
+
+
+def _open_dataset(path: str, columns: typing.List[str]) -> pyarrow.dataset.Dataset:
+    dataset = pyarrow.dataset.dataset(path, format="parquet", partitioning="hive")
+
+    for column in columns:
+        if dataset.schema.get_field_index(column) == -1:
+            raise ValueError(f"column {column} not found")
+
+    return dataset
+
+
+def _read_dataset(
+    dataset: pyarrow.dataset.Dataset,
+    columns: typing.List[str],
+    date_column: str,
+    symbol_column: str,
+    start: typing.Optional[datetime.date],
+    end: typing.Optional[datetime.date],
+    symbols: typing.Optional[typing.Collection[str]],
+) -> pyarrow.Table:
+    date_field = pyarrow.dataset.field(date_column)
+    date_type = dataset.schema.field(date_column).type
+
+    filters = []
+    if start is not None:
+        filters.append(date_field >= to_date_scalar(start, date_type))
+    if end is not None:
+        filters.append(date_field <= to_date_scalar(end, date_type))
+    if symbols is not None:
+        filters.append(pyarrow.dataset.field(symbol_column).isin(list(symbols)))
+
+    filter = None
+    for expression in filters:
+        filter = expression if filter is None else filter & expression
+
+    return dataset.to_table(columns=columns, filter=filter)
+
+
+class SpecificReturnMatrix:
+    """
+    Specific returns pivoted into a (date x symbol) matrix.
+    Missing values are zeros, like symbols without a specific return.
+
+    Rows whose symbol is not in `symbols` are ignored, when it is specified.
+    """
+
+    def __init__(
+        self,
+        dates: typing.List[datetime.date],
+        symbols: typing.List[str],
+        values: numpy.ndarray,
+    ):
+        if values.shape != (len(dates), len(symbols)):
+            raise ValueError(f"values shape {values.shape} does not match {len(dates)} dates and {len(symbols)} symbols")
+
+        self.dates = {date: index for index, date in enumerate(dates)}
+        self.symbols = {symbol: index for index, symbol in enumerate(symbols)}
+        self.values = values
+
+    def row(self, date: datetime.date) -> typing.Optional[numpy.ndarray]:
+        index = self.dates.get(date)
+        if index is None:
+            return None
+
+        return self.values[index]
+
+    def columns(self, symbols: typing.Iterable[str]) -> numpy.ndarray:
+        """
+        Return the column of each symbol, -1 for the unknown ones.
+        """
+
+        return numpy.fromiter(
+            (self.symbols.get(symbol, -1) for symbol in symbols),
+            dtype=numpy.intp
+        )
+
+    @staticmethod
+    def from_dataframe(
+        dataframe: pandas.DataFrame,
+        date_column="date",
+        symbol_column="symbol",
+        value_column="specific_return",
+        symbols: typing.Optional[typing.List[str]] = None,
+    ) -> "SpecificReturnMatrix":
+        dataframe = dataframe.drop_duplicates([date_column, symbol_column], keep="last")
+
+        if symbols is None:
+            symbol_codes, symbols = pandas.factorize(dataframe[symbol_column])
+        else:
+            symbol_codes = pandas.Index(symbols).get_indexer(dataframe[symbol_column])
+
+            known = symbol_codes >= 0
+            dataframe, symbol_codes = dataframe[known], symbol_codes[known]
+
+        date_codes, dates = pandas.factorize(dataframe[date_column], sort=True)
+
+        values = numpy.zeros((len(dates), len(symbols)), dtype=numpy.float64)
+        values[date_codes, symbol_codes] = dataframe[value_column].to_numpy(dtype=numpy.float64)
+
+        return SpecificReturnMatrix(list(dates), list(symbols), values)
+
+    @staticmethod
+    def from_nested_dict(
+        specific_returns: typing.Dict[datetime.date, typing.Dict[str, float]],
+    ) -> "SpecificReturnMatrix":
+        return SpecificReturnMatrix.from_dataframe(pandas.DataFrame(
+            [
+                (date, symbol, value)
+                for date, mapping in specific_returns.items()
+                for symbol, value in mapping.items()
+            ],
+            columns=["date", "symbol", "specific_return"]
+        ))
+
+
+class SpecificReturnDataset:
+    """
+    Read the specific returns of a .parquet file or dataset by chunks of days, as they are needed.
+
+    Only the three columns are read, and the date range and symbols are pushed down
+    to the reader, so that row groups are pruned using their statistics.
+    The symbols are fixed up-front, so the columns stay the same from one chunk to the next.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        date_column="date",
+        symbol_column="symbol",
+        value_column="specific_return",
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+        symbols: typing.Optional[typing.Collection[str]] = None,
+        chunk_days=30,
+    ):
+        if chunk_days <= 0:
+            raise ValueError("chunk_days must be positive")
+
+        self.date_column = date_column
+        self.symbol_column = symbol_column
+        self.value_column = value_column
+        self.start = start
+        self.end = end
+        self.chunk_days = chunk_days
+
+        self.dataset = _open_dataset(path, [date_column, symbol_column, value_column])
+
+        if symbols is None:
+            table = _read_dataset(self.dataset, [symbol_column], date_column, symbol_column, start, end, None)
+            symbols = pyarrow.compute.unique(table[symbol_column]).to_pylist()
+
+        self.symbols = {symbol: index for index, symbol in enumerate(sorted(symbols))}
+
+        self._chunk: typing.Optional[SpecificReturnMatrix] = None
+        self._chunk_start: typing.Optional[datetime.date] = None
+        self._chunk_end: typing.Optional[datetime.date] = None
+
+    def row(self, date: datetime.date) -> typing.Optional[numpy.ndarray]:
+        if (self.start is not None and date < self.start) or (self.end is not None and date > self.end):
+            return None
+
+        if self._chunk is None or not (self._chunk_start <= date <= self._chunk_end):
+            self._load(date)
+
+        return self._chunk.row(date)
+
+    def columns(self, symbols: typing.Iterable[str]) -> numpy.ndarray:
+        """
+        Return the column of each symbol, -1 for the unknown ones.
+        """
+
+        return numpy.fromiter(
+            (self.symbols.get(symbol, -1) for symbol in symbols),
+            dtype=numpy.intp
+        )
+
+    def _load(self, start: datetime.date):
+        end = start + datetime.timedelta(days=self.chunk_days - 1)
+        if self.end is not None:
+            end = min(end, self.end)
+
+        dataframe = _read_dataset(
+            self.dataset,
+            [self.date_column, self.symbol_column, self.value_column],
+            self.date_column,
+            self.symbol_column,
+            start,
+            end,
+            self.symbols.keys(),
+        ).to_pandas()
+
+        dataframe[self.date_column] = pandas.to_datetime(dataframe[self.date_column]).dt.date
+
+        self._chunk = SpecificReturnMatrix.from_dataframe(
+            dataframe,
+            self.date_column,
+            self.symbol_column,
+            self.value_column,
+            symbols=list(self.symbols.keys()),
+        )
+
+        self._chunk_start = start
+        self._chunk_end = end
+
+
 class SpecificReturnExporter(Exporter):
 
+    events = frozenset([EVENT_INITIALIZE, EVENT_SNAPSHOT, EVENT_ORDERED_SNAPSHOT, EVENT_FINALIZE])
+
     def __init__(
         self,
         path_or_dataframe_or_dict: typing.Union[str, pandas.DataFrame, dict],
@@ -24,7 +244,12 @@ class SpecificReturnExporter(Exporter):
         html_output_file='sr-report.html',
         csv_output_file='sr-report.csv',
         auto_delete=False,
-        auto_override=False
+        auto_override=False,
+        report_pool: typing.Optional[ReportPool] = None,
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+        symbols: typing.Optional[typing.Collection[str]] = None,
+        chunk_days: typing.Optional[int] = None,
     ):
         super().__init__()
         
@@ -35,15 +260,25 @@ class SpecificReturnExporter(Exporter):
         self.csv_output_file = csv_output_file
         self.auto_delete = auto_delete
         self.auto_override = auto_override
+        self.report_pool = report_pool if report_pool is not None else SYNCHRONOUS_POOL
 
         if isinstance(path_or_dataframe_or_dict, dict):
-            self.specific_returns = path_or_dataframe_or_dict
+            self.specific_returns = SpecificReturnMatrix.from_nested_dict(path_or_dataframe_or_dict)
+        elif chunk_days:
+            if not isinstance(path_or_dataframe_or_dict, str) or not _is_parquet(path_or_dataframe_or_dict):
+                raise ValueError("only .parquet files can be read by chunks of days")
+
+            self.specific_returns = SpecificReturnDataset(path_or_dataframe_or_dict, date_column, symbol_column, value_column, start, end, symbols, chunk_days)
         else:
-            self.specific_returns = SpecificReturnExporter.load_as_nested_dict(path_or_dataframe_or_dict, date_column, symbol_column, value_column)
+            self.specific_returns = SpecificReturnExporter.load_as_matrix(path_or_dataframe_or_dict, date_column, symbol_column, value_column, start, end, symbols)
        
         self.value = None
-        self.previous_market_prices = {}
+        self.previous_market_prices = numpy.empty(0)
+        self.previous_columns = numpy.empty(0, dtype=numpy.intp)
         self.history = []
+
+        self._symbols: typing.Tuple[str, ...] = ()
+        self._columns = numpy.empty(0, dtype=numpy.intp)
         
     @abc.abstractmethod
     def initialize(self) -> None:
@@ -65,21 +300,20 @@ class SpecificReturnExporter(Exporter):
     def on_snapshot(self, snapshot: Snapshot) -> None:
         date = snapshot.real_date
 
-        market_prices = {
-            holding.symbol: holding.market_price
-            for holding in snapshot.holdings
-        }
+        market_prices = numpy.fromiter(
+            (holding.market_price for holding in snapshot.holdings),
+            dtype=numpy.float64,
+            count=len(snapshot.holdings)
+        )
         
         if self.value is None:
-            self.value = snapshot.cash + sum(market_prices.values())
+            self.value = snapshot.cash + market_prices.sum()
         else:
-            mapping = self.specific_returns.get(date, {})
+            row = self.specific_returns.row(date)
 
-            if len(mapping):
-                self.value += sum([
-                    market_price * mapping.get(symbol, 0) / 100
-                    for symbol, market_price in self.previous_market_prices.items()
-                ])
+            if row is not None:
+                known = self.previous_columns >= 0
+                self.value += numpy.dot(self.previous_market_prices[known], row[self.previous_columns[known]]) / 100
             else:
                 print(f"[warning] no specific return for date={date}")
         
@@ -87,26 +321,35 @@ class SpecificReturnExporter(Exporter):
         
         self.history.append([date, self.value])
         self.previous_market_prices = market_prices
+        self.previous_columns = self._find_columns(snapshot)
+
+    def _find_columns(self, snapshot: Snapshot) -> numpy.ndarray:
+        symbols = tuple(holding.symbol for holding in snapshot.holdings)
+
+        # The holdings rarely change from one day to the next.
+        if symbols != self._symbols:
+            self._symbols = symbols
+            self._columns = self.specific_returns.columns(symbols)
+
+        return self._columns
 
     @abc.abstractmethod
     def finalize(self) -> None:
-        dataframe = pandas.DataFrame(self.history, columns=["date", "value"])
-        dataframe.set_index("date", inplace=True)
-
-        if not len(dataframe):
+        if not len(self.history):
             print("[warning] cannot create specific return tearsheet: dataframe is empty", file=sys.stderr)
             return
 
-        dataframe['profit'] = dataframe['value'] - dataframe['value'].shift(1)
-        dataframe['daily_profit_pct'] = dataframe["profit"] / dataframe["value"].shift(1)
+        dates = pandas.DatetimeIndex(
+            numpy.array([date for date, _ in self.history], dtype="datetime64[D]").astype("datetime64[ns]"),
+            name="date"
+        )
 
-        dataframe.reset_index(inplace=True)
+        values = numpy.array([value for _, value in self.history], dtype=numpy.float64)
+        _, daily_profit_pcts = compute_daily_profits(values)
+
+        returns = pandas.Series(daily_profit_pcts, index=dates, name="daily_profit_pct")
+        self.returns = returns
 
-        dataframe['date'] = dataframe['date'].astype(str)
-        dataframe['date'] = pandas.to_datetime(dataframe['date'], format="%Y-%m-%d")
-        
-        returns = dataframe.set_index("date").daily_profit_pct
-        
         if self.csv_output_file is not None:
             if self.auto_override or not os.path.exists(self.csv_output_file):
                 returns.to_csv(self.csv_output_file)
@@ -115,26 +358,27 @@ class SpecificReturnExporter(Exporter):
 
         if self.html_output_file is not None:
             if self.auto_override or not os.path.exists(self.html_output_file):
-                quantstats.reports.html(returns, output=True, download_filename=self.html_output_file)
+                # Not waited for, the pool owner is responsible for it.
+                self.report_pool.submit(render_html_download, returns, self.html_output_file)
             else:
                 print(f"[warning] {self.html_output_file} already exists", file=sys.stderr)
 
     @staticmethod
-    def load_as_nested_dict(
+    def load_as_matrix(
         path_or_dataframe: typing.Union[str, pandas.DataFrame],
         date_column="date",
         symbol_column="symbol",
         value_column="specific_return",
-    ) -> pandas.DataFrame:
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+        symbols: typing.Optional[typing.Collection[str]] = None,
+    ) -> SpecificReturnMatrix:
         if isinstance(path_or_dataframe, pandas.DataFrame):
             dataframe = path_or_dataframe
         else:
-            dataframe = SpecificReturnExporter.load(path_or_dataframe, date_column, symbol_column, value_column)
+            dataframe = SpecificReturnExporter.load(path_or_dataframe, date_column, symbol_column, value_column, start, end, symbols)
 
-        return dataframe \
-            .groupby(date_column) \
-            .apply(lambda x: x.set_index(symbol_column)[value_column].to_dict()) \
-            .to_dict()
+        return SpecificReturnMatrix.from_dataframe(dataframe, date_column, symbol_column, value_column)
 
     @staticmethod
     def load(
@@ -142,13 +386,56 @@ class SpecificReturnExporter(Exporter):
         date_column="date",
         symbol_column="symbol",
         value_column="specific_return",
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+        symbols: typing.Optional[typing.Collection[str]] = None,
     ) -> pandas.DataFrame:
-        dataframe = pandas.read_parquet(path) if path.endswith(".parquet") else pandas.read_csv(path)
-        
-        _expect_column(dataframe, date_column)
-        _expect_column(dataframe, symbol_column)
-        _expect_column(dataframe, value_column)
+        """
+        Only the rows between `start` and `end` (inclusive) and of the `symbols` are loaded.
+        """
 
+        columns = [date_column, symbol_column, value_column]
+
+        if _is_parquet(path):
+            dataset = _open_dataset(path, columns)
+
+            dataframe = _read_dataset(dataset, columns, date_column, symbol_column, start, end, symbols).to_pandas()
+            dataframe[date_column] = pandas.to_datetime(dataframe[date_column]).dt.date
+
+            return dataframe
+
+        header = pandas.read_csv(path, nrows=0)
+        for column in columns:
+            _expect_column(header, column)
+
+        # The dates and symbols cannot be pushed down, but the rows are dropped while reading.
+        chunks = [
+            SpecificReturnExporter._filter(chunk, date_column, symbol_column, start, end, symbols)
+            for chunk in pandas.read_csv(path, usecols=columns, chunksize=_CSV_CHUNK_SIZE)
+        ]
+
+        if not len(chunks):
+            return header[columns]
+
+        return pandas.concat(chunks, ignore_index=True)
+
+    @staticmethod
+    def _filter(
+        dataframe: pandas.DataFrame,
+        date_column: str,
+        symbol_column: str,
+        start: typing.Optional[datetime.date],
+        end: typing.Optional[datetime.date],
+        symbols: typing.Optional[typing.Collection[str]],
+    ) -> pandas.DataFrame:
         dataframe[date_column] = pandas.to_datetime(dataframe[date_column]).dt.date
 
-        return dataframe
+        mask = numpy.ones(len(dataframe), dtype=bool)
+        if start is not None:
+            mask &= (dataframe[date_column] >= start).to_numpy()
+        if end is not None:
+            mask &= (dataframe[date_column] <= end).to_numpy()
+        if symbols is not None:
+            mask &= dataframe[symbol_column].isin(symbols).to_numpy()
+
+        return dataframe[mask] if not mask.all() else dataframe
@@ -0,0 +1,234 @@
+import abc
+import datetime
+import json
+import math
+import os
+import sys
+import typing
+
+from .base import EVENT_FINALIZE, EVENT_INITIALIZE, EVENT_ORDERED_SNAPSHOT, EVENT_SNAPSHOT, Exporter
+from .model import DeltaSnapshot
+
+TRADING_DAYS = 252
+
+
+class RunningStatistics:
+    """
+    Statistics of the daily returns and holdings, updated in O(1) per day.
+    The mean and variance of the returns are maintained with Welford's algorithm.
+    """
+
+    def __init__(self):
+        self.days = 0
+        self.equity = math.nan
+        self.peak_equity = math.nan
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+        self.wins = 0
+        self.losses = 0
+
+        self.traded_value = 0.0
+        self._turnover_sum = 0.0
+
+    def update(self, equity: float, traded_value: float) -> None:
+        if self.days and self.equity != 0:
+            self._add_return(equity / self.equity - 1)
+
+        self.days += 1
+        self.equity = equity
+
+        if not equity <= self.peak_equity:
+            self.peak_equity = equity
+
+        self.drawdown = equity / self.peak_equity - 1 if self.peak_equity else 0.0
+        self.max_drawdown = min(self.max_drawdown, self.drawdown)
+
+        self.add_traded_value(traded_value)
+
+    def add_traded_value(self, traded_value: float) -> None:
+        """
+        Add to the traded value of the current day, without starting a new one.
+        """
+
+        self.traded_value += traded_value
+        if self.equity:
+            self._turnover_sum += traded_value / abs(self.equity)
+
+    def _add_return(self, value: float) -> None:
+        self.count += 1
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if value > 0:
+            self.wins += 1
+        elif value < 0:
+            self.losses += 1
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return math.nan
+
+        return self._m2 / (self.count - 1)
+
+    @property
+    def volatility(self) -> float:
+        """
+        Annualized standard deviation of the daily returns.
+        """
+
+        return math.sqrt(self.variance * TRADING_DAYS)
+
+    @property
+    def sharpe(self) -> float:
+        """
+        Annualized sharpe ratio, without any risk-free rate.
+        """
+
+        variance = self.variance
+        if not variance > 0:
+            return math.nan
+
+        return self.mean / math.sqrt(variance) * math.sqrt(TRADING_DAYS)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Ratio of the days with a positive return, the days without any return being ignored.
+        """
+
+        total = self.wins + self.losses
+        if not total:
+            return math.nan
+
+        return self.wins / total
+
+    @property
+    def turnover(self) -> float:
+        """
+        Average daily traded value, relative to the equity.
+        """
+
+        if not self.days:
+            return math.nan
+
+        return self._turnover_sum / self.days
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "days": self.days,
+            "equity": self.equity,
+            "peakEquity": self.peak_equity,
+            "drawdown": self.drawdown,
+            "maxDrawdown": self.max_drawdown,
+            "meanReturn": self.mean if self.count else math.nan,
+            "volatility": self.volatility,
+            "sharpe": self.sharpe,
+            "hitRate": self.hit_rate,
+            "tradedValue": self.traded_value,
+            "turnover": self.turnover,
+        }
+
+
+class StatisticsExporter(Exporter):
+    """
+    Maintain running statistics of the backtest, without storing its history.
+
+    Like the quantstats exporter, a day is only counted on the price update snapshots.
+    The value traded by the ordered snapshots is attributed to their day.
+
+    They can be read through `statistics` at any time, for example by the console exporter.
+    The final values are written as JSON to `output_file`, if any.
+    """
+
+    events = frozenset([EVENT_INITIALIZE, EVENT_SNAPSHOT, EVENT_ORDERED_SNAPSHOT, EVENT_FINALIZE])
+    delta_snapshot = True
+
+    def __init__(
+        self,
+        output_file: typing.Optional[str] = 'statistics.json',
+        auto_delete=False,
+        auto_override=False,
+    ):
+        self.output_file = output_file
+        self.auto_delete = auto_delete
+        self.auto_override = auto_override
+
+        self.statistics = RunningStatistics()
+
+        self._positions: typing.Dict[str, typing.Tuple[float, float]] = {}
+
+        self._date: typing.Optional[datetime.date] = None
+        self._pending_traded_value = 0.0
+
+    @abc.abstractmethod
+    def initialize(self) -> None:
+        if self.auto_override:
+            return
+
+        for file in [self.output_file]:
+            if file is None or not os.path.exists(file):
+                continue
+
+            can_delete = self.auto_delete
+            if not can_delete:
+                can_delete = input(f"{file}: delete file? [y/N]").lower() == 'y'
+
+            if can_delete:
+                os.remove(file)
+
+    def on_delta_snapshot(self, snapshot: DeltaSnapshot) -> None:
+        positions = self._positions
+
+        traded_value = 0.0
+        for holding in snapshot.changed:
+            quantity, _ = positions.get(holding.symbol, (0.0, 0.0))
+            traded_value += abs(holding.quantity - quantity) * holding.price
+
+            positions[holding.symbol] = (holding.quantity, holding.price)
+
+        for symbol in snapshot.removed:
+            quantity, price = positions.pop(symbol)
+            traded_value += abs(quantity) * price
+
+        date = snapshot.date
+
+        if not snapshot.ordered:
+            self.statistics.update(snapshot.equity, self._pending_traded_value + traded_value)
+
+            self._date = date
+            self._pending_traded_value = 0.0
+        elif date == self._date:
+            self.statistics.add_traded_value(traded_value)
+        else:
+            # Postponned orders are snapshotted before the price update of their day.
+            self._pending_traded_value += traded_value
+
+    @abc.abstractmethod
+    def finalize(self) -> None:
+        if self.output_file is None:
+            return
+
+        if self.auto_override or not os.path.exists(self.output_file):
+            with open(self.output_file, "w") as fd:
+                json.dump(to_json_values(self.statistics.to_dict()), fd, indent=4)
+        else:
+            print(f"[warning] {self.output_file} already exists", file=sys.stderr)
+
+
+def to_json_values(object: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """
+    Replace the non-finite numbers, which are not valid JSON, with None.
+    """
+
+    return {
+        key: None if isinstance(value, float) and not math.isfinite(value) else value
+        for key, value in object.items()
+    }
@@ -76,6 +76,14 @@ class OrderProvider(metaclass=abc.ABCMeta):
     ) -> typing.List[Order]:
         pass
 
+    def get_symbols(self) -> typing.Optional[typing.Set[str]]:
+        """
+        Return every symbol that will be ordered, or `None` if unknown.
+        Used to prefetch the prices before the simulation.
+        """
+
+        return None
+
 
 class ParallelOrderProvider(metaclass=abc.ABCMeta):
 
@@ -91,6 +99,14 @@ class ParallelOrderProvider(metaclass=abc.ABCMeta):
     ) -> typing.List[typing.List[Order]]:
         pass
 
+    def get_symbols(self) -> typing.Optional[typing.Set[str]]:
+        """
+        Return every symbol that will be ordered, or `None` if unknown.
+        Used to prefetch the prices before the simulation.
+        """
+
+        return None
+
 
 class DataFrameOrderProvider(OrderProvider):
 
@@ -134,6 +150,9 @@ class DataFrameOrderProvider(OrderProvider):
             for item in pandas.to_datetime(dates)
         ]
 
+    def get_symbols(self):
+        return set(self.dataframe[self.symbol_column].unique())
+
     def get_orders(self, date, account):
         orders = self.dataframe[
             self.dataframe[self.date_column] == numpy.datetime64(date)
@@ -2,6 +2,7 @@ import datetime
 import json
 import os
 import sys
+import threading
 import typing
 import warnings
 
@@ -82,7 +83,155 @@ class PriceProvider:
 
         self.updated = False
 
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._prefetch_thread: typing.Optional[threading.Thread] = None
+
+        # Only used by chunked prefetches
+        self._pending_symbols: typing.Set[str] = set()
+        self._ready_until: typing.Optional[datetime.date] = None
+        self._chunked_symbols: typing.List[str] = []
+        self._failed_windows: typing.List[typing.Tuple[datetime.date, datetime.date]] = []
+
+    def prefetch(self, symbols: typing.Set[str], background=False, chunk_days: typing.Optional[int] = None):
+        """
+        Download every symbol at once before they are needed.
+        If it fails in the background, the missing symbols will simply be downloaded when needed.
+
+        With `chunk_days`, the date range is downloaded chunk by chunk, earliest first,
+        and `get` only blocks until the chunk containing the requested date is ready.
+        The chunks that failed are downloaded again when needed, and nothing is saved until they are.
+        """
+
+        if not background:
+            return self.download_missing(symbols)
+
+        if chunk_days:
+            target = self._prepare_chunked_prefetch(symbols, chunk_days)
+        else:
+            def target():
+                try:
+                    self.download_missing(symbols)
+                except Exception as error:
+                    print(f"[warning] could not prefetch prices: {error}", file=sys.stderr)
+
+        self._prefetch_thread = threading.Thread(
+            target=target,
+            name="price-prefetch",
+            daemon=True
+        )
+
+        self._prefetch_thread.start()
+
+    def _prepare_chunked_prefetch(self, symbols: typing.Set[str], chunk_days: int):
+        with self._lock:
+            missing_symbols = list(set(symbols).difference(self.symbols))
+
+            if not len(missing_symbols):
+                return lambda: None
+
+            with warnings.catch_warnings():
+                warnings.simplefilter(action='ignore', category=pandas.errors.PerformanceWarning)
+
+                self.storage = pandas.concat([
+                    self.storage,
+                    pandas.DataFrame(numpy.nan, index=self.storage.index, columns=missing_symbols)
+                ], axis=1)
+
+            self.symbols.update(missing_symbols)
+            self._pending_symbols = set(missing_symbols)
+            self._ready_until = self.start - datetime.timedelta(days=1)
+            self._chunked_symbols = missing_symbols
+            self._failed_windows = []
+
+        def target():
+            one_day = datetime.timedelta(days=1)
+            chunk_size = datetime.timedelta(days=chunk_days)
+
+            chunk_start = self.start
+            try:
+                while chunk_start <= self.end:
+                    chunk_end = min(chunk_start + chunk_size - one_day, self.end)
+
+                    try:
+                        prices = self._fetch_chunk(chunk_start, chunk_end)
+
+                        with self._ready:
+                            self._store_chunk(prices, chunk_start, chunk_end)
+                    except Exception as error:
+                        print(f"[warning] could not prefetch prices from {chunk_start} to {chunk_end}: {error}", file=sys.stderr)
+
+                        with self._ready:
+                            self._failed_windows.append((chunk_start, chunk_end))
+
+                    with self._ready:
+                        self._ready_until = chunk_end
+                        self._ready.notify_all()
+
+                    chunk_start = chunk_end + one_day
+
+                with self._ready:
+                    if not self._failed_windows:
+                        for symbol in missing_symbols:
+                            if self.storage[symbol].isna().values.all():
+                                print(f"[warning] {symbol} does not have a price", file=sys.stderr)
+
+                    self.updated = True
+            finally:
+                with self._ready:
+                    # Never let a reader wait for chunks that will not come.
+                    if chunk_start <= self.end:
+                        self._failed_windows.append((chunk_start, self.end))
+
+                    self._pending_symbols = set()
+                    self._ready.notify_all()
+
+        return target
+
+    def _fetch_chunk(self, chunk_start: datetime.date, chunk_end: datetime.date) -> pandas.DataFrame:
+        one_day = datetime.timedelta(days=1)
+
+        return self.data_source.fetch_prices(
+            symbols=self.mapper.maps(self._chunked_symbols),
+            start=chunk_start - one_day,
+            end=chunk_end + one_day
+        )
+
+    def _store_chunk(self, prices: pandas.DataFrame, chunk_start: datetime.date, chunk_end: datetime.date):
+        prices = self._normalize_prices(prices, self._chunked_symbols)
+        prices.columns = self.mapper.unmaps(prices.columns)
+
+        rows = self.storage.index[
+            (self.storage.index >= numpy.datetime64(chunk_start)) &
+            (self.storage.index <= numpy.datetime64(chunk_end))
+        ]
+
+        chunk = prices.reindex(index=rows, columns=self._chunked_symbols)
+        self.storage.loc[rows, self._chunked_symbols] = chunk.values
+
+    def _download_failed_windows(self, start: datetime.date, end: datetime.date):
+        """
+        Synchronously download again the failed chunks overlapping the dates, the lock must be held.
+        """
+
+        for window in list(self._failed_windows):
+            chunk_start, chunk_end = window
+            if chunk_end < start or chunk_start > end:
+                continue
+
+            self._store_chunk(self._fetch_chunk(chunk_start, chunk_end), chunk_start, chunk_end)
+            self._failed_windows.remove(window)
+
+    def wait(self):
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
     def download_missing(self, symbols: typing.Set[str]):
+        with self._lock:
+            self._download_missing(symbols)
+
+    def _download_missing(self, symbols: typing.Set[str]):
         if not isinstance(symbols, set):
             symbols = set(symbols)
 
@@ -98,31 +247,7 @@ class PriceProvider:
                 end=self.end + one_day
             )
 
-            if prices is None:
-                prices = pandas.DataFrame(
-                    index=pandas.Index([], name=constants.DEFAULT_DATE_COLUMN),
-                    columns=list(missing_symbols)
-                )
-
-            if symbol_count == 1:
-                first = next(iter(missing_symbols))
-
-                if isinstance(prices, pandas.Series):
-                    if len(prices):
-                        prices = pandas.DataFrame({
-                            first: prices.values
-                        }, index=pandas.Index(
-                            prices.index,
-                            name=constants.DEFAULT_DATE_COLUMN
-                        ))
-                    else:
-                        prices = pandas.DataFrame({
-                            first: numpy.nan
-                        }, index=pandas.Index(
-                            self.storage.index,
-                            name=constants.DEFAULT_DATE_COLUMN
-                        ))
-
+            prices = self._normalize_prices(prices, missing_symbols)
             prices.columns = self.mapper.unmaps(prices.columns)
             for column in prices.columns:
                 if prices[column].isna().values.all():
@@ -144,22 +269,77 @@ class PriceProvider:
             self.symbols.update(missing_symbols)
             self.updated = True
 
+    def _normalize_prices(self, prices: typing.Optional[typing.Union[pandas.DataFrame, pandas.Series]], symbols: typing.Collection[str]) -> pandas.DataFrame:
+        if prices is None:
+            return pandas.DataFrame(
+                index=pandas.Index([], name=constants.DEFAULT_DATE_COLUMN),
+                columns=list(symbols)
+            )
+
+        if len(symbols) == 1 and isinstance(prices, pandas.Series):
+            first = next(iter(symbols))
+
+            if len(prices):
+                return pandas.DataFrame({
+                    first: prices.values
+                }, index=pandas.Index(
+                    prices.index,
+                    name=constants.DEFAULT_DATE_COLUMN
+                ))
+            else:
+                return pandas.DataFrame({
+                    first: numpy.nan
+                }, index=pandas.Index(
+                    self.storage.index,
+                    name=constants.DEFAULT_DATE_COLUMN
+                ))
+
+        return prices
+
     def get(self, date: datetime.date, symbol: str):
         if symbol not in self.symbols:
             raise ValueError(f"{symbol} not available")
 
-        symbol = self.mapper.map(symbol)
+        with self._ready:
+            self._wait_ready(symbol, date, date)
+
+            value = self.storage[self.mapper.map(symbol)][numpy.datetime64(date)]
 
-        value = self.storage[symbol][numpy.datetime64(date)]
         if not value or numpy.isnan(value):
             value = None
 
         return value
 
+    def get_prices(self, symbol: str) -> pandas.Series:
+        if symbol not in self.symbols:
+            raise ValueError(f"{symbol} not available")
+
+        with self._ready:
+            self._wait_ready(symbol, self.start, self.end)
+
+            return self.storage[symbol]
+
+    def _wait_ready(self, symbol: str, start: datetime.date, end: datetime.date):
+        """
+        Wait for the chunks of the prefetch covering the dates, the lock must be held.
+        """
+
+        if symbol in self._pending_symbols:
+            self._ready.wait_for(lambda: not self._pending_symbols or self._ready_until >= end)
+
+        if self._failed_windows and symbol in self._chunked_symbols:
+            self._download_failed_windows(start, end)
+
     def save(self):
+        self.wait()
+
         if not self.caching or not self.updated:
             return
 
+        if self._failed_windows:
+            print("[warning] prices not saved, some could not be downloaded", file=sys.stderr)
+            return
+
         path = PriceProvider._get_cache_path(self.start, self.end)
 
         os.makedirs(os.path.dirname(path), exist_ok=True)
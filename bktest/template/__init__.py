@@ -1,3 +1,4 @@
 from .template import Template, TemplateLoader, TemplateRenderer
 from .sketch import SketchTemplateLoader
 from .pdf import PdfTemplateRenderer
+from .batch import BatchRenderer, RenderJob
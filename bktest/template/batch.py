@@ -0,0 +1,103 @@
+import concurrent.futures
+import dataclasses
+import logging
+import multiprocessing
+import typing
+
+from .pdf import PdfTemplateRenderer
+from .template import Template, use_agg_backend
+
+
+@dataclasses.dataclass
+class RenderJob:
+
+    output_file: str
+    variables: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+
+    # Called with the template copy before the variables are applied, must be picklable.
+    prepare: typing.Optional[typing.Callable[[Template], None]] = None
+
+
+class BatchRenderer:
+    """
+    Render a template with many variable sets, the template being loaded and parsed only once.
+
+    Every job is applied to its own copy of the template.
+    With `workers=0`, jobs are rendered in the calling process, otherwise the template
+    is sent once to every worker process, and not with every job.
+    """
+
+    def __init__(
+        self,
+        template: Template,
+        workers: typing.Optional[int] = None,
+        debug=False,
+        font_cache_directory: typing.Optional[str] = None,
+    ):
+        if workers is not None and workers < 0:
+            raise ValueError("workers must not be negative")
+
+        self.template = template
+        self.workers = workers
+        self.debug = debug
+        self.font_cache_directory = font_cache_directory
+
+    def render(self, jobs: typing.Iterable[RenderJob]) -> typing.List[str]:
+        jobs = list(jobs)
+
+        if self.workers == 0:
+            renderer = PdfTemplateRenderer(debug=self.debug, font_cache_directory=self.font_cache_directory)
+
+            return [
+                _render(self.template, renderer, job)
+                for job in jobs
+            ]
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            # Forking would be unsafe, other threads may still be running.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.template, self.debug, self.font_cache_directory),
+        ) as executor:
+            futures = [
+                executor.submit(_render_in_worker, job)
+                for job in jobs
+            ]
+
+            return [
+                future.result()
+                for future in futures
+            ]
+
+
+_worker_template: typing.Optional[Template] = None
+_worker_renderer: typing.Optional[PdfTemplateRenderer] = None
+
+
+def _initialize_worker(template: Template, debug: bool, font_cache_directory: typing.Optional[str]):
+    global _worker_template, _worker_renderer
+
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    use_agg_backend()
+
+    _worker_template = template
+    _worker_renderer = PdfTemplateRenderer(debug=debug, font_cache_directory=font_cache_directory)
+
+
+def _render_in_worker(job: RenderJob):
+    return _render(_worker_template, _worker_renderer, job)
+
+
+def _render(template: Template, renderer: PdfTemplateRenderer, job: RenderJob):
+    template = template.copy()
+
+    if job.prepare is not None:
+        job.prepare(template)
+
+    template.apply(job.variables)
+
+    with open(job.output_file, "wb") as fd:
+        renderer.render(template, fd)
+
+    return job.output_file
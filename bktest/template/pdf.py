@@ -1,12 +1,21 @@
+import hashlib
 import io
 import os
+import pickle
 import typing
-import itertools
 
 import fpdf
 
 from .models import *
 from .template import *
+from ..utils import LruCache, write_atomically
+
+# Bumped when FontMetrics changes, to invalidate the metrics pickled on disk.
+_FONT_CACHE_VERSION = 1
+
+# Enough for the texts of a few templates.
+_WORD_WIDTHS_CACHE_SIZE = 65536
+_LINES_CACHE_SIZE = 4096
 
 
 @dataclasses.dataclass()
@@ -25,6 +34,18 @@ class Line:
     words: typing.List[Word]
 
 
+@dataclasses.dataclass()
+class FontMetrics:
+
+    name: str
+    descriptor: typing.Dict[str, typing.Any]
+    underline_position: int
+    underline_thickness: int
+    default_width: int
+    widths: typing.Dict[int, int]
+    cmap: typing.Tuple[int, ...]
+
+
 class PdfTemplateRenderer(TemplateRenderer):
 
     DEFAULT_PRIORITIES = {
@@ -37,6 +58,7 @@ class PdfTemplateRenderer(TemplateRenderer):
         self,
         priorities: typing.Dict[str, int] = None,
         debug=False,
+        font_cache_directory: typing.Optional[str] = None,
     ) -> None:
         super().__init__()
 
@@ -45,6 +67,16 @@ class PdfTemplateRenderer(TemplateRenderer):
 
         self.priorities = priorities
         self.debug = debug
+        self.font_cache_directory = font_cache_directory
+
+        # Keyed on the hash of the font file (and of the characters), kept across renders.
+        self._font_metrics: typing.Dict[str, FontMetrics] = {}
+        self._font_subsets: typing.Dict[str, bytes] = {}
+
+        # Text layouts, only valid as long as the families keep the same metrics (None for the core fonts).
+        self._word_widths = LruCache(_WORD_WIDTHS_CACHE_SIZE)
+        self._lines = LruCache(_LINES_CACHE_SIZE)
+        self._family_metrics: typing.Dict[str, typing.Optional[FontMetrics]] = {}
 
     def render(
         self,
@@ -56,6 +88,8 @@ class PdfTemplateRenderer(TemplateRenderer):
         )
 
         families = set()
+        characters = _collect_characters(template.document)
+        family_metrics = dict()
 
         for font in template.document.fonts:
             file_name = font.file_name
@@ -64,17 +98,21 @@ class PdfTemplateRenderer(TemplateRenderer):
                 continue
 
             if os.path.exists(file_name):
-                pdf.add_font(font.family, "", file_name)
+                with open(file_name, "rb") as fd:
+                    family_metrics[font.family.lower()] = self._add_font_from_bytes(pdf, font.family, fd.read(), characters[font.family.lower()])
             elif font.bytes:
-                self._add_font_from_bytes(pdf, font)
+                family_metrics[font.family.lower()] = self._add_font_from_bytes(pdf, font.family, font.bytes, characters[font.family.lower()])
             else:
                 font.family = "helvetica"
+                family_metrics[font.family] = None
 
                 if file_name not in families:
                     print(f"font {file_name} not found, using {font.family} instead")
 
             families.add(file_name)
 
+        self._update_family_metrics(family_metrics)
+
         pdf.set_auto_page_break(False)
 
         for page in template.document.pages:
@@ -111,7 +149,44 @@ class PdfTemplateRenderer(TemplateRenderer):
             image.position.width, image.position.height
         )
 
+    def _update_family_metrics(self, family_metrics: typing.Dict[str, typing.Optional[FontMetrics]]):
+        for family, metrics in family_metrics.items():
+            previous = self._family_metrics.get(family, metrics)
+
+            if previous is not metrics:
+                self._word_widths.clear()
+                self._lines.clear()
+                break
+
+        self._family_metrics.update(family_metrics)
+
+    def _get_string_width(self, pdf: fpdf.FPDF, font: Font, string: str) -> float:
+        key = (font.family.lower(), font.size, string)
+
+        width = self._word_widths.get(key)
+        if width is None:
+            pdf.set_font(font.family, '', font.size)
+            width = pdf.get_string_width(string)
+
+            self._word_widths.put(key, width)
+
+        return width
+
     def _compute_lines(self, pdf: fpdf.FPDF, text: Text) -> typing.List[Line]:
+        # The debug colors are set while computing the lines.
+        if self.debug:
+            return self._do_compute_lines(pdf, text)
+
+        key = _get_layout_key(text)
+
+        lines = self._lines.get(key)
+        if lines is None:
+            lines = self._do_compute_lines(pdf, text)
+            self._lines.put(key, lines)
+
+        return lines
+
+    def _do_compute_lines(self, pdf: fpdf.FPDF, text: Text) -> typing.List[Line]:
         lines = []
         words = []
 
@@ -135,9 +210,7 @@ class PdfTemplateRenderer(TemplateRenderer):
 
             words = []
 
-        font = text.font
-        pdf.set_font(font.family, '', font.size)
-        space_size = pdf.get_string_width(" ")
+        space_size = self._get_string_width(pdf, text.font, " ")
 
         x, y = 0, 0
 
@@ -159,7 +232,6 @@ class PdfTemplateRenderer(TemplateRenderer):
 
             color = span.color or text.color
             font = span.font or text.font
-            pdf.set_font(font.family, '', font.size)
 
             if self.debug:
                 if span_index % 2:
@@ -179,9 +251,8 @@ class PdfTemplateRenderer(TemplateRenderer):
                 y += font.size * line_count
             elif word[0] == " ":
                 x += space_size * len(word)
-                span_width = pdf.get_string_width(word)
             else:
-                span_width = pdf.get_string_width(word)
+                span_width = self._get_string_width(pdf, font, word)
 
                 next_x = x + span_width
 
@@ -286,88 +357,240 @@ class PdfTemplateRenderer(TemplateRenderer):
                 element.position.height
             )
 
-    def _add_font_from_bytes(self, pdf: fpdf.FPDF, font: Font):
+    def _add_font_from_bytes(
+        self,
+        pdf: fpdf.FPDF,
+        family: str,
+        content: bytes,
+        characters: typing.Optional[typing.Set[str]] = None,
+    ) -> typing.Optional[FontMetrics]:
         """
         Partially extracted from official fpdf.FPDF.add_font function.
         But this one only keep the important part and use a io buffer instead of a filename.
+
+        The metrics are only extracted once per font. When the `characters` are known, the embedded font
+        is first reduced to them, fpdf's own subsetting at output is then done on a much smaller font.
         """
-        font_ = font
 
         import warnings
-        from fontTools import ttLib
         from fpdf.fpdf import SubsetMap
-        from fpdf.enums import FontDescriptorFlags, TextEmphasis
+        from fpdf.enums import TextEmphasis
         from fpdf.output import PDFFontDescriptor
 
-        fontkey = font.family.lower()
+        fontkey = family.lower()
         if fontkey in pdf.fonts or fontkey in pdf.core_fonts:
             warnings.warn(f"Core font or font already added '{fontkey}': doing nothing")
-            return
-
-        font = ttLib.TTFont(io.BytesIO(font.bytes), fontNumber=0, lazy=True)
-
-        scale = 1000 / font["head"].unitsPerEm
-        default_width = round(scale * font["hmtx"].metrics[".notdef"][0])
-
-        try:
-            cap_height = font["OS/2"].sCapHeight
-        except AttributeError:
-            cap_height = font["hhea"].ascent
-
-        flags = FontDescriptorFlags.SYMBOLIC
-        if font["post"].isFixedPitch:
-            flags |= FontDescriptorFlags.FIXED_PITCH
-        if font["post"].italicAngle != 0:
-            flags |= FontDescriptorFlags.ITALIC
-        if font["OS/2"].usWeightClass >= 600:
-            flags |= FontDescriptorFlags.FORCE_BOLD
-
-        desc = PDFFontDescriptor(
-            ascent=round(font["hhea"].ascent * scale),
-            descent=round(font["hhea"].descent * scale),
-            cap_height=round(cap_height * scale),
-            flags=flags,
-            font_b_box=(
-                f"[{font['head'].xMin * scale:.0f} {font['head'].yMin * scale:.0f}"
-                f" {font['head'].xMax * scale:.0f} {font['head'].yMax * scale:.0f}]"
-            ),
-            italic_angle=int(font["post"].italicAngle),
-            stem_v=round(50 + int(pow((font["OS/2"].usWeightClass / 65), 2))),
-            missing_width=default_width,
-        )
-
-        char_widths = collections.defaultdict(lambda: default_width)
-        font_cmap = tuple(font.getBestCmap().keys())
-        for char in font_cmap:
-            glyph = font.getBestCmap()[char]
-            w = font["hmtx"].metrics[glyph][0]
-            if w == 65535:
-                w = 0
+            return None
 
-            char_widths[char] = round(scale * w + 0.001)
+        metrics = self._get_font_metrics(content)
 
         sbarr = "\x00 "
         if pdf.str_alias_nb_pages:
             sbarr += "0123456789"
             sbarr += pdf.str_alias_nb_pages
 
+        if characters is not None:
+            content = self._get_font_subset(content, characters | set(sbarr))
+
+        default_width = metrics.default_width
+
         pdf.fonts[fontkey] = {
             "i": len(pdf.fonts) + 1,
             "type": "TTF",
-            "name": re.sub("[ ()]", "", font["name"].getBestFullName()),
-            "desc": desc,
-            "up": round(font["post"].underlinePosition * scale),
-            "ut": round(font["post"].underlineThickness * scale),
-            "cw": char_widths,
-            "ttffile": io.BytesIO(font_.bytes),
+            "name": metrics.name,
+            # Modified by fpdf while writing the output, it cannot be shared.
+            "desc": PDFFontDescriptor(**metrics.descriptor),
+            "up": metrics.underline_position,
+            "ut": metrics.underline_thickness,
+            "cw": collections.defaultdict(lambda: default_width, metrics.widths),
+            "ttffile": io.BytesIO(content),
             "fontkey": fontkey,
             "emphasis": TextEmphasis.coerce(""),
             "subset": SubsetMap(map(ord, sbarr)),
-            "cmap": font_cmap,
+            "cmap": metrics.cmap,
         }
 
+        return metrics
+
+    def _get_font_metrics(self, content: bytes) -> FontMetrics:
+        digest = hashlib.sha256(content).hexdigest()
+
+        metrics = self._font_metrics.get(digest)
+        if metrics is not None:
+            return metrics
+
+        pickled = self._read_font_cache(f"{digest}.metrics.v{_FONT_CACHE_VERSION}.pickle")
+        if pickled is not None:
+            metrics = pickle.loads(pickled)
+        else:
+            metrics = _compute_font_metrics(content)
+
+            self._write_font_cache(
+                f"{digest}.metrics.v{_FONT_CACHE_VERSION}.pickle",
+                pickle.dumps(metrics, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+
+        self._font_metrics[digest] = metrics
+
+        return metrics
+
+    def _get_font_subset(self, content: bytes, characters: typing.Set[str]) -> bytes:
+        digest = hashlib.sha256(content)
+        digest.update("".join(sorted(characters)).encode("utf-8", "surrogatepass"))
+        digest = digest.hexdigest()
+
+        subset = self._font_subsets.get(digest)
+        if subset is not None:
+            return subset
+
+        subset = self._read_font_cache(f"{digest}.subset.ttf")
+        if subset is None:
+            subset = _subset_font(content, characters)
+            self._write_font_cache(f"{digest}.subset.ttf", subset)
+
+        self._font_subsets[digest] = subset
+
+        return subset
+
+    def _read_font_cache(self, file_name: str) -> typing.Optional[bytes]:
+        if self.font_cache_directory is None:
+            return None
+
+        try:
+            with open(os.path.join(self.font_cache_directory, file_name), "rb") as fd:
+                return fd.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_font_cache(self, file_name: str, content: bytes) -> None:
+        if self.font_cache_directory is None:
+            return
+
+        os.makedirs(self.font_cache_directory, exist_ok=True)
+        write_atomically(os.path.join(self.font_cache_directory, file_name), content)
+
+
+def _compute_font_metrics(content: bytes) -> FontMetrics:
+    from fontTools import ttLib
+    from fpdf.enums import FontDescriptorFlags
+
+    font = ttLib.TTFont(io.BytesIO(content), fontNumber=0, lazy=True)
+
+    scale = 1000 / font["head"].unitsPerEm
+    default_width = round(scale * font["hmtx"].metrics[".notdef"][0])
+
+    try:
+        cap_height = font["OS/2"].sCapHeight
+    except AttributeError:
+        cap_height = font["hhea"].ascent
+
+    flags = FontDescriptorFlags.SYMBOLIC
+    if font["post"].isFixedPitch:
+        flags |= FontDescriptorFlags.FIXED_PITCH
+    if font["post"].italicAngle != 0:
+        flags |= FontDescriptorFlags.ITALIC
+    if font["OS/2"].usWeightClass >= 600:
+        flags |= FontDescriptorFlags.FORCE_BOLD
+
+    descriptor = dict(
+        ascent=round(font["hhea"].ascent * scale),
+        descent=round(font["hhea"].descent * scale),
+        cap_height=round(cap_height * scale),
+        flags=flags,
+        font_b_box=(
+            f"[{font['head'].xMin * scale:.0f} {font['head'].yMin * scale:.0f}"
+            f" {font['head'].xMax * scale:.0f} {font['head'].yMax * scale:.0f}]"
+        ),
+        italic_angle=int(font["post"].italicAngle),
+        stem_v=round(50 + int(pow((font["OS/2"].usWeightClass / 65), 2))),
+        missing_width=default_width,
+    )
+
+    widths = dict()
+    best_cmap = font.getBestCmap()
+    metrics = font["hmtx"].metrics
+    for char, glyph in best_cmap.items():
+        w = metrics[glyph][0]
+        if w == 65535:
+            w = 0
+
+        widths[char] = round(scale * w + 0.001)
+
+    return FontMetrics(
+        name=re.sub("[ ()]", "", font["name"].getBestFullName()),
+        descriptor=descriptor,
+        underline_position=round(font["post"].underlinePosition * scale),
+        underline_thickness=round(font["post"].underlineThickness * scale),
+        default_width=default_width,
+        widths=widths,
+        cmap=tuple(best_cmap.keys()),
+    )
+
+
+def _subset_font(content: bytes, characters: typing.Set[str]) -> bytes:
+    from fontTools import subset, ttLib
+
+    font = ttLib.TTFont(io.BytesIO(content), recalcTimestamp=False, fontNumber=0, lazy=True)
+
+    # Glyph names are kept, fpdf finds the glyphs through them.
+    options = subset.Options(notdef_outline=True, recommended_glyphs=True, glyph_names=True)
+    # Dropped by fpdf anyway.
+    options.drop_tables += ["FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx"]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(character) for character in characters])
+    subsetter.subset(font)
+
+    output = io.BytesIO()
+    font.save(output)
+
+    return output.getvalue()
+
+
+def _collect_characters(document: Document) -> typing.Dict[str, typing.Set[str]]:
+    """
+    Characters that may be drawn with each font family.
+    Every character of a text is attributed to all of its fonts, this is simpler than following the spans.
+    """
+
+    characters = collections.defaultdict(set)
+
+    for page in document.pages:
+        for element in page.elements:
+            if not isinstance(element, Text):
+                continue
+
+            content = set(element.content)
+
+            characters[element.font.family.lower()].update(content)
+            for span in element.spans:
+                if span.font:
+                    characters[span.font.family.lower()].update(content)
+
+    return characters
+
+
+def _get_layout_key(text: Text):
+    def font_key(font: typing.Optional[Font]):
+        return (font.family.lower(), font.size) if font else None
+
+    def color_key(color: typing.Optional[Color]):
+        return (color.red, color.green, color.blue, color.alpha) if color else None
+
+    return (
+        text.content,
+        text.position.width,
+        font_key(text.font),
+        color_key(text.color),
+        tuple(
+            (span.start, font_key(span.font), color_key(span.color))
+            for span in text.spans
+        ),
+    )
+
+
+_WORDS_PATTERN = re.compile(r" +|\n+|[^ \n]+")
+
 
 def _split_words(text: str):
-    for _, group in itertools.groupby(enumerate(text), lambda x: (x[1] == " ", x[1] == "\n")):
-        index, part = next(group)
-        yield index, part + "".join(x for _, x in group)
+    for match in _WORDS_PATTERN.finditer(text):
+        yield match.start(), match.group()
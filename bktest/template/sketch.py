@@ -1,12 +1,93 @@
+import hashlib
+import os
+import pickle
 import zipfile
 import shutil
 import json
 
 from .models import *
 from .template import *
+from ..utils import write_atomically
+
+# Bumped when the models change, to invalidate the documents pickled on disk.
+_CACHE_VERSION = 1
 
 
 class SketchTemplateLoader(TemplateLoader):
+    """
+    Load a template from a .sketch file.
+
+    Parsed documents are kept in memory, and reused until the file's modification time
+    or size change and its content hash differs.
+    With a `cache_directory`, they are also pickled on disk, keyed on the content hash.
+    Every load returns its own copy of the document, which can be freely modified.
+    """
+
+    def __init__(
+        self,
+        cache_directory: typing.Optional[str] = None,
+    ):
+        self.cache_directory = cache_directory
+
+        self._documents: typing.Dict[str, typing.Tuple[typing.Tuple[int, int], str, bytes]] = {}
+
+    def load(self, path: str) -> Template:
+        document = pickle.loads(self._load_pickled(path))
+
+        return Template(
+            path,
+            document
+        )
+
+    def _load_pickled(self, path: str) -> bytes:
+        key = os.path.abspath(path)
+
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._documents.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[2]
+
+        with open(path, "rb") as fd:
+            content = fd.read()
+
+        digest = hashlib.sha256(content).hexdigest()
+
+        if cached is not None and cached[1] == digest:
+            pickled = cached[2]
+        else:
+            pickled = self._read_cache(digest)
+
+            if pickled is None:
+                document = self._parse(io.BytesIO(content))
+                pickled = pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+
+                self._write_cache(digest, pickled)
+
+        self._documents[key] = (signature, digest, pickled)
+
+        return pickled
+
+    def _get_cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_directory, f"{digest}.v{_CACHE_VERSION}.pickle")
+
+    def _read_cache(self, digest: str) -> typing.Optional[bytes]:
+        if self.cache_directory is None:
+            return None
+
+        try:
+            with open(self._get_cache_path(digest), "rb") as fd:
+                return fd.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_cache(self, digest: str, pickled: bytes) -> None:
+        if self.cache_directory is None:
+            return
+
+        os.makedirs(self.cache_directory, exist_ok=True)
+        write_atomically(self._get_cache_path(digest), pickled)
 
     def _load(self, zipfd: zipfile.ZipFile, sketch: dict):
         elements: typing.List[Element]
@@ -113,8 +194,8 @@ class SketchTemplateLoader(TemplateLoader):
 
         return pages
 
-    def load(self, path: str) -> Template:
-        with zipfile.ZipFile(path) as zipfd:
+    def _parse(self, file: typing.BinaryIO) -> Document:
+        with zipfile.ZipFile(file) as zipfd:
             def open_or_none(file_path: str):
                 try:
                     return zipfd.open(file_path)
@@ -158,10 +239,7 @@ class SketchTemplateLoader(TemplateLoader):
                 else:
                     loaded_fonts[file_name] = False
 
-            return Template(
-                path,
-                document
-            )
+            return document
 
     def _get_frame_xy(self, layer: dict):
         return Vector2(
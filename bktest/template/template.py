@@ -1,8 +1,9 @@
 import io
+import os
+import pickle
 import shutil
 import re
 import collections
-import matplotlib.figure
 import sys
 
 from .models import *
@@ -12,6 +13,9 @@ class Template:
 
     name: str
     document: Document
+
+    # Format of the figures set to the images, "svg" keeps them as vectors.
+    figure_format = "png"
     slots: typing.Dict[
         typing.Union[NaturalIdentifier, Identifier],
         typing.List[Element]
@@ -31,6 +35,18 @@ class Template:
                 self.slots[element.id].append(element)
                 self.slots[element.natural_id].append(element)
 
+    def copy(self) -> "Template":
+        """
+        Deep copy of the template, pickling being much faster than `copy.deepcopy` for the document.
+        """
+
+        document = pickle.loads(pickle.dumps(self.document, protocol=pickle.HIGHEST_PROTOCOL))
+
+        template = Template(self.name, document)
+        template.figure_format = self.figure_format
+
+        return template
+
     def log(self, message: str):
         print(f"template: {message}", file=sys.stderr)
 
@@ -82,18 +98,8 @@ class Template:
 
                 if isinstance(value, io.BytesIO):
                     image.bytes = value
-                elif isinstance(value, matplotlib.figure.Figure):
-                    figure: matplotlib.figure.Figure = value
-                    figure.suptitle("")
-                    figure.gca().set_ylabel("")
-                    figure.gca().set_xlabel("")
-                    figure.gca().set_title("")
-
-                    bytes = io.BytesIO()
-                    figure.savefig(bytes, bbox_inches="tight")
-                    bytes.seek(0)
-
-                    image.bytes = bytes
+                elif is_figure(value):
+                    image.bytes = figure_to_bytes(value, self.figure_format)
                 elif isinstance(value, str):
                     bytes = io.BytesIO()
                     with open(value, "rb") as fd:
@@ -105,6 +111,47 @@ class Template:
                         f"unsupported for image: {type(value)} {value}")
 
 
+FIGURE_FORMATS = ["png", "svg"]
+
+
+def use_agg_backend():
+    """
+    Figures are only rendered to files, there is no need for an interactive backend (in a worker for example).
+    """
+
+    matplotlib = sys.modules.get("matplotlib")
+    if matplotlib is not None:
+        matplotlib.use("Agg")
+    else:
+        os.environ["MPLBACKEND"] = "Agg"
+
+
+def is_figure(value: typing.Any) -> bool:
+    """
+    Without importing matplotlib, a figure cannot exist if it has not been imported yet.
+    """
+
+    module = sys.modules.get("matplotlib.figure")
+
+    return module is not None and isinstance(value, module.Figure)
+
+
+def figure_to_bytes(figure: "matplotlib.figure.Figure", format="png") -> io.BytesIO:
+    if format not in FIGURE_FORMATS:
+        raise ValueError(f"unsupported figure format: {format}")
+
+    figure.suptitle("")
+    figure.gca().set_ylabel("")
+    figure.gca().set_xlabel("")
+    figure.gca().set_title("")
+
+    bytes = io.BytesIO()
+    figure.savefig(bytes, format=format, bbox_inches="tight")
+    bytes.seek(0)
+
+    return bytes
+
+
 class TemplateLoader:
 
     def load(path: str) -> Template:
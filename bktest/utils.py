@@ -1,5 +1,9 @@
+import collections
+import os
 import typing
 
+import numpy
+
 
 def signum(n):
     if n < 0:
@@ -59,3 +63,110 @@ def use_attrs(x: dict):
             x[name] = value
 
     return Wrapped()
+
+
+def write_atomically(path: str, content: bytes):
+    """
+    Write to a temporary file first, so that a concurrent reader never sees a partial file.
+    """
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "wb") as fd:
+        fd.write(content)
+
+    os.replace(temporary_path, path)
+
+
+class LruCache:
+    """
+    Mapping only keeping its `maxsize` most recently used entries.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+
+        self.maxsize = maxsize
+
+        self._entries: typing.OrderedDict[typing.Hashable, typing.Any] = collections.OrderedDict()
+
+    def get(self, key: typing.Hashable, default=None) -> typing.Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            return default
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, key: typing.Hashable, value: typing.Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class GrowableArray:
+    """
+    A typed numpy array that can be appended to, doubling its capacity when full.
+    """
+
+    def __init__(self, dtype, capacity=1024):
+        self._values = numpy.empty(max(1, capacity), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def values(self) -> numpy.ndarray:
+        """
+        A view (not a copy) of the appended values.
+        """
+
+        return self._values[:self._size]
+
+    def append(self, value):
+        self._reserve(1)
+
+        self._values[self._size] = value
+        self._size += 1
+
+    def extend(self, values: typing.Sequence):
+        count = len(values)
+        self._reserve(count)
+
+        self._values[self._size:self._size + count] = values
+        self._size += count
+
+    def fill(self, value, count: int):
+        self._reserve(count)
+
+        self._values[self._size:self._size + count] = value
+        self._size += count
+
+    def clear(self):
+        self._size = 0
+
+    def _reserve(self, count: int):
+        required = self._size + count
+
+        capacity = len(self._values)
+        if required <= capacity:
+            return
+
+        while capacity < required:
+            capacity *= 2
+
+        values = numpy.empty(capacity, dtype=self._values.dtype)
+        values[:self._size] = self._values[:self._size]
+        self._values = values
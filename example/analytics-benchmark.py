@@ -0,0 +1,23 @@
+import timeit
+import warnings
+
+import numpy
+import pandas
+
+import bktest.analytics
+import bktest.export.report
+
+warnings.simplefilter("ignore")
+
+random = numpy.random.default_rng(42)
+dates = pandas.bdate_range("2000-01-01", periods=252 * 20)
+
+returns = pandas.Series(random.normal(0.0005, 0.01, len(dates)), index=dates)
+benchmark = pandas.Series(random.normal(0.0003, 0.012, len(dates)), index=dates)
+
+for name, function in [
+    ("quantstats", bktest.export.report.compute_metrics),
+    ("numpy", bktest.analytics.compute_metrics),
+]:
+    seconds = min(timeit.repeat(lambda: function(returns, benchmark), number=1, repeat=5))
+    print(f"{name:>10}: {seconds * 1000:.1f}ms")
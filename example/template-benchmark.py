@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import timeit
+import zipfile
+
+import bktest.template
+
+# Renders a tearsheet-like template: a header, two columns of metrics and a few paragraphs.
+# Usage: python template-benchmark.py [template.sketch]
+
+METRICS = [
+    "Cumulative Return", "CAGR", "Sharpe", "Sortino", "Max Drawdown", "Volatility (ann.)",
+    "Calmar", "Skew", "Kurtosis", "Expected Daily", "Expected Monthly", "Expected Yearly",
+    "Daily Value-at-Risk", "Expected Shortfall (cVaR)", "Best Day", "Worst Day",
+    "Best Month", "Worst Month", "Best Year", "Worst Year", "Avg. Drawdown", "Avg. Drawdown Days",
+    "Recovery Factor", "Ulcer Index", "Win Days", "Win Month", "Win Quarter", "Win Year",
+]
+
+PARAGRAPH = (
+    "The strategy is rebalanced every day at the close, the orders being executed at the next open. "
+    "Returns are computed on the total equity, including the cash, and are net of the fees. "
+    "The benchmark is the Russell 1000 index, its returns are not adjusted for the dividends.\n"
+)
+
+
+def _text_layer(name: str, string: str, x: int, y: int, width: int, height: int):
+    attributes = {
+        "MSAttributedStringFontAttribute": {"attributes": {"name": "Helvetica", "size": 9}},
+        "MSAttributedStringColorAttribute": {"red": 0.1, "green": 0.1, "blue": 0.1, "alpha": 1},
+    }
+
+    return {
+        "_class": "text",
+        "do_objectID": f"{name}-{x}-{y}",
+        "name": name,
+        "frame": {"x": x, "y": y, "width": width, "height": height},
+        "hasClippingMask": False,
+        "attributedString": {
+            "string": string,
+            "attributes": [{"location": 0, "length": len(string), "attributes": attributes}],
+        },
+        "style": {"textStyle": {"encodedAttributes": attributes}},
+    }
+
+
+def _write_template(path: str):
+    layers = [
+        _text_layer("title", "Tearsheet", 20, 20, 300, 30),
+        _text_layer("$date", "$date", 400, 20, 150, 20),
+    ]
+
+    for column in range(2):
+        for index, metric in enumerate(METRICS):
+            x, y = 20 + column * 280, 70 + index * 18
+            slug = metric.lower().replace(" ", "-")
+
+            layers.append(_text_layer(metric, metric, x, y, 150, 16))
+            layers.append(_text_layer(f"$qs.metric.{('strategy', 'benchmark')[column]}.{slug}", "-", x + 160, y, 100, 16))
+
+    for index in range(4):
+        layers.append(_text_layer(f"paragraph-{index}", PARAGRAPH * 3, 20, 600 + index * 80, 540, 80))
+
+    page = {
+        "layers": [{
+            "_class": "artboard",
+            "do_objectID": "page",
+            "name": "page",
+            "frame": {"x": 0, "y": 0, "width": 595, "height": 950},
+            "hasClippingMask": False,
+            "layers": layers,
+        }],
+    }
+
+    with zipfile.ZipFile(path, "w") as zipfd:
+        zipfd.writestr("document.json", json.dumps({"pages": [{"_ref": "pages/page"}]}))
+        zipfd.writestr("pages/page.json", json.dumps(page))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        if len(sys.argv) > 1:
+            path = sys.argv[1]
+        else:
+            path = os.path.join(directory, "tearsheet.sketch")
+            _write_template(path)
+
+        loader = bktest.template.SketchTemplateLoader()
+        renderer = bktest.template.PdfTemplateRenderer()
+
+        def render():
+            template = loader.load(path)
+
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    renderer.render(template, io.BytesIO())
+                finally:
+                    sys.stdout = stdout
+
+        # The first render also fills the caches.
+        first = timeit.timeit(render, number=1)
+        seconds = min(timeit.repeat(render, number=1, repeat=20))
+
+        print(f"{'first':>10}: {first * 1000:.1f}ms")
+        print(f"{'render':>10}: {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
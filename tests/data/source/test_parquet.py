@@ -0,0 +1,113 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import numpy
+import pandas
+
+from bktest.data.source import ParquetDataSource
+
+
+class ParquetDataSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.dataframe = pandas.DataFrame({
+            "date": pandas.to_datetime([
+                "2024-01-01", "2024-01-02", "2024-01-03",
+                "2024-01-01", "2024-01-02", "2024-01-03",
+                "2024-01-01", "2024-01-02", "2024-01-03",
+            ]),
+            "symbol": [
+                "AAPL", "AAPL", "AAPL",
+                "TSLA", "TSLA", "TSLA",
+                "MSFT", "MSFT", "MSFT",
+            ],
+            "price": [
+                1.0, 2.0, 3.0,
+                4.0, 5.0, 6.0,
+                7.0, 8.0, 9.0,
+            ],
+        })
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_file(self, dataframe: pandas.DataFrame):
+        path = os.path.join(self.directory.name, "prices.parquet")
+        dataframe.to_parquet(path, row_group_size=3)
+
+        return path
+
+    def test_fetch_prices(self):
+        path = self._write_file(self.dataframe)
+        data_source = ParquetDataSource(path)
+
+        prices = data_source.fetch_prices(
+            {"AAPL", "TSLA", "UNKNOWN"},
+            datetime.date(2024, 1, 2),
+            datetime.date(2024, 1, 3),
+        )
+
+        self.assertEqual("date", prices.index.name)
+        self.assertEqual({"AAPL", "TSLA", "UNKNOWN"}, set(prices.columns))
+        self.assertEqual(list(pandas.to_datetime(["2024-01-02", "2024-01-03"])), list(prices.index))
+        self.assertEqual([2.0, 3.0], list(prices["AAPL"]))
+        self.assertEqual([5.0, 6.0], list(prices["TSLA"]))
+        self.assertTrue(prices["UNKNOWN"].isna().all())
+
+    def test_fetch_prices_string_dates(self):
+        dataframe = self.dataframe.copy()
+        dataframe["date"] = dataframe["date"].dt.strftime("%Y-%m-%d")
+
+        path = self._write_file(dataframe)
+        data_source = ParquetDataSource(path)
+
+        prices = data_source.fetch_prices(
+            {"MSFT"},
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 2),
+        )
+
+        self.assertEqual([7.0, 8.0], list(prices["MSFT"]))
+        self.assertIsInstance(prices.index, pandas.DatetimeIndex)
+
+    def test_fetch_prices_none_found(self):
+        path = self._write_file(self.dataframe)
+        data_source = ParquetDataSource(path)
+
+        prices = data_source.fetch_prices(
+            {"UNKNOWN"},
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 3),
+        )
+
+        self.assertEqual(3, len(prices))
+        self.assertTrue(numpy.isnan(prices["UNKNOWN"]).all())
+
+    def test_fetch_prices_partitioned(self):
+        self.dataframe.to_parquet(
+            self.directory.name,
+            partition_cols=["symbol"]
+        )
+
+        data_source = ParquetDataSource(self.directory.name)
+
+        prices = data_source.fetch_prices(
+            {"TSLA", "UNKNOWN"},
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 3),
+        )
+
+        self.assertEqual({"TSLA", "UNKNOWN"}, set(prices.columns))
+        self.assertEqual([4.0, 5.0, 6.0], list(prices["TSLA"]))
+
+    def test_missing_column(self):
+        path = self._write_file(self.dataframe)
+
+        with self.assertRaises(ValueError) as context:
+            ParquetDataSource(path, price_column="close")
+
+        self.assertEqual("column close not found", str(context.exception))
@@ -0,0 +1,56 @@
+import datetime
+import tempfile
+import unittest
+import unittest.mock
+
+import pandas
+
+from bktest.data.cache import ResponseCache
+from bktest.data.source import YahooDataSource
+
+
+class YahooDataSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.start = datetime.date(2024, 1, 1)
+        self.end = datetime.date(2024, 1, 3)
+        self.index = pandas.date_range(self.start, self.end, name="Date")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _download(self, tickers, **kwargs):
+        return pandas.concat({
+            "Adj Close": pandas.DataFrame({
+                ticker: [1.0, 2.0, 3.0]
+                for ticker in tickers
+            }, index=self.index)
+        }, axis=1)
+
+    def test_fetch_prices_cached(self):
+        cache = ResponseCache(self.directory.name)
+        data_source = YahooDataSource(cache=cache)
+
+        with unittest.mock.patch("yfinance.download", side_effect=self._download) as download:
+            prices = data_source.fetch_prices({"AAPL"}, self.start, self.end)
+            self.assertEqual(["AAPL"], list(prices.columns))
+            self.assertEqual("date", prices.index.name)
+
+            prices = data_source.fetch_prices(["AAPL", "TSLA"], self.start, self.end)
+            self.assertEqual({"AAPL", "TSLA"}, set(prices.columns))
+
+            self.assertEqual(2, download.call_count)
+            self.assertEqual(["TSLA"], download.call_args.kwargs["tickers"])
+            self.assertIs(cache.session, download.call_args.kwargs["session"])
+
+    def test_fetch_prices_offline(self):
+        cache = ResponseCache(self.directory.name, offline=True)
+        data_source = YahooDataSource(cache=cache)
+
+        with unittest.mock.patch("yfinance.download", side_effect=self._download) as download:
+            prices = data_source.fetch_prices(["AAPL"], self.start, self.end)
+
+            download.assert_not_called()
+            self.assertTrue(prices["AAPL"].isna().all())
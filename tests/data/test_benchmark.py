@@ -0,0 +1,62 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import numpy
+import pandas
+
+from bktest.data.benchmark import FileBenchmarkSource, PriceProviderBenchmarkSource
+from bktest.data.source import DataFrameDataSource
+from bktest.price_provider import PriceProvider
+
+
+class FileBenchmarkSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_returns(self):
+        path = os.path.join(self.directory.name, "benchmark.csv")
+        pandas.DataFrame({
+            "date": ["2024-01-03", "2024-01-01", "2024-01-02", "2024-01-02"],
+            "symbol": ["SPY", "SPY", "SPY", "QQQ"],
+            "price": [121.0, 100.0, 110.0, 42.0],
+        }).to_csv(path, index=False)
+
+        returns = FileBenchmarkSource(path).get_returns("SPY")
+
+        self.assertEqual(list(pandas.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"])), list(returns.index))
+        self.assertTrue(numpy.isnan(returns.iloc[0]))
+        numpy.testing.assert_allclose([0.1, 0.1], returns.iloc[1:].values)
+
+
+class PriceProviderBenchmarkSourceTest(unittest.TestCase):
+
+    def test_get_returns(self):
+        data_source = DataFrameDataSource(pandas.DataFrame({
+            "date": ["2024-01-05", "2024-01-08", "2024-01-09"],
+            "symbol": ["SPY", "SPY", "SPY"],
+            "price": [100.0, 50.0, 100.0],
+        }))
+
+        price_provider = PriceProvider(
+            datetime.date(2024, 1, 5),
+            datetime.date(2024, 1, 9),
+            data_source,
+            None,
+            caching=False
+        )
+
+        source = PriceProviderBenchmarkSource(price_provider)
+        source.prefetch("SPY")
+
+        self.assertIn("SPY", price_provider.symbols)
+
+        returns = source.get_returns("SPY")
+
+        self.assertEqual(list(pandas.to_datetime(["2024-01-05", "2024-01-08", "2024-01-09"])), list(returns.index))
+        numpy.testing.assert_allclose([-0.5, 1.0], returns.iloc[1:].values)
@@ -0,0 +1,65 @@
+import datetime
+import os
+import tempfile
+import time
+import unittest
+
+import pandas
+
+from bktest.data.cache import ResponseCache
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.start = datetime.date(2024, 1, 1)
+        self.end = datetime.date(2024, 1, 3)
+        self.series = pandas.Series(
+            [1.0, 2.0, 3.0],
+            index=pandas.DatetimeIndex(pandas.date_range(self.start, self.end), name="date"),
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_missing(self):
+        cache = ResponseCache(self.directory.name)
+
+        self.assertIsNone(cache.get("yahoo", "AAPL", self.start, self.end))
+
+    def test_put_get(self):
+        cache = ResponseCache(self.directory.name)
+        cache.put("yahoo", "^GSPC", self.start, self.end, self.series)
+
+        series = cache.get("yahoo", "^GSPC", self.start, self.end)
+
+        self.assertEqual("^GSPC", series.name)
+        self.assertEqual(list(self.series), list(series))
+        self.assertEqual(list(self.series.index), list(series.index))
+
+        self.assertIsNone(cache.get("yahoo", "^GSPC", self.start, self.start))
+        self.assertIsNone(cache.get("other", "^GSPC", self.start, self.end))
+
+    def test_get_expired(self):
+        cache = ResponseCache(self.directory.name, ttl=datetime.timedelta(hours=1))
+        cache.put("yahoo", "AAPL", None, None, self.series)
+
+        path = cache._get_path("yahoo", "AAPL", None, None)
+        two_hours_ago = time.time() - 2 * 60 * 60
+        os.utime(path, (two_hours_ago, two_hours_ago))
+
+        self.assertIsNone(cache.get("yahoo", "AAPL"))
+
+        cache.offline = True
+        self.assertIsNotNone(cache.get("yahoo", "AAPL"))
+
+    def test_get_no_ttl(self):
+        cache = ResponseCache(self.directory.name, ttl=None)
+        cache.put("yahoo", "AAPL", None, None, self.series)
+
+        path = cache._get_path("yahoo", "AAPL", None, None)
+        os.utime(path, (0, 0))
+
+        self.assertIsNotNone(cache.get("yahoo", "AAPL"))
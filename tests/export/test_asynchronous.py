@@ -0,0 +1,107 @@
+import datetime
+import threading
+import unittest
+
+from bktest.account import Account
+from bktest.export import AsyncExporter, Exporter, ExporterCollection
+from bktest.order import Order
+
+
+class RecordingExporter(Exporter):
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def initialize(self):
+        self.calls.append("initialize")
+
+    def on_skip(self, date, reason, ordered):
+        self.threads.add(threading.current_thread())
+        self.calls.append(("skip", reason))
+
+    def on_snapshot(self, snapshot):
+        self.threads.add(threading.current_thread())
+        self.calls.append(("snapshot", snapshot.equity, [(holding.symbol, holding.price) for holding in snapshot.holdings]))
+
+    def finalize(self):
+        self.calls.append("finalize")
+
+
+class FailingExporter(Exporter):
+
+    def on_skip(self, date, reason, ordered):
+        raise IOError("broken pipe")
+
+
+class AsyncExporterTest(unittest.TestCase):
+
+    def test_events(self):
+        recorder = RecordingExporter()
+        exporter = AsyncExporter(recorder)
+
+        account = Account(initial_cash=1_000)
+        account.place_order(Order("AAPL", 10, 1))
+
+        collection = ExporterCollection([exporter])
+        collection.fire_initialize()
+
+        date = datetime.date.today()
+        collection.fire_skip(date, "holiday", False)
+        collection.fire_snapshot(date, account, None)
+
+        account.find_holding("AAPL").price = 2
+        collection.fire_snapshot(date, account, None)
+
+        collection.fire_finalize()
+
+        self.assertEqual([
+            "initialize",
+            ("skip", "holiday"),
+            ("snapshot", 1_000, [("AAPL", 1)]),
+            ("snapshot", 1_010, [("AAPL", 2)]),
+            "finalize",
+        ], recorder.calls)
+
+        self.assertNotIn(threading.current_thread(), recorder.threads)
+
+    def test_back_pressure(self):
+        started, release = threading.Event(), threading.Event()
+
+        class BlockingExporter(Exporter):
+
+            def on_skip(self, date, reason, ordered):
+                started.set()
+                release.wait()
+
+        exporter = AsyncExporter(BlockingExporter(), queue_size=1)
+        exporter.initialize()
+
+        date = datetime.date.today()
+        exporter.on_skip(date, "first", False)
+        started.wait()
+
+        exporter.on_skip(date, "second", False)
+
+        producer = threading.Thread(target=exporter.on_skip, args=(date, "third", False))
+        producer.start()
+        producer.join(0.1)
+
+        self.assertTrue(producer.is_alive())
+
+        release.set()
+        producer.join()
+        exporter.finalize()
+
+    def test_error(self):
+        exporter = AsyncExporter(FailingExporter())
+        exporter.initialize()
+
+        exporter.on_skip(datetime.date.today(), "holiday", False)
+
+        with self.assertRaises(IOError):
+            exporter.finalize()
+
+    def test_queue_size(self):
+        with self.assertRaises(ValueError):
+            AsyncExporter(Exporter(), queue_size=0)
@@ -2,7 +2,10 @@ import datetime
 import unittest
 import unittest.mock
 
+from bktest.account import Account
 from bktest.export import Exporter, ExporterCollection
+from bktest.export.base import EVENT_FINALIZE, EVENT_SNAPSHOT
+from bktest.order import Order
 
 
 class ExporterCollectionTest(unittest.TestCase):
@@ -37,3 +40,139 @@ class ExporterCollectionTest(unittest.TestCase):
         ExporterCollection([noop]).fire_finalize()
 
         noop.finalize.assert_called_once()
+
+    def test_fire_snapshot(self):
+        full = Exporter()
+        full.on_snapshot = unittest.mock.MagicMock()
+
+        delta = Exporter()
+        delta.delta_snapshot = True
+        delta.on_delta_snapshot = unittest.mock.MagicMock()
+
+        account = Account(initial_cash=1_000)
+        account.place_order(Order("AAPL", 10, 1))
+        account.place_order(Order("TSLA", 10, 1))
+
+        collection = ExporterCollection([full, delta])
+
+        date = datetime.date.today()
+        collection.fire_snapshot(date, account, None)
+
+        snapshot = full.on_snapshot.call_args.args[0]
+        self.assertEqual(2, snapshot.holding_count)
+        self.assertEqual(1_000, snapshot.equity)
+
+        snapshot = delta.on_delta_snapshot.call_args.args[0]
+        self.assertEqual(["AAPL", "TSLA"], [holding.symbol for holding in snapshot.changed])
+        self.assertEqual([], snapshot.removed)
+        self.assertEqual(2, snapshot.holding_count)
+        self.assertEqual(1_000, snapshot.equity)
+
+        account.find_holding("AAPL").price = 2
+        account.close_position("TSLA", 1)
+        collection.fire_snapshot(date, account, None)
+
+        snapshot = delta.on_delta_snapshot.call_args.args[0]
+        self.assertEqual(["AAPL"], [holding.symbol for holding in snapshot.changed])
+        self.assertEqual(["TSLA"], snapshot.removed)
+        self.assertEqual(1, snapshot.holding_count)
+        self.assertEqual(1_010, snapshot.equity)
+
+    def test_fire_snapshot_delta_only(self):
+        delta = Exporter()
+        delta.delta_snapshot = True
+        delta.on_delta_snapshot = unittest.mock.MagicMock()
+
+        account = Account()
+        account.place_order(Order("AAPL", 10, 1))
+
+        with unittest.mock.patch.object(Account, "holdings", new_callable=unittest.mock.PropertyMock) as holdings:
+            ExporterCollection([delta]).fire_snapshot(datetime.date.today(), account, None)
+
+            holdings.assert_not_called()
+
+        delta.on_delta_snapshot.assert_called_once()
+
+    def test_fire_snapshot_events(self):
+        exporter = Exporter()
+        exporter.events = frozenset([EVENT_SNAPSHOT])
+        exporter.on_snapshot = unittest.mock.MagicMock()
+        exporter.finalize = unittest.mock.MagicMock()
+
+        account = Account()
+        result = unittest.mock.MagicMock()
+
+        collection = ExporterCollection([exporter])
+        collection.fire_snapshot(datetime.date.today(), account, result)
+        exporter.on_snapshot.assert_not_called()
+
+        collection.fire_snapshot(datetime.date.today(), account, None)
+        exporter.on_snapshot.assert_called_once()
+
+        collection.fire_finalize()
+        exporter.finalize.assert_not_called()
+
+    def test_fire_snapshot_no_subscriber(self):
+        exporter = Exporter()
+        exporter.events = frozenset([EVENT_FINALIZE])
+
+        account = Account()
+        account.place_order(Order("AAPL", 10, 1))
+
+        with unittest.mock.patch.object(Account, "equity", new_callable=unittest.mock.PropertyMock) as equity:
+            ExporterCollection([exporter]).fire_snapshot(datetime.date.today(), account, None)
+
+            equity.assert_not_called()
+
+    def test_fire_snapshot_lazy(self):
+        full = Exporter()
+        full.on_snapshot = unittest.mock.MagicMock()
+
+        account = Account()
+        account.place_order(Order("AAPL", 10, 1))
+
+        with unittest.mock.patch.object(Account, "holdings", new_callable=unittest.mock.PropertyMock) as holdings:
+            holdings.return_value = []
+
+            ExporterCollection([full]).fire_snapshot(datetime.date.today(), account, None)
+            holdings.assert_not_called()
+
+            snapshot = full.on_snapshot.call_args.args[0]
+            self.assertEqual(1, snapshot.holding_count)
+            holdings.assert_not_called()
+
+            self.assertEqual([], snapshot.holdings)
+            self.assertEqual([], snapshot.holdings)
+            holdings.assert_called_once()
+
+    def test_fire_snapshot_order(self):
+        calls = []
+
+        delta = Exporter()
+        delta.delta_snapshot = True
+        delta.on_delta_snapshot = lambda snapshot: calls.append("delta")
+
+        full = Exporter()
+        full.on_snapshot = lambda snapshot: calls.append("full")
+
+        ExporterCollection([delta, full]).fire_snapshot(datetime.date.today(), Account(), None)
+        self.assertEqual(["delta", "full"], calls)
+
+    def test_fire_snapshot_delta_not_subscribed(self):
+        delta = Exporter()
+        delta.events = frozenset([EVENT_SNAPSHOT])
+        delta.delta_snapshot = True
+        delta.on_delta_snapshot = unittest.mock.MagicMock()
+
+        account = Account(initial_cash=1_000)
+        collection = ExporterCollection([delta])
+
+        account.place_order(Order("AAPL", 10, 1))
+        collection.fire_snapshot(datetime.date.today(), account, unittest.mock.MagicMock())
+        delta.on_delta_snapshot.assert_not_called()
+
+        collection.fire_snapshot(datetime.date.today(), account, None)
+
+        snapshot = delta.on_delta_snapshot.call_args.args[0]
+        self.assertEqual(["AAPL"], [holding.symbol for holding in snapshot.changed])
+        self.assertEqual(1, snapshot.holding_count)
@@ -0,0 +1,103 @@
+import datetime
+import io
+import json
+import unittest
+
+from bktest.export import ConsoleExporter, Snapshot, console
+
+
+def _snapshot(date: datetime.date, ordered=False):
+    return Snapshot(
+        date=date,
+        postponned=None,
+        cash=10.0,
+        equity=100.0,
+        holdings=[],
+        ordered=ordered,
+    )
+
+
+class ConsoleExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.file = io.StringIO()
+        self.date = datetime.date(2024, 1, 1)
+
+    def _run(self, exporter: ConsoleExporter):
+        exporter.initialize()
+        exporter.on_skip(self.date, "holiday", False)
+        exporter.on_snapshot(_snapshot(self.date + datetime.timedelta(days=1)))
+        exporter.finalize()
+
+        return self.file.getvalue()
+
+    def test_json(self):
+        output = self._run(ConsoleExporter(format="json", file=self.file))
+
+        lines = output.splitlines()
+        self.assertEqual("[", lines[0])
+        self.assertTrue(lines[1].startswith(" {"))
+        self.assertTrue(lines[2].startswith(",{"))
+        self.assertEqual("]", lines[3])
+
+        events = json.loads(output)
+        self.assertEqual(["SKIP", "SNAPSHOT"], [event["event"] for event in events])
+
+    def test_jsonl(self):
+        output = self._run(ConsoleExporter(format="jsonl", file=self.file))
+
+        events = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(["SKIP", "SNAPSHOT"], [event["event"] for event in events])
+        self.assertEqual("2024-01-02", events[1]["date"])
+
+    def test_text(self):
+        output = self._run(ConsoleExporter(format="text", file=self.file, no_color=True))
+
+        lines = output.splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual("2024-01-01 (Mon)   holiday", lines[0])
+
+    def test_buffer(self):
+        exporter = ConsoleExporter(format="jsonl", file=self.file, buffer_lines=2, flush_interval=60)
+        exporter.initialize()
+
+        exporter.on_skip(self.date, "holiday", False)
+        self.assertEqual("", self.file.getvalue())
+
+        exporter.on_skip(self.date, "holiday", False)
+        self.assertEqual(2, len(self.file.getvalue().splitlines()))
+
+        exporter.on_skip(self.date, "holiday", False)
+        self.assertEqual(2, len(self.file.getvalue().splitlines()))
+
+        exporter.finalize()
+        self.assertEqual(3, len(self.file.getvalue().splitlines()))
+
+    def test_flush_interval(self):
+        exporter = ConsoleExporter(format="jsonl", file=self.file, buffer_lines=100, flush_interval=0)
+        exporter.initialize()
+
+        exporter.on_skip(self.date, "holiday", False)
+        self.assertEqual(1, len(self.file.getvalue().splitlines()))
+
+    def test_terminal_unbuffered(self):
+        self.file.isatty = lambda: True
+
+        exporter = ConsoleExporter(format="jsonl", file=self.file, flush_interval=60)
+        exporter.initialize()
+
+        exporter.on_skip(self.date, "holiday", False)
+        self.assertEqual(1, len(self.file.getvalue().splitlines()))
+
+    def test_flush_at_exit(self):
+        exporter = ConsoleExporter(format="jsonl", file=self.file, flush_interval=60)
+        exporter.initialize()
+
+        exporter.on_skip(self.date, "holiday", False)
+        self.assertEqual("", self.file.getvalue())
+
+        console._flush_pending_delegates()
+        self.assertEqual(1, len(self.file.getvalue().splitlines()))
+
+        exporter.finalize()
+        self.assertNotIn(exporter.delegate, console._pending_delegates)
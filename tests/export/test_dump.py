@@ -0,0 +1,175 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import numpy
+import pyarrow.ipc
+import pyarrow.parquet
+
+from bktest.export import DumpExporter, Snapshot
+from bktest.holding import Holding
+
+
+def _snapshot(date: datetime.date, holdings, ordered=False):
+    return Snapshot(
+        date=date,
+        postponned=None,
+        cash=0.0,
+        equity=sum(holding.market_price for holding in holdings),
+        holdings=holdings,
+        ordered=ordered,
+    )
+
+
+class DumpExporterTest(unittest.TestCase):
+
+    def test_finalize(self):
+        day1 = datetime.date(2024, 1, 1)
+        day2 = datetime.date(2024, 1, 2)
+        day3 = datetime.date(2024, 1, 3)
+
+        exporter = DumpExporter(output_file=None)
+        exporter.on_snapshot(_snapshot(day1, [Holding("AAPL", 10, 100.0)]))
+        exporter.on_snapshot(_snapshot(day2, [Holding("AAPL", 10, 110.0)]))
+        exporter.on_snapshot(_snapshot(day2, [Holding("AAPL", 5, 110.0), Holding("TSLA", -4, 50.0)], ordered=True))
+        exporter.on_snapshot(_snapshot(day3, [Holding("TSLA", -4, 40.0)]))
+        exporter.finalize()
+
+        dataframe = exporter.dataframe
+
+        self.assertEqual(
+            ["symbol", "quantity", "price", "market_price", "equity", "ordered", "profit"],
+            list(dataframe.columns)
+        )
+
+        self.assertEqual([day1, day2, day2, day3, day1, day2, day3], list(dataframe.index))
+        self.assertEqual(["AAPL"] * 4 + ["TSLA"] * 3, list(dataframe["symbol"]))
+        self.assertEqual([10, 10, 5, 0, 0, -4, -4], list(dataframe["quantity"]))
+
+        numpy.testing.assert_allclose(
+            [numpy.nan, 0.1, 0.0, numpy.nan, numpy.nan, numpy.nan, 0.2],
+            dataframe["profit"].values
+        )
+
+    def test_finalize_float_quantities(self):
+        exporter = DumpExporter(output_file=None)
+        exporter.on_snapshot(_snapshot(datetime.date(2024, 1, 1), [Holding("AAPL", 1.5, 100.0)]))
+        exporter.finalize()
+
+        self.assertEqual(numpy.float64, exporter.dataframe["quantity"].dtype)
+        self.assertEqual([150.0], list(exporter.dataframe["market_price"]))
+
+    def test_finalize_empty(self):
+        exporter = DumpExporter(output_file=None)
+        exporter.finalize()
+
+        self.assertTrue(exporter.dataframe.empty)
+
+
+class DumpExporterStreamingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _run(self, path: str):
+        day1 = datetime.date(2024, 1, 1)
+        day2 = datetime.date(2024, 1, 2)
+        day3 = datetime.date(2024, 1, 3)
+
+        exporter = DumpExporter(output_file=path, streaming=True, row_group_size=2)
+        exporter.initialize()
+        exporter.on_snapshot(_snapshot(day1, [Holding("AAPL", 10, 100.0)]))
+        exporter.on_snapshot(_snapshot(day2, [Holding("AAPL", 10, 110.0)]))
+        exporter.on_snapshot(_snapshot(day2, [Holding("AAPL", 5, 110.0), Holding("TSLA", -4, 50.0)], ordered=True))
+        exporter.on_snapshot(_snapshot(day3, [Holding("TSLA", -4, 40.0)]))
+        exporter.finalize()
+
+        self.assertIsNone(exporter.dataframe)
+
+        return [day1, day2, day2, day2, day3, day3]
+
+    def _assert(self, dataframe, dates):
+        self.assertEqual(dates, list(dataframe["date"]))
+        self.assertEqual(["AAPL", "AAPL", "AAPL", "TSLA", "TSLA", "AAPL"], list(dataframe["symbol"]))
+        self.assertEqual([10, 10, 5, -4, -4, 0], list(dataframe["quantity"]))
+
+        numpy.testing.assert_allclose(
+            [numpy.nan, 0.1, 0.0, numpy.nan, 0.2, numpy.nan],
+            dataframe["profit"].values
+        )
+
+    def test_zero_price(self):
+        path = os.path.join(self.directory.name, "dump.parquet")
+        snapshots = [
+            _snapshot(datetime.date(2024, 1, 1), [Holding("AAPL", 10, 0.0), Holding("TSLA", 4, 0.0)]),
+            _snapshot(datetime.date(2024, 1, 2), [Holding("AAPL", 10, 10.0), Holding("TSLA", 4, 0.0)]),
+        ]
+
+        streaming = DumpExporter(output_file=path, streaming=True)
+        in_memory = DumpExporter(output_file=None)
+
+        for exporter in (streaming, in_memory):
+            exporter.initialize()
+            for snapshot in snapshots:
+                exporter.on_snapshot(snapshot)
+            exporter.finalize()
+
+        expected = [numpy.nan, numpy.nan, numpy.inf, numpy.nan]
+        numpy.testing.assert_array_equal(expected, pyarrow.parquet.read_table(path).to_pandas()["profit"].values)
+        numpy.testing.assert_array_equal(expected, in_memory.dataframe["profit"].sort_index(kind="stable").values)
+
+    def test_parquet(self):
+        path = os.path.join(self.directory.name, "dump.parquet")
+        dates = self._run(path)
+
+        self.assertEqual(3, pyarrow.parquet.ParquetFile(path).num_row_groups)
+        self._assert(pyarrow.parquet.read_table(path).to_pandas(), dates)
+
+    def test_arrow(self):
+        path = os.path.join(self.directory.name, "dump.arrow")
+        dates = self._run(path)
+
+        with pyarrow.ipc.open_stream(path) as reader:
+            self._assert(reader.read_pandas(), dates)
+
+    def test_unsupported_file(self):
+        exporter = DumpExporter(output_file=os.path.join(self.directory.name, "dump.csv"), streaming=True)
+
+        with self.assertRaises(ValueError):
+            exporter.initialize()
+
+
+class DumpExporterExposuresTest(unittest.TestCase):
+
+    def test_compute_exposures(self):
+        day1 = datetime.date(2024, 1, 1)
+        day2 = datetime.date(2024, 1, 2)
+        day3 = datetime.date(2024, 1, 3)
+
+        exporter = DumpExporter(output_file=None)
+        exporter.on_snapshot(_snapshot(day1, [Holding("AAPL", 10, 100.0), Holding("MSFT", 10, 100.0)]))
+        exporter.on_snapshot(_snapshot(day2, [Holding("AAPL", 10, 110.0), Holding("MSFT", 10, 90.0)]))
+        exporter.on_snapshot(_snapshot(day2, [Holding("AAPL", 20, 110.0)], ordered=True))
+        exporter.on_snapshot(_snapshot(day3, []))
+        exporter.finalize()
+
+        exposures = exporter.compute_exposures()
+
+        # day1: 2 x 1000 on 2000, day2: 2200 on 2200, day3: nothing.
+        self.assertAlmostEqual((1 + 1 + 0) / 3, exposures["gross-exposure"])
+        self.assertAlmostEqual(1, exposures["net-exposure"] * 3 / 2)
+        self.assertAlmostEqual(0, exposures["short-exposure"])
+        # MSFT is closed at its last end-of-day price.
+        self.assertAlmostEqual((2000 / 2000 + (1100 + 1000) / 2200 + 2200 / 2200) / 3, exposures["turnover"])
+        self.assertAlmostEqual((0.5 + 1) / 2, exposures["concentration"])
+        self.assertAlmostEqual((2 + 1) / 2, exposures["effective-holdings"])
+        self.assertAlmostEqual((2 + 1 + 0) / 3, exposures["holdings"])
+
+    def test_compute_exposures_streaming(self):
+        exporter = DumpExporter(output_file="dump.parquet", streaming=True)
+
+        self.assertIsNone(exporter.compute_exposures())
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+import types
+import unittest.mock
+
+import matplotlib.figure
+import numpy
+import pandas
+
+from bktest.export import PdfExporter
+from bktest.export.report import ReportPool
+from bktest.template import Template
+from bktest.template.models import Alignment, Color, Document, Font, Image, Page, Rectangle2, Text, Vector2
+from bktest.utils import use_attrs
+
+
+def _template():
+    position = Rectangle2(0, 0, 10, 10)
+
+    def text(id: str):
+        return Text(id, id, position, id, Color.black(), Font("Arial", 10), Alignment.LEFT, [])
+
+    return Template("test", Document([
+        Page(Vector2(100, 100), [
+            text("$qs.metric.strategy.sharpe"),
+            text("$qs.worst-drawdowns.1.value"),
+            Image("$qs.underwater-plot", "$qs.underwater-plot", position, None, ""),
+            Image("$qs.eoy-returns", "$qs.eoy-returns", position, None, ""),
+        ])
+    ]))
+
+
+class PdfExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        random = numpy.random.default_rng(42)
+        dates = pandas.date_range("2020-01-01", periods=300, freq="B", name="date")
+        self.returns = pandas.Series(random.normal(0, 0.01, len(dates)), index=dates)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _run(self, report_pool: ReportPool):
+        template = _template()
+
+        exporter = PdfExporter(
+            quantstats_exporter=use_attrs({
+                "returns": self.returns.copy(),
+                "benchmark": None,
+            }),
+            dump_exporter=None,
+            template=template,
+            output_file=os.path.join(self.directory.name, "report.pdf"),
+            report_pool=report_pool,
+        )
+
+        exporter.renderer = unittest.mock.MagicMock()
+
+        with unittest.mock.patch.object(Template, "log"):
+            exporter.finalize()
+
+        report_pool.shutdown()
+
+        return {
+            element.natural_id: element.content if isinstance(element, Text) else element.bytes.getvalue()
+            for element in template.document.pages[0].elements
+        }
+
+    def test_parallel(self):
+        synchronous = self._run(ReportPool(workers=0))
+        parallel = self._run(ReportPool(workers=2))
+
+        self.assertEqual(synchronous, parallel)
+        self.assertTrue(synchronous["$qs.underwater-plot"].startswith(b"\x89PNG"))
+        self.assertTrue(synchronous["$qs.worst-drawdowns.1.value"].endswith("%"))
+
+    def test_pool_negative_workers(self):
+        with self.assertRaises(ValueError):
+            ReportPool(workers=-1)
+
+    def test_figure_format(self):
+        position = Rectangle2(0, 0, 10, 10)
+        template = Template("test", Document([
+            Page(Vector2(100, 100), [
+                Image("$qs.eoy-returns", "$qs.eoy-returns", position, None, ""),
+                Image("$custom", "$custom", position, None, ""),
+            ])
+        ]))
+
+        figure = matplotlib.figure.Figure()
+        figure.gca().plot([1, 2, 3])
+
+        user_script = types.SimpleNamespace(
+            get_template_values=lambda **_: ({"$custom": figure}, {})
+        )
+
+        exporter = PdfExporter(
+            quantstats_exporter=use_attrs({
+                "returns": self.returns.copy(),
+                "benchmark": None,
+            }),
+            dump_exporter=None,
+            template=template,
+            output_file=os.path.join(self.directory.name, "report.pdf"),
+            user_scripts=[user_script],
+            report_pool=ReportPool(workers=0),
+            figure_format="svg",
+        )
+
+        with unittest.mock.patch.object(Template, "log"):
+            exporter.fill_template()
+
+        for element in template.document.pages[0].elements:
+            self.assertTrue(element.bytes.getvalue().startswith(b"<?xml"), element.natural_id)
+
+        with self.assertRaises(ValueError):
+            PdfExporter(None, None, template, figure_format="jpeg")
+
@@ -0,0 +1,112 @@
+import datetime
+import unittest
+
+import numpy
+import pandas
+
+from bktest.data.benchmark import BenchmarkSource
+from bktest.export import QuantStatsExporter, Snapshot
+
+
+class StaticBenchmarkSource(BenchmarkSource):
+
+    def __init__(self, returns: pandas.Series):
+        self.returns = returns
+
+    def get_returns(self, ticker):
+        return self.returns
+
+
+def _legacy_returns(rows, bench=None):
+    history_df = pandas.DataFrame(rows, columns=["date", "equity"]).set_index("date")
+
+    history_df['profit'] = history_df['equity'] - history_df['equity'].shift(1)
+    history_df['daily_profit_pct'] = history_df["profit"] / history_df["equity"].shift(1)
+
+    history_df.reset_index(inplace=True)
+
+    history_df['date'] = history_df['date'].astype(str)
+    history_df['date'] = pandas.to_datetime(history_df['date'], format="%Y-%m-%d")
+
+    if bench is None:
+        return history_df.set_index("date").daily_profit_pct
+
+    bench = bench.rename("close").rename_axis("date").reset_index()
+
+    merged = history_df.merge(bench, on='date', how='inner')
+    merged.set_index('date', drop=True, inplace=True)
+
+    return merged.daily_profit_pct
+
+
+class QuantStatsExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        random = numpy.random.default_rng(42)
+
+        start = datetime.date(2020, 1, 1)
+        self.rows = [
+            (start + datetime.timedelta(days=index), float(equity))
+            for index, equity in enumerate(100_000 * numpy.cumprod(1 + random.normal(0, 0.01, 500)))
+        ]
+
+        # A zero equity must behave like pandas did.
+        self.rows[10] = (self.rows[10][0], 0.0)
+        self.rows[11] = (self.rows[11][0], 0.0)
+
+    def _run(self, benchmark_ticker=None, benchmark_source=None):
+        exporter = QuantStatsExporter(
+            html_output_file=None,
+            csv_output_file=None,
+            benchmark_ticker=benchmark_ticker,
+            benchmark_source=benchmark_source,
+            auto_override=True,
+        )
+
+        exporter.initialize()
+
+        for date, equity in self.rows:
+            exporter.on_snapshot(Snapshot(
+                date=date,
+                postponned=None,
+                cash=0,
+                equity=equity,
+                holdings=[],
+                ordered=False,
+            ))
+
+        exporter.finalize()
+
+        return exporter
+
+    def test_returns(self):
+        exporter = self._run()
+
+        pandas.testing.assert_series_equal(_legacy_returns(self.rows), exporter.returns)
+        self.assertIsNone(exporter.benchmark)
+
+    def test_returns_with_benchmark(self):
+        dates = pandas.date_range("2019-06-01", "2021-01-01", freq="B", name="date")
+        bench = pandas.Series(numpy.linspace(-0.01, 0.01, len(dates)), index=dates)
+
+        exporter = self._run("SPY", StaticBenchmarkSource(bench))
+
+        pandas.testing.assert_series_equal(_legacy_returns(self.rows, bench), exporter.returns)
+        self.assertEqual(len(exporter.returns), len(exporter.benchmark))
+        self.assertEqual("close", exporter.benchmark.name)
+
+    def test_ordered_ignored(self):
+        exporter = QuantStatsExporter(html_output_file=None, csv_output_file=None, benchmark_ticker=None)
+
+        exporter.on_snapshot(Snapshot(
+            date=datetime.date(2020, 1, 1),
+            postponned=None,
+            cash=0,
+            equity=1,
+            holdings=[],
+            ordered=True,
+        ))
+
+        exporter.finalize()
+
+        self.assertEqual(0, len(exporter.dataframe))
@@ -0,0 +1,57 @@
+import unittest
+import unittest.mock
+
+import numpy
+import pandas
+
+from bktest.export.report import MetricsCache, compute_daily_profits
+
+
+def _double(series: pandas.Series):
+    return series * 2
+
+
+class MetricsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        dates = pandas.date_range("2020-01-01", periods=10, freq="B", name="date")
+        self.returns = pandas.Series(numpy.linspace(-0.01, 0.01, len(dates)), index=dates, name="daily_profit_pct")
+
+    def test_get(self):
+        function = unittest.mock.MagicMock(side_effect=_double, __qualname__="_double")
+        cache = MetricsCache()
+
+        first = cache.get(function, self.returns).result()
+        second = cache.get(function, self.returns.rename("Strategy")).result()
+
+        self.assertIs(first, second)
+        function.assert_called_once()
+
+        cache.get(function, self.returns * 2)
+        self.assertEqual(2, function.call_count)
+
+    def test_get_arguments(self):
+        function = unittest.mock.MagicMock(return_value=None, __qualname__="function")
+        cache = MetricsCache()
+
+        cache.get(function, self.returns, None)
+        cache.get(function, self.returns, None)
+        cache.get(function, self.returns, self.returns)
+
+        self.assertEqual(2, function.call_count)
+
+    def test_worst_drawdowns(self):
+        cache = MetricsCache()
+
+        drawdowns = cache.worst_drawdowns(self.returns).result()
+
+        self.assertIs(drawdowns, cache.worst_drawdowns(self.returns.copy()).result())
+
+
+class ComputeDailyProfitsTest(unittest.TestCase):
+
+    def test_compute(self):
+        profits, profit_pcts = compute_daily_profits(numpy.array([100.0, 110.0, 0.0, 0.0]))
+
+        numpy.testing.assert_array_equal([numpy.nan, 10.0, -110.0, 0.0], profits)
+        numpy.testing.assert_array_equal([numpy.nan, 0.1, -1.0, numpy.nan], profit_pcts)
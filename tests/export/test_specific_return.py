@@ -0,0 +1,173 @@
+import datetime
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import numpy
+import pandas
+
+from bktest.export import Snapshot, SpecificReturnExporter
+from bktest.export.specific_return import SpecificReturnDataset, SpecificReturnMatrix
+from bktest.holding import Holding
+
+
+def _snapshot(date, cash, holdings, total_fees=0.0):
+    return Snapshot(
+        date=date,
+        postponned=None,
+        cash=cash,
+        equity=cash + sum(holding.market_price for holding in holdings),
+        holdings=holdings,
+        ordered=False,
+        total_fees=total_fees,
+    )
+
+
+class SpecificReturnMatrixTest(unittest.TestCase):
+
+    def test_from_dataframe(self):
+        matrix = SpecificReturnMatrix.from_dataframe(pandas.DataFrame([
+            {"date": datetime.date(2020, 1, 3), "symbol": "AAPL", "specific_return": 1.0},
+            {"date": datetime.date(2020, 1, 2), "symbol": "TSLA", "specific_return": 2.0},
+            {"date": datetime.date(2020, 1, 2), "symbol": "AAPL", "specific_return": 3.0},
+            {"date": datetime.date(2020, 1, 2), "symbol": "AAPL", "specific_return": 4.0},
+        ]))
+
+        numpy.testing.assert_array_equal([4.0, 2.0], matrix.row(datetime.date(2020, 1, 2)))
+        numpy.testing.assert_array_equal([1.0, 0.0], matrix.row(datetime.date(2020, 1, 3)))
+        self.assertIsNone(matrix.row(datetime.date(2020, 1, 4)))
+
+        numpy.testing.assert_array_equal([1, -1, 0], matrix.columns(["TSLA", "MSFT", "AAPL"]))
+
+    def test_from_dataframe_symbols(self):
+        matrix = SpecificReturnMatrix.from_dataframe(pandas.DataFrame([
+            {"date": datetime.date(2020, 1, 2), "symbol": "AAPL", "specific_return": 1.0},
+            {"date": datetime.date(2020, 1, 2), "symbol": "TSLA", "specific_return": 2.0},
+        ]), symbols=["MSFT", "TSLA"])
+
+        numpy.testing.assert_array_equal([0.0, 2.0], matrix.row(datetime.date(2020, 1, 2)))
+        numpy.testing.assert_array_equal([-1, 0, 1], matrix.columns(["AAPL", "MSFT", "TSLA"]))
+
+    def test_shape(self):
+        with self.assertRaises(ValueError):
+            SpecificReturnMatrix([datetime.date(2020, 1, 2)], ["AAPL"], numpy.zeros((2, 1)))
+
+
+class SpecificReturnExporterTest(unittest.TestCase):
+
+    def test_on_snapshot(self):
+        exporter = SpecificReturnExporter(
+            {
+                datetime.date(2020, 1, 3): {"AAPL": 10, "TSLA": -50},
+                datetime.date(2020, 1, 6): {"AAPL": 100},
+            },
+            html_output_file=None,
+            csv_output_file=None,
+        )
+
+        exporter.on_snapshot(_snapshot(datetime.date(2020, 1, 2), 100, [Holding("AAPL", 10, 10), Holding("MSFT", 1, 50)]))
+        self.assertEqual(250, exporter.value)
+
+        exporter.on_snapshot(_snapshot(datetime.date(2020, 1, 3), 100, [Holding("AAPL", 10, 10), Holding("TSLA", 2, 50)], total_fees=1))
+        self.assertEqual(250 + 10 - 1, exporter.value)
+
+        exporter.on_snapshot(_snapshot(datetime.date(2020, 1, 4), 100, [Holding("AAPL", 10, 10)]))
+        self.assertEqual(259, exporter.value)
+
+        exporter.on_snapshot(_snapshot(datetime.date(2020, 1, 6), 100, [Holding("AAPL", 10, 10)]))
+        self.assertEqual(259 + 100, exporter.value)
+
+        exporter.finalize()
+
+        numpy.testing.assert_allclose(
+            [numpy.nan, 9 / 250, 0, 100 / 259],
+            exporter.returns.values
+        )
+
+
+class SpecificReturnLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        dates = pandas.date_range("2020-01-01", "2020-03-31")
+        self.dataframe = pandas.DataFrame([
+            {"date": date, "symbol": symbol, "specific_return": float(index), "other": "x"}
+            for index, date in enumerate(dates)
+            for symbol in ["AAPL", "TSLA", "MSFT"]
+        ])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_load(self):
+        csv_path = self._path("sr.csv")
+        self.dataframe.to_csv(csv_path, index=False)
+
+        parquet_path = self._path("sr.parquet")
+        self.dataframe.to_parquet(parquet_path, row_group_size=30)
+
+        for path in [csv_path, parquet_path]:
+            with self.subTest(path=path):
+                dataframe = SpecificReturnExporter.load(
+                    path,
+                    start=datetime.date(2020, 2, 1),
+                    end=datetime.date(2020, 2, 10),
+                    symbols={"AAPL", "MSFT"},
+                )
+
+                self.assertEqual(["date", "symbol", "specific_return"], list(dataframe.columns))
+                self.assertEqual(20, len(dataframe))
+                self.assertEqual({"AAPL", "MSFT"}, set(dataframe["symbol"]))
+                self.assertEqual(datetime.date(2020, 2, 1), dataframe["date"].min())
+                self.assertEqual(datetime.date(2020, 2, 10), dataframe["date"].max())
+
+    def test_load_missing_column(self):
+        path = self._path("sr.csv")
+        self.dataframe.to_csv(path, index=False)
+
+        with self.assertRaises(ValueError):
+            SpecificReturnExporter.load(path, value_column="missing")
+
+    def test_dataset(self):
+        path = self._path("sr.parquet")
+        self.dataframe.to_parquet(path)
+
+        dataset = SpecificReturnDataset(
+            path,
+            start=datetime.date(2020, 1, 5),
+            end=datetime.date(2020, 3, 1),
+            symbols={"TSLA", "AAPL", "NVDA"},
+            chunk_days=10,
+        )
+
+        numpy.testing.assert_array_equal([0, 2, 1], dataset.columns(["AAPL", "TSLA", "NVDA"]))
+        self.assertIsNone(dataset.row(datetime.date(2020, 1, 4)))
+
+        with unittest.mock.patch.object(dataset, "_load", wraps=dataset._load) as load:
+            for day in range(5, 31):
+                date = datetime.date(2020, 1, day)
+                numpy.testing.assert_array_equal([day - 1, 0, day - 1], dataset.row(date))
+
+            self.assertEqual(3, load.call_count)
+
+        self.assertIsNone(dataset.row(datetime.date(2020, 3, 2)))
+
+    def test_dataset_symbols(self):
+        path = self._path("sr.parquet")
+        self.dataframe.to_parquet(path)
+
+        dataset = SpecificReturnDataset(path, chunk_days=10)
+
+        self.assertEqual(["AAPL", "MSFT", "TSLA"], list(dataset.symbols.keys()))
+
+    def test_chunk_days_csv(self):
+        path = self._path("sr.csv")
+        self.dataframe.to_csv(path, index=False)
+
+        with self.assertRaises(ValueError):
+            SpecificReturnExporter(path, chunk_days=10)
@@ -0,0 +1,142 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from bktest.account import Account
+from bktest.export import ConsoleExporter, ExporterCollection, Snapshot, StatisticsExporter
+from bktest.export.statistics import RunningStatistics
+from bktest.order import Order, OrderResultCollection
+
+
+class RunningStatisticsTest(unittest.TestCase):
+
+    def test_update(self):
+        random = numpy.random.default_rng(42)
+        equities = 1_000 * numpy.cumprod(1 + random.normal(0.0005, 0.01, 500))
+        equities[100] = equities[99]
+
+        statistics = RunningStatistics()
+        for equity in equities:
+            statistics.update(equity, 0)
+
+        returns = equities[1:] / equities[:-1] - 1
+        drawdowns = equities / numpy.maximum.accumulate(equities) - 1
+
+        self.assertEqual(500, statistics.days)
+        self.assertEqual(499, statistics.count)
+        self.assertAlmostEqual(returns.mean(), statistics.mean)
+        self.assertAlmostEqual(returns.var(ddof=1), statistics.variance)
+        self.assertAlmostEqual(returns.mean() / returns.std(ddof=1) * numpy.sqrt(252), statistics.sharpe)
+        self.assertAlmostEqual(returns.std(ddof=1) * numpy.sqrt(252), statistics.volatility)
+        self.assertAlmostEqual((returns > 0).sum() / (returns != 0).sum(), statistics.hit_rate)
+        self.assertAlmostEqual(equities.max(), statistics.peak_equity)
+        self.assertAlmostEqual(drawdowns[-1], statistics.drawdown)
+        self.assertAlmostEqual(drawdowns.min(), statistics.max_drawdown)
+
+    def test_empty(self):
+        statistics = RunningStatistics()
+        statistics.update(100, 0)
+
+        self.assertTrue(numpy.isnan(statistics.sharpe))
+        self.assertTrue(numpy.isnan(statistics.hit_rate))
+        self.assertEqual(0, statistics.drawdown)
+
+
+class StatisticsExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.directory.name, "statistics.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_turnover(self):
+        exporter = StatisticsExporter(output_file=self.output_file)
+        collection = ExporterCollection([exporter])
+        collection.fire_initialize()
+
+        account = Account(initial_cash=1_000)
+        date = datetime.date(2024, 1, 1)
+
+        account.place_order(Order("AAPL", 10, 10))
+        collection.fire_snapshot(date, account, None)
+
+        account.find_holding("AAPL").price = 20
+        collection.fire_snapshot(date + datetime.timedelta(days=1), account, None)
+
+        account.close_position("AAPL", 20)
+        collection.fire_snapshot(date + datetime.timedelta(days=2), account, None)
+
+        collection.fire_finalize()
+
+        statistics = exporter.statistics
+        self.assertEqual(100 + 200, statistics.traded_value)
+        self.assertAlmostEqual((100 / 1_000 + 0 + 200 / 1_100) / 3, statistics.turnover)
+        self.assertAlmostEqual(1.0, statistics.hit_rate)
+
+        with open(self.output_file) as fd:
+            values = json.load(fd)
+
+        self.assertEqual(3, values["days"])
+        self.assertEqual(1.0, values["hitRate"])
+
+    def test_ordered_snapshots(self):
+        exporter = StatisticsExporter(output_file=None)
+        collection = ExporterCollection([exporter])
+        collection.fire_initialize()
+
+        account = Account(initial_cash=1_000)
+        first, second = datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)
+
+        collection.fire_snapshot(first, account, None)
+
+        # Ordered after the price update, with a fee.
+        account.place_order(Order("AAPL", 10, 10))
+        account.cash -= 1
+        collection.fire_snapshot(first, account, OrderResultCollection())
+
+        # Postponned, ordered before the price update.
+        account.place_order(Order("MSFT", 5, 20))
+        account.cash -= 1
+        collection.fire_snapshot(second, account, OrderResultCollection(), postponned=first)
+
+        account.find_holding("AAPL").price = 20
+        collection.fire_snapshot(second, account, None)
+
+        collection.fire_finalize()
+
+        statistics = exporter.statistics
+        self.assertEqual(2, statistics.days)
+        self.assertEqual(1, statistics.count)
+        self.assertEqual(1_098, statistics.equity)
+        self.assertAlmostEqual(1_098 / 1_000 - 1, statistics.mean)
+        self.assertEqual((1, 0), (statistics.wins, statistics.losses))
+        self.assertEqual(200, statistics.traded_value)
+        self.assertAlmostEqual((100 / 1_000 + 100 / 1_098) / 2, statistics.turnover)
+
+    def test_console(self):
+        exporter = StatisticsExporter(output_file=None)
+
+        file = io.StringIO()
+        console = ConsoleExporter(format="jsonl", file=file, statistics=exporter.statistics)
+
+        collection = ExporterCollection([exporter, console])
+        collection.fire_initialize()
+
+        account = Account(initial_cash=1_000)
+        collection.fire_snapshot(datetime.date(2024, 1, 1), account, None)
+
+        account.cash = 1_100
+        collection.fire_snapshot(datetime.date(2024, 1, 2), account, None)
+
+        collection.fire_finalize()
+
+        events = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual([1, 2], [event["statistics"]["days"] for event in events])
+        self.assertEqual([None, 1.0], [event["statistics"]["hitRate"] for event in events])
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from bktest.template import BatchRenderer, RenderJob, Template
+from bktest.template.models import Alignment, Color, Document, Font, Page, Rectangle2, Span, Text, Vector2
+
+
+def _template():
+    position = Rectangle2(0, 0, 50, 10)
+
+    return Template("test", Document([
+        Page(Vector2(100, 100), [
+            Text("name", "$name", position, "$name", Color.black(), Font("helvetica", 10), Alignment.LEFT, [
+                Span(0, 5, "$name", None, None),
+            ]),
+        ])
+    ]))
+
+
+def _prepare(template: Template):
+    template.document.pages[0].size = Vector2(200, 200)
+
+
+class BatchRendererTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _jobs(self, count: int):
+        return [
+            RenderJob(
+                output_file=os.path.join(self.directory.name, f"{index}.pdf"),
+                variables={"$name": f"strategy-{index}"},
+                prepare=_prepare,
+            )
+            for index in range(count)
+        ]
+
+    def _render(self, workers: int):
+        template = _template()
+        jobs = self._jobs(3)
+
+        with unittest.mock.patch.object(Template, "log"):
+            output_files = BatchRenderer(template, workers=workers).render(jobs)
+
+        self.assertEqual([job.output_file for job in jobs], output_files)
+
+        # The loaded template is left untouched.
+        text = template.document.pages[0].elements[0]
+        self.assertEqual("$name", text.content)
+        self.assertEqual(Vector2(100, 100), template.document.pages[0].size)
+
+        contents = []
+        for output_file in output_files:
+            with open(output_file, "rb") as fd:
+                contents.append(fd.read())
+
+        return contents
+
+    def test_synchronous(self):
+        contents = self._render(0)
+
+        for content in contents:
+            self.assertTrue(content.startswith(b"%PDF"))
+
+        self.assertNotEqual(contents[0], contents[1])
+
+    def test_parallel(self):
+        self.assertEqual(
+            [len(content) for content in self._render(0)],
+            [len(content) for content in self._render(2)],
+        )
+
+    def test_negative_workers(self):
+        with self.assertRaises(ValueError):
+            BatchRenderer(_template(), workers=-1)
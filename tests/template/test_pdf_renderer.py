@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import matplotlib
+from fontTools import ttLib
+
+from bktest.template import PdfTemplateRenderer, Template
+from bktest.template import pdf as pdf_module
+from bktest.template.models import Alignment, Color, Document, Font, Page, Rectangle2, Span, Text, Vector2
+
+_FONTS_DIRECTORY = os.path.join(matplotlib.get_data_path(), "fonts", "ttf")
+
+with open(os.path.join(_FONTS_DIRECTORY, "DejaVuSans.ttf"), "rb") as fd:
+    _FONT_BYTES = fd.read()
+
+with open(os.path.join(_FONTS_DIRECTORY, "DejaVuSans-Bold.ttf"), "rb") as fd:
+    _BOLD_FONT_BYTES = fd.read()
+
+
+def _template(content: str, font_bytes=_FONT_BYTES):
+    font = Font("DejaVuSans", 10, font_bytes)
+
+    return Template("test", Document([
+        Page(Vector2(200, 100), [
+            Text("text", "$text", Rectangle2(10, 10, 180, 20), content, Color.black(), font, Alignment.LEFT, [
+                Span(0, len(content), content, None, None),
+            ]),
+        ])
+    ]))
+
+
+class PdfTemplateRendererTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _render(self, renderer: PdfTemplateRenderer, content="Sharpe 1.23"):
+        output = io.BytesIO()
+        renderer.render(_template(content), output)
+
+        return output.getvalue()
+
+    def test_font_cache(self):
+        renderer = PdfTemplateRenderer()
+
+        with unittest.mock.patch.object(pdf_module, "_compute_font_metrics", wraps=pdf_module._compute_font_metrics) as compute_font_metrics, \
+                unittest.mock.patch.object(pdf_module, "_subset_font", wraps=pdf_module._subset_font) as subset_font:
+            first = self._render(renderer)
+            second = self._render(renderer)
+            self._render(renderer, "Sortino 4.56")
+
+            self.assertEqual(1, compute_font_metrics.call_count)
+            self.assertEqual(2, subset_font.call_count)
+
+        self.assertTrue(first.startswith(b"%PDF"))
+        self.assertEqual(len(first), len(second))
+
+    def test_font_disk_cache(self):
+        self._render(PdfTemplateRenderer(font_cache_directory=self.directory.name))
+
+        renderer = PdfTemplateRenderer(font_cache_directory=self.directory.name)
+        with unittest.mock.patch.object(pdf_module, "_compute_font_metrics") as compute_font_metrics, \
+                unittest.mock.patch.object(pdf_module, "_subset_font") as subset_font:
+            self.assertTrue(self._render(renderer).startswith(b"%PDF"))
+
+            compute_font_metrics.assert_not_called()
+            subset_font.assert_not_called()
+
+    def test_subset_font(self):
+        subset = pdf_module._subset_font(_FONT_BYTES, set("abc "))
+        self.assertLess(len(subset), len(_FONT_BYTES) / 10)
+
+        cmap = ttLib.TTFont(io.BytesIO(subset))["cmap"].getBestCmap()
+        self.assertTrue({ord("a"), ord("b"), ord("c"), ord(" ")} <= set(cmap.keys()))
+        self.assertNotIn(ord("z"), cmap)
+
+    def test_collect_characters(self):
+        characters = pdf_module._collect_characters(_template("ab b").document)
+
+        self.assertEqual({"dejavusans": {"a", "b", " "}}, dict(characters))
+
+    def test_layout_cache(self):
+        renderer = PdfTemplateRenderer()
+
+        with unittest.mock.patch.object(renderer, "_do_compute_lines", wraps=renderer._do_compute_lines) as do_compute_lines:
+            renderer.render(_template("Sharpe 1.23"), io.BytesIO())
+            renderer.render(_template("Sharpe 1.23"), io.BytesIO())
+            self.assertEqual(1, do_compute_lines.call_count)
+
+            width = renderer._word_widths.get(("dejavusans", 10, "Sharpe"))
+            self.assertIsNotNone(width)
+
+            # Same family, but other metrics.
+            renderer.render(_template("Sharpe 1.23", _BOLD_FONT_BYTES), io.BytesIO())
+            self.assertEqual(2, do_compute_lines.call_count)
+
+        self.assertGreater(renderer._word_widths.get(("dejavusans", 10, "Sharpe")), width)
+
+    def test_split_words(self):
+        self.assertEqual(
+            [(0, "a"), (1, "  "), (3, "bc"), (5, "\n\n"), (7, " "), (8, "d.")],
+            list(pdf_module._split_words("a  bc\n\n d.")),
+        )
+
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+import zipfile
+
+from bktest.template import SketchTemplateLoader
+from bktest.template.models import Text
+
+
+def _text_layer(id: str, string: str, y: int):
+    attributes = {
+        "MSAttributedStringFontAttribute": {"attributes": {"name": "Helvetica", "size": 10}},
+        "MSAttributedStringColorAttribute": {"red": 0, "green": 0, "blue": 0, "alpha": 1},
+    }
+
+    return {
+        "_class": "text",
+        "do_objectID": id,
+        "name": id,
+        "frame": {"x": 0, "y": y, "width": 100, "height": 20},
+        "hasClippingMask": False,
+        "attributedString": {
+            "string": string,
+            "attributes": [{"location": 0, "length": len(string), "attributes": attributes}],
+        },
+        "style": {"textStyle": {"encodedAttributes": attributes}},
+    }
+
+
+def _write_sketch(path: str, title: str):
+    page = {
+        "layers": [{
+            "_class": "artboard",
+            "do_objectID": "artboard",
+            "name": "artboard",
+            "frame": {"x": 0, "y": 0, "width": 200, "height": 200},
+            "hasClippingMask": False,
+            "layers": [
+                _text_layer("$title", title, 0),
+                _text_layer("$name", "$name", 50),
+            ],
+        }],
+    }
+
+    with zipfile.ZipFile(path, "w") as zipfd:
+        zipfd.writestr("document.json", json.dumps({"pages": [{"_ref": "pages/page"}]}))
+        zipfd.writestr("pages/page.json", json.dumps(page))
+
+
+class SketchTemplateLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tearsheet.sketch")
+
+        _write_sketch(self.path, "Tearsheet")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _title(self, template):
+        return template.slots["$title"][0].content
+
+    def test_load(self):
+        template = SketchTemplateLoader().load(self.path)
+
+        self.assertEqual(self.path, template.name)
+        self.assertEqual("Tearsheet", self._title(template))
+        self.assertIsInstance(template.slots["$name"][0], Text)
+
+    def test_memory_cache(self):
+        loader = SketchTemplateLoader()
+
+        with unittest.mock.patch.object(loader, "_parse", wraps=loader._parse) as parse:
+            first = loader.load(self.path)
+            first.slots["$title"][0].content = "changed"
+
+            second = loader.load(self.path)
+
+            self.assertEqual(1, parse.call_count)
+
+        # Every template has its own document.
+        self.assertEqual("Tearsheet", self._title(second))
+        self.assertIs(second.slots["$title"][0], second.document.pages[0].elements[0])
+
+    def test_invalidation(self):
+        loader = SketchTemplateLoader()
+
+        with unittest.mock.patch.object(loader, "_parse", wraps=loader._parse) as parse:
+            loader.load(self.path)
+
+            # Only touched, the content hash is unchanged.
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            loader.load(self.path)
+
+            self.assertEqual(1, parse.call_count)
+
+            _write_sketch(self.path, "Modified")
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+            template = loader.load(self.path)
+
+            self.assertEqual(2, parse.call_count)
+
+        self.assertEqual("Modified", self._title(template))
+
+    def test_disk_cache(self):
+        cache_directory = os.path.join(self.directory.name, "cache")
+
+        SketchTemplateLoader(cache_directory=cache_directory).load(self.path)
+        self.assertEqual(1, len(os.listdir(cache_directory)))
+
+        loader = SketchTemplateLoader(cache_directory=cache_directory)
+        with unittest.mock.patch.object(loader, "_parse") as parse:
+            template = loader.load(self.path)
+
+            parse.assert_not_called()
+
+        self.assertEqual("Tearsheet", self._title(template))
@@ -0,0 +1,64 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+import unittest.mock
+
+import matplotlib.figure
+
+import bktest
+from bktest.template import Template
+from bktest.template.models import Document, Image, Page, Rectangle2, Vector2
+from bktest.template.template import figure_to_bytes, is_figure
+
+
+def _template():
+    return Template("test", Document([
+        Page(Vector2(100, 100), [
+            Image("$plot", "$plot", Rectangle2(0, 0, 10, 10), None, ""),
+        ])
+    ]))
+
+
+def _figure():
+    figure = matplotlib.figure.Figure()
+    figure.gca().plot([1, 2, 3])
+
+    return figure
+
+
+class TemplateTest(unittest.TestCase):
+
+    def test_set_figure(self):
+        for format, header in [("png", b"\x89PNG"), ("svg", b"<?xml")]:
+            template = _template()
+            template.figure_format = format
+
+            with unittest.mock.patch.object(Template, "log"):
+                template.set("$plot", _figure())
+
+            self.assertTrue(template.slots["$plot"][0].bytes.getvalue().startswith(header), format)
+            self.assertEqual(format, template.copy().figure_format)
+
+    def test_is_figure(self):
+        self.assertTrue(is_figure(_figure()))
+        self.assertFalse(is_figure(io.BytesIO()))
+
+    def test_figure_to_bytes_invalid_format(self):
+        with self.assertRaises(ValueError):
+            figure_to_bytes(_figure(), "jpeg")
+
+    def test_lazy_matplotlib(self):
+        # The parent package imports the exporters, which need matplotlib.
+        code = "; ".join([
+            "import sys, types",
+            "package = types.ModuleType('bktest')",
+            f"package.__path__ = [{os.path.dirname(bktest.__file__)!r}]",
+            "sys.modules['bktest'] = package",
+            "import bktest.template",
+            "print('matplotlib' in sys.modules)",
+        ])
+
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual("False", output.strip())
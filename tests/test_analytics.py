@@ -0,0 +1,103 @@
+import unittest
+import warnings
+
+import numpy
+import pandas
+
+from bktest import analytics
+from bktest.export.report import compute_metrics, compute_native_worst_drawdowns, compute_worst_drawdowns
+
+
+class AnalyticsTest(unittest.TestCase):
+
+    def setUp(self):
+        random = numpy.random.default_rng(42)
+        dates = pandas.bdate_range("2015-01-01", periods=1_500, name="date")
+
+        self.returns = pandas.Series(random.normal(0.0005, 0.01, len(dates)), index=dates, name="daily_profit_pct")
+        self.returns.iloc[0] = numpy.nan
+
+        self.benchmark = pandas.Series(random.normal(0.0003, 0.012, len(dates)), index=dates, name="benchmark")
+        self.benchmark.iloc[:3] = 0
+
+    def assertSameMetrics(self, returns, benchmark):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = compute_metrics(returns, benchmark)
+
+        actual = analytics.compute_metrics(returns, benchmark)
+
+        self.assertEqual(list(expected.index), list(actual.index))
+        self.assertEqual(list(expected.columns), list(actual.columns))
+
+        for name in expected.index:
+            for column in expected.columns:
+                self.assertEqual(expected.loc[name, column], actual.loc[name, column], f"{name}/{column}")
+                self.assertIs(type(expected.loc[name, column]), type(actual.loc[name, column]), f"{name}/{column}")
+
+    def test_compute_metrics(self):
+        self.assertSameMetrics(self.returns, None)
+
+    def test_compute_metrics_benchmark(self):
+        self.assertSameMetrics(self.returns, self.benchmark)
+
+    def test_compute_metrics_flat_benchmark(self):
+        self.assertSameMetrics(self.returns, self.benchmark * 0)
+
+    def test_compute_metrics_large_return(self):
+        self.assertSameMetrics(self.returns + 0.01, None)
+
+    def test_worst_drawdowns(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = compute_worst_drawdowns(self.returns)
+
+        actual = compute_native_worst_drawdowns(self.returns)
+
+        pandas.testing.assert_frame_equal(expected, actual)
+
+    def test_worst_drawdowns_none(self):
+        returns = pandas.Series([0.01, 0.02, 0.0], index=pandas.bdate_range("2020-01-01", periods=3))
+
+        self.assertIsNone(compute_native_worst_drawdowns(returns))
+
+
+class ExposuresTest(unittest.TestCase):
+
+    def test_compute_exposures(self):
+        random = numpy.random.default_rng(42)
+
+        date_count, symbol_count = 50, 8
+        quantities = random.integers(-10, 10, (date_count, symbol_count)).astype(float)
+        quantities[random.random((date_count, symbol_count)) < 0.3] = 0
+        prices = random.uniform(10, 100, (date_count, symbol_count))
+        equities = random.uniform(1_000, 2_000, date_count)
+
+        date_codes, symbol_codes = numpy.nonzero(quantities)
+
+        exposures = analytics.compute_exposures(
+            date_codes,
+            symbol_codes,
+            quantities[date_codes, symbol_codes],
+            prices[date_codes, symbol_codes],
+            equities[date_codes],
+            (date_count, symbol_count),
+        )
+
+        values = pandas.DataFrame(quantities * prices)
+        gross = values.abs().sum(axis=1)
+        weights = values.abs().div(gross, axis=0)
+
+        held = pandas.DataFrame(quantities != 0)
+        traded_prices = pandas.DataFrame(prices).where(held).fillna(pandas.DataFrame(prices).where(held).shift(1))
+        traded = (pandas.DataFrame(quantities).diff().fillna(pandas.DataFrame(quantities)).abs() * traded_prices).sum(axis=1)
+
+        self.assertAlmostEqual((gross / equities).mean(), exposures["gross-exposure"])
+        self.assertAlmostEqual((gross / equities).max(), exposures["gross-exposure-max"])
+        self.assertAlmostEqual((values.sum(axis=1) / equities).mean(), exposures["net-exposure"])
+        self.assertAlmostEqual((values.clip(lower=0).sum(axis=1) / equities).mean(), exposures["long-exposure"])
+        self.assertAlmostEqual((values.clip(upper=0).sum(axis=1) / equities).mean(), exposures["short-exposure"])
+        self.assertAlmostEqual((traded / equities).mean(), exposures["turnover"])
+        self.assertAlmostEqual((weights ** 2).sum(axis=1).mean(), exposures["concentration"])
+        self.assertAlmostEqual(weights.apply(lambda row: row.nlargest(5).sum(), axis=1).mean(), exposures["top-5-weight"])
+        self.assertAlmostEqual(held.sum(axis=1).mean(), exposures["holdings"])
@@ -0,0 +1,57 @@
+import datetime
+import unittest
+
+import pandas
+
+import bktest
+from bktest.order import DataFrameOrderProvider
+
+from .test_price_provider import CountingDataSource
+
+
+class SimpleBacktesterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_source = CountingDataSource(pandas.DataFrame({
+            "date": ["2024-01-02", "2024-01-03", "2024-01-04"] * 2,
+            "symbol": ["AAPL"] * 3 + ["TSLA"] * 3,
+            "price": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }))
+
+        self.order_provider = DataFrameOrderProvider(pandas.DataFrame({
+            "date": ["2024-01-02", "2024-01-03"],
+            "symbol": ["AAPL", "TSLA"],
+            "quantity": [10, 10],
+        }))
+
+    def _create(self, **kwargs):
+        return bktest.SimpleBacktester(
+            start=datetime.date(2024, 1, 2),
+            end=datetime.date(2024, 1, 4),
+            order_provider=self.order_provider,
+            initial_cash=1_000,
+            quantity_in_decimal=False,
+            data_source=self.data_source,
+            caching=False,
+            **kwargs
+        )
+
+    def test_run_prefetch(self):
+        backtester = self._create()
+        backtester.run()
+
+        self.assertEqual([{"AAPL", "TSLA"}], self.data_source.calls)
+        self.assertEqual(1_000 - 10 * 1 + 10 * 2 - 10 * 5 + 10 * 6, backtester.account.equity)
+
+    def test_run_prefetch_chunked(self):
+        backtester = self._create(prefetch_in_background=True, prefetch_chunk_days=1)
+        backtester.run()
+
+        self.assertEqual(3, len(self.data_source.calls))
+        self.assertEqual(1_000 - 10 * 1 + 10 * 2 - 10 * 5 + 10 * 6, backtester.account.equity)
+
+    def test_run_no_prefetch(self):
+        backtester = self._create(prefetch=False)
+        backtester.run()
+
+        self.assertEqual([{"AAPL"}, {"TSLA"}], self.data_source.calls)
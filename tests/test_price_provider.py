@@ -0,0 +1,153 @@
+import contextlib
+import datetime
+import io
+import threading
+import unittest
+
+import pandas
+
+from bktest.data.source import DataFrameDataSource
+from bktest.price_provider import PriceProvider
+
+
+class CountingDataSource(DataFrameDataSource):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.calls = []
+
+    def fetch_prices(self, symbols, start, end):
+        self.calls.append(set(symbols))
+
+        return super().fetch_prices(symbols, start, end)
+
+
+class PriceProviderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.start = datetime.date(2024, 1, 1)
+        self.end = datetime.date(2024, 1, 3)
+
+        self.data_source = CountingDataSource(pandas.DataFrame({
+            "date": ["2024-01-01", "2024-01-02", "2024-01-01", "2024-01-02"],
+            "symbol": ["AAPL", "AAPL", "TSLA", "TSLA"],
+            "price": [1.0, 2.0, 3.0, 4.0],
+        }))
+
+    def _create(self):
+        return PriceProvider(self.start, self.end, self.data_source, None, caching=False)
+
+    def test_download_missing(self):
+        price_provider = self._create()
+
+        price_provider.download_missing(["AAPL"])
+        price_provider.download_missing(["AAPL", "TSLA"])
+        price_provider.download_missing(["TSLA"])
+
+        self.assertEqual([{"AAPL"}, {"TSLA"}], self.data_source.calls)
+        self.assertEqual(2.0, price_provider.get(datetime.date(2024, 1, 2), "AAPL"))
+        self.assertIsNone(price_provider.get(datetime.date(2024, 1, 3), "TSLA"))
+
+    def test_prefetch(self):
+        price_provider = self._create()
+
+        price_provider.prefetch({"AAPL", "TSLA"})
+        price_provider.download_missing(["AAPL"])
+        price_provider.download_missing(["TSLA"])
+
+        self.assertEqual([{"AAPL", "TSLA"}], self.data_source.calls)
+
+    def test_prefetch_background(self):
+        price_provider = self._create()
+
+        price_provider.prefetch({"AAPL", "TSLA"}, background=True)
+        price_provider.download_missing(["AAPL", "TSLA"])
+        price_provider.wait()
+
+        self.assertEqual(1, len(self.data_source.calls))
+        self.assertEqual(3.0, price_provider.get(datetime.date(2024, 1, 1), "TSLA"))
+
+    def test_prefetch_chunked(self):
+        released = threading.Event()
+        fetch_prices = self.data_source.fetch_prices
+
+        def blocking_fetch_prices(symbols, start, end):
+            if start >= datetime.date(2024, 1, 2):
+                released.wait()
+
+            return fetch_prices(symbols, start, end)
+
+        self.data_source.fetch_prices = blocking_fetch_prices
+
+        price_provider = self._create()
+        price_provider.prefetch({"AAPL", "TSLA"}, background=True, chunk_days=2)
+
+        self.assertEqual(1.0, price_provider.get(datetime.date(2024, 1, 1), "AAPL"))
+        self.assertEqual(4.0, price_provider.get(datetime.date(2024, 1, 2), "TSLA"))
+        self.assertEqual(1, len(self.data_source.calls))
+
+        price_provider.download_missing(["AAPL", "TSLA"])
+        self.assertEqual(1, len(self.data_source.calls))
+
+        released.set()
+
+        self.assertIsNone(price_provider.get(datetime.date(2024, 1, 3), "AAPL"))
+        price_provider.wait()
+
+        self.assertEqual(2, len(self.data_source.calls))
+        self.assertTrue(price_provider.updated)
+
+    def test_prefetch_chunked_failure(self):
+        failures = [datetime.date(2024, 1, 3)]
+        fetch_prices = self.data_source.fetch_prices
+
+        def failing_fetch_prices(symbols, start, end):
+            if end in failures:
+                failures.remove(end)
+                raise IOError("unavailable")
+
+            return fetch_prices(symbols, start, end)
+
+        self.data_source.fetch_prices = failing_fetch_prices
+
+        price_provider = self._create()
+        with contextlib.redirect_stderr(io.StringIO()):
+            price_provider.prefetch({"AAPL", "TSLA"}, background=True, chunk_days=1)
+            price_provider.wait()
+
+        self.assertEqual(2, len(self.data_source.calls))
+        self.assertEqual(1.0, price_provider.get(datetime.date(2024, 1, 1), "AAPL"))
+        self.assertEqual(2, len(self.data_source.calls))
+
+        self.assertEqual(4.0, price_provider.get(datetime.date(2024, 1, 2), "TSLA"))
+        self.assertEqual(3, len(self.data_source.calls))
+        self.assertEqual([], price_provider._failed_windows)
+
+    def test_prefetch_chunked_series(self):
+        fetch_prices = self.data_source.fetch_prices
+
+        def series_fetch_prices(symbols, start, end):
+            symbol, = symbols
+            return fetch_prices(symbols, start, end)[symbol]
+
+        self.data_source.fetch_prices = series_fetch_prices
+
+        price_provider = self._create()
+        price_provider.prefetch({"AAPL"}, background=True, chunk_days=2)
+        price_provider.wait()
+
+        self.assertEqual(1.0, price_provider.get(datetime.date(2024, 1, 1), "AAPL"))
+        self.assertEqual(2.0, price_provider.get(datetime.date(2024, 1, 2), "AAPL"))
+        self.assertIsNone(price_provider.get(datetime.date(2024, 1, 3), "AAPL"))
+        self.assertEqual([], price_provider._failed_windows)
+        self.assertTrue(price_provider.updated)
+
+    def test_get_prices(self):
+        price_provider = self._create()
+        price_provider.download_missing(["AAPL"])
+
+        self.assertEqual([1.0, 2.0], list(price_provider.get_prices("AAPL").dropna()))
+
+        with self.assertRaises(ValueError):
+            price_provider.get_prices("TSLA")
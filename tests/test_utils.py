@@ -1,5 +1,7 @@
 import unittest
 
+import numpy
+
 import bktest.utils
 
 
@@ -51,3 +53,39 @@ class UtilsTest(unittest.TestCase):
         case("   ", "dummy", "dummy must not be blank")
 
         self.assertEqual("hello", bktest.utils.ensure_not_blank("hello"))
+
+    def test_growable_array(self):
+        array = bktest.utils.GrowableArray(numpy.float64, capacity=2)
+        self.assertEqual(0, len(array))
+
+        array.append(1)
+        array.extend([2, 3])
+        array.fill(4, 3)
+
+        self.assertEqual(6, len(array))
+        self.assertEqual(numpy.float64, array.values.dtype)
+        self.assertEqual([1, 2, 3, 4, 4, 4], list(array.values))
+
+        array.clear()
+        self.assertEqual(0, len(array))
+
+    def test_lru_cache(self):
+        cache = bktest.utils.LruCache(2)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+
+        # "b" is now the least recently used.
+        cache.put("c", 3)
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual("default", cache.get("a", "default"))
+
+        with self.assertRaises(ValueError):
+            bktest.utils.LruCache(0)